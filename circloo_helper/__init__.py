@@ -1,14 +1,19 @@
 from .level import Level
-from .level_parser import parse, read_file, read_clipboard
+from .level_parser import parse, iter_parse, read_file, read_clipboard, ParseReport
+from .lazy_level import LazyLevel
 
 import circloo_helper.object_shapes
 import circloo_helper.object_types
 
 from .object import Object, CustomObject
 import circloo_helper.circloo_objects
+from .object_columns import ObjectColumns
+from .spatial_index import SpatialIndex
 import circloo_helper.custom_objects
 
 from .tools import *
+from .transform import Transform
+from .level_diff import structural_key, diff, merge, LevelDiff
 from .pixel_builder import Pixels
 from .text import Text
 from .plotters import PointPlotter
@@ -1,7 +1,11 @@
 from warnings import warn as _warn
+import math as _math
+
+import numpy as np
 
 import circloo_helper.object_types as _ot
 import circloo_helper.object_shapes as _os
+from circloo_helper.object import _slots
 
 _INPUT_TRIGGER_MAP = {
     ('left', 'pressed'): 0,
@@ -18,7 +22,38 @@ _INPUT_TRIGGER_MAP = {
 }
 
 
+def _bezier_extent(p0, p1, p2, p3):
+    """
+    Closed-form extent of cubic Béziers along one axis: the extremes are at the ends or where the derivative is 0.
+    :param p0:  Coordinate of the starting points; p1, p2, p3 are those of the control points and the ending points.
+                    Each can be a number or a NumPy array.
+    :return: (minimum, maximum)
+    """
+    p0, p1, p2, p3 = (np.asarray(p, dtype=float) for p in (p0, p1, p2, p3))
+    # The derivative is 3 * (a t² + b t + c).
+    a = p3 - p0 + 3 * (p1 - p2)
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Roots of the derivative, computed in a way that stays accurate when a is (close to) 0; complex roots are NaN.
+        q = -0.5 * (b + np.copysign(np.sqrt(b * b - 4 * a * c), b))
+        roots = (q / a, c / q)
+
+    low = np.minimum(p0, p3)
+    high = np.maximum(p0, p3)
+    for t in roots:
+        inside = (t > 0) & (t < 1)
+        t = np.where(inside, t, 0)
+        s = 1 - t
+        value = s * s * s * p0 + 3 * s * s * t * p1 + 3 * s * t * t * p2 + t * t * t * p3
+        low = np.where(inside, np.minimum(low, value), low)
+        high = np.where(inside, np.maximum(high, value), high)
+    return low, high
+
+
 class Player(_os.Player):
+    __slots__ = _slots(_os.Player)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -46,17 +81,18 @@ class Player(_os.Player):
         self.restitution = restitution
         self.bullet = bullet
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         if self.restitution != 0:
-            self._set_attributes('y', self.x, self.y, self.size, self.speed, self.density, self.restitution)
+            return ('y', self.x, self.y, self.size, self.speed, self.density, self.restitution)
         else:
-            self._set_attributes('y', self.x, self.y, self.size, self.speed, self.density)
-        return super()._to_str(enumeration)
+            return ('y', self.x, self.y, self.size, self.speed, self.density)
 
 
 # SOLID OBJECTS ########################################################################################################
 
 class SolidCircle(_ot.Solid, _os.Circle):
+    __slots__ = _slots(_ot.Solid, _os.Circle)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -78,12 +114,13 @@ class SolidCircle(_ot.Solid, _os.Circle):
         self.attractor = attractor
         self.wheelsprite = wheelsprite
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('c', self.x, self.y, self.radius)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('c', self.x, self.y, self.radius)
 
 
 class SolidRectangle(_ot.Solid, _os.Rectangle):
+    __slots__ = _slots(_ot.Solid, _os.Rectangle)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -108,17 +145,18 @@ class SolidRectangle(_ot.Solid, _os.Rectangle):
         self.rotation = rotation
         self.coords_by_center = coords_by_center
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         if self.coords_by_center:
-            self._set_attributes('b', self.x, self.y, self.width / 2, self.height / 2, self.rotation)
+            return ('b', self.x, self.y, self.width / 2, self.height / 2, self.rotation)
         else:
             half_w = self.width / 2
             half_h = self.height / 2
-            self._set_attributes('b', self.x + half_w, self.y + half_h, half_w, half_h, self.rotation)
-        return super()._to_str(enumeration)
+            return ('b', self.x + half_w, self.y + half_h, half_w, half_h, self.rotation)
 
 
 class SolidTriangle(_ot.Solid, _os.Triangle):
+    __slots__ = _slots(_ot.Solid, _os.Triangle)
+
     def __init__(self,
                  x1: int | float,
                  y1: int | float,
@@ -143,12 +181,14 @@ class SolidTriangle(_ot.Solid, _os.Triangle):
         self.x3 = x3
         self.y3 = y3
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('t', self.x1, self.y1, self.x2, self.y2, self.x3, self.y3)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('t', self.x1, self.y1, self.x2, self.y2, self.x3, self.y3)
 
 
 class Line(_ot.Solid, _os.Line):
+    __slots__ = _slots(_ot.Solid, _os.Line, own=('x1', 'y1', 'x2', 'y2'))
+    _BOUNDS_ATTRIBUTES = ('x1', 'y1', 'x2', 'y2', 'thickness')
+
     def __init__(self,
                  x1: int | float,
                  y1: int | float,
@@ -170,12 +210,24 @@ class Line(_ot.Solid, _os.Line):
         self.y2: int | float = y2
         self.thickness = thickness
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('l_at', self.x1, self.y1, self.x2, self.y2, self.thickness)
-        return super()._to_str(enumeration)
+    @staticmethod
+    def _bounds_of(obj):
+        xmin, xmax = np.minimum(obj.x1, obj.x2), np.maximum(obj.x1, obj.x2)
+        ymin, ymax = np.minimum(obj.y1, obj.y2), np.maximum(obj.y1, obj.y2)
+        # Horizontal and vertical lines are as wide (or tall) as their thickness on both sides.
+        pad_x = np.where(xmin == xmax, obj.thickness, 0)
+        pad_y = np.where(ymin == ymax, obj.thickness, 0)
+        return xmin - pad_x, xmax + pad_x, ymin - pad_y, ymax + pad_y
+
+    def _fields(self):
+        return ('l_at', self.x1, self.y1, self.x2, self.y2, self.thickness)
 
 
 class Arc(_ot.Solid, _os.Line):
+    __slots__ = _slots(_ot.Solid, _os.Line,
+                       own=('center_x', 'center_y', 'start_angle', 'end_angle', 'radius', 'ctr_x', 'ctr_y'))
+    _BOUNDS_ATTRIBUTES = ('center_x', 'center_y', 'start_angle', 'end_angle', 'radius', 'thickness')
+
     def __init__(self,
                  center_x: int | float,
                  center_y: int | float,
@@ -206,16 +258,43 @@ class Arc(_ot.Solid, _os.Line):
         self.ctr_y: int | float = ctr_y
         self.thickness = thickness
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    @staticmethod
+    def _bounds_of(obj):
+        # The arc spans from start to the first angle at or after start that matches end.
+        start = np.radians(obj.start_angle)
+        end = np.radians(obj.end_angle)
+        end = np.where(end < start, end + np.ceil((start - end) / _math.tau) * _math.tau, end)
+
+        xs = [np.cos(start), np.cos(end)]
+        ys = [np.sin(start), np.sin(end)]
+        # The arc also reaches its circle's extremes at the directions it passes through.
+        for angle, x, y in ((0, 1, 0), (_math.tau / 4, 0, 1), (_math.tau / 2, -1, 0), (3 * _math.tau / 4, 0, -1)):
+            first = angle + np.maximum(np.ceil((start - angle) / _math.tau), 0) * _math.tau
+            passed = first <= end
+            xs.append(np.where(passed, x, xs[0]))
+            ys.append(np.where(passed, y, ys[0]))
+
+        # The thickness of the edge extends on both sides of the arc.
+        xmin = obj.center_x + obj.radius * np.minimum.reduce(xs) - obj.thickness
+        xmax = obj.center_x + obj.radius * np.maximum.reduce(xs) + obj.thickness
+        ymin = obj.center_y + obj.radius * np.minimum.reduce(ys) - obj.thickness
+        ymax = obj.center_y + obj.radius * np.maximum.reduce(ys) + obj.thickness
+        return xmin, xmax, ymin, ymax
+
+    def _fields(self):
         # The extra 2 value is labeled as precision in the level import script, so in theory it should be the number of
         #   individual lines that make up the arc (like for Béziers), but it appears to have no effect.
-        self._set_attributes('/ LE_ARC_DESCRIPTION', self.center_x, self.center_y,
-                             360 - self.start_angle, 360 - self.end_angle,
-                             self.radius, self.ctr_x, self.ctr_y, 2, self.thickness)
-        return super()._to_str(enumeration)
+        return ('/ LE_ARC_DESCRIPTION', self.center_x, self.center_y,
+                360 - self.start_angle, 360 - self.end_angle,
+                self.radius, self.ctr_x, self.ctr_y, 2, self.thickness)
 
 
 class Curve(_ot.Solid, _os.Line):
+    __slots__ = _slots(_ot.Solid, _os.Line,
+                       own=('start_x', 'start_y', 'ctr1_x', 'ctr1_y', 'ctr2_x', 'ctr2_y', 'end_x', 'end_y',
+                            'resolution'))
+    _BOUNDS_ATTRIBUTES = ('start_x', 'start_y', 'ctr1_x', 'ctr1_y', 'ctr2_x', 'ctr2_y', 'end_x', 'end_y')
+
     def __init__(self,
                  start_x: int | float,
                  start_y: int | float,
@@ -252,13 +331,20 @@ class Curve(_ot.Solid, _os.Line):
         self.thickness = thickness
         self.resolution: int | float = resolution
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('curve', self.start_x, self.start_y, self.ctr1_x, self.ctr1_y,
-                             self.ctr2_x, self.ctr2_y, self.end_x, self.end_y, self.thickness, self.resolution)
-        return super()._to_str(enumeration)
+    @staticmethod
+    def _bounds_of(obj):
+        xmin, xmax = _bezier_extent(obj.start_x, obj.ctr1_x, obj.ctr2_x, obj.end_x)
+        ymin, ymax = _bezier_extent(obj.start_y, obj.ctr1_y, obj.ctr2_y, obj.end_y)
+        return xmin, xmax, ymin, ymax
+
+    def _fields(self):
+        return ('curve', self.start_x, self.start_y, self.ctr1_x, self.ctr1_y,
+                self.ctr2_x, self.ctr2_y, self.end_x, self.end_y, self.thickness, self.resolution)
 
 
 class GrowingCircle(_ot.Growing, _os.Circle):
+    __slots__ = _slots(_ot.Growing, _os.Circle)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -283,12 +369,13 @@ class GrowingCircle(_ot.Growing, _os.Circle):
         self.attractor = attractor
         self.wheelsprite = wheelsprite
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('gc', self.x, self.y, self.radius)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('gc', self.x, self.y, self.radius)
 
 
 class GrowingRectangle(_ot.Growing, _os.Rectangle):
+    __slots__ = _slots(_ot.Growing, _os.Rectangle)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -316,19 +403,20 @@ class GrowingRectangle(_ot.Growing, _os.Rectangle):
         self.keep_pos = keep_pos
         self.coords_by_center = coords_by_center
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         if self.coords_by_center:
-            self._set_attributes('rGr', self.x, self.y, self.width / 2, self.height / 2, self.rotation)
+            return ('rGr', self.x, self.y, self.width / 2, self.height / 2, self.rotation)
         else:
             half_w = self.width / 2
             half_h = self.height / 2
-            self._set_attributes('rGr', self.x + half_w, self.y + half_h, half_w, half_h, self.rotation)
-        return super()._to_str(enumeration)
+            return ('rGr', self.x + half_w, self.y + half_h, half_w, half_h, self.rotation)
 
 
 # MOVEABLE OBJECTS #####################################################################################################
 
 class MoveableCircle(_ot.Moveable, _os.Circle):
+    __slots__ = _slots(_ot.Moveable, _os.Circle)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -359,12 +447,13 @@ class MoveableCircle(_ot.Moveable, _os.Circle):
         self.attractor = attractor
         self.bullet = bullet
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('mc', self.x, self.y, self.radius, self.density, self.damping)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('mc', self.x, self.y, self.radius, self.density, self.damping)
 
 
 class MoveableRectangle(_ot.Moveable, _os.Rectangle):
+    __slots__ = _slots(_ot.Moveable, _os.Rectangle)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -401,20 +490,21 @@ class MoveableRectangle(_ot.Moveable, _os.Rectangle):
         self.bullet = bullet
         self.coords_by_center = coords_by_center
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         # The extra 0 value likely used to be rotational damping, but it is not read in the import script.
         if self.coords_by_center:
-            self._set_attributes('mb', self.x, self.y, self.width / 2, self.height / 2,
-                                 self.density, 0, self.rotation, self.damping)
+            return ('mb', self.x, self.y, self.width / 2, self.height / 2,
+                    self.density, 0, self.rotation, self.damping)
         else:
             half_w = self.width / 2
             half_h = self.height / 2
-            self._set_attributes('mb', self.x + half_w, self.y + half_h, half_w, half_h,
-                                 self.density, 0, self.rotation, self.damping)
-        return super()._to_str(enumeration)
+            return ('mb', self.x + half_w, self.y + half_h, half_w, half_h,
+                    self.density, 0, self.rotation, self.damping)
 
 
 class MoveableTriangle(_ot.Moveable, _os.Triangle):
+    __slots__ = _slots(_ot.Moveable, _os.Triangle)
+
     def __init__(self,
                  x1: int | float,
                  y1: int | float,
@@ -448,14 +538,15 @@ class MoveableTriangle(_ot.Moveable, _os.Triangle):
         self.fix_rotation = fix_rotation
         self.bullet = bullet
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('mt', self.x1, self.y1, self.x2, self.y2, self.x3, self.y3, self.density)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('mt', self.x1, self.y1, self.x2, self.y2, self.x3, self.y3, self.density)
 
 
 # SPECIAL OBJECTS ######################################################################################################
 
 class RotatableRectangle(_ot.Moveable, _os.Rectangle):
+    __slots__ = _slots(_ot.Moveable, _os.Rectangle)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -489,19 +580,20 @@ class RotatableRectangle(_ot.Moveable, _os.Rectangle):
         self.bullet = bullet
         self.coords_by_center = coords_by_center
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         if self.coords_by_center:
-            self._set_attributes('rr', self.x, self.y, self.width, self.height,
-                                 self.rotation, self.density, self.damping)
+            return ('rr', self.x, self.y, self.width, self.height,
+                    self.rotation, self.density, self.damping)
         else:
             half_w = self.width / 2
             half_h = self.height / 2
-            self._set_attributes('rr', self.x + half_w, self.y + half_h, self.width, self.height,
-                                 self.rotation, self.density, self.damping)
-        return super()._to_str(enumeration)
+            return ('rr', self.x + half_w, self.y + half_h, self.width, self.height,
+                    self.rotation, self.density, self.damping)
 
 
 class RotatableCircle(_ot.Rotatable, _os.Circle):
+    __slots__ = _slots(_ot.Rotatable, _os.Circle)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -523,12 +615,13 @@ class RotatableCircle(_ot.Rotatable, _os.Circle):
         self.motor_speed = motor_speed
         self.torque = torque
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('rc', self.x, self.y, self.radius, self.motor_speed, self.torque)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('rc', self.x, self.y, self.radius, self.motor_speed, self.torque)
 
 
 class SpringyRectangle(_ot.Moveable, _os.Rectangle):
+    __slots__ = _slots(_ot.Moveable, _os.Rectangle, own=('frequency', 'fulcrum_offset', 'fulcrum_radius'))
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -571,21 +664,26 @@ class SpringyRectangle(_ot.Moveable, _os.Rectangle):
         self.bullet = bullet
         self.coords_by_center = coords_by_center
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         if self.coords_by_center:
-            self._set_attributes('wr', self.x, self.y, self.width / 2, self.height / 2,
-                                 self.rotation, self.density, self.frequency, self.damping,
-                                 self.fulcrum_offset, self.fulcrum_radius)
+            return ('wr', self.x, self.y, self.width / 2, self.height / 2,
+                    self.rotation, self.density, self.frequency, self.damping,
+                    self.fulcrum_offset, self.fulcrum_radius)
         else:
             half_w = self.width / 2
             half_h = self.height / 2
-            self._set_attributes('wr', self.x + half_w, self.y + half_h, half_w, half_h,
-                                 self.rotation, self.density, self.frequency, self.damping,
-                                 self.fulcrum_offset, self.fulcrum_radius)
-        return super()._to_str(enumeration)
+            return ('wr', self.x + half_w, self.y + half_h, half_w, half_h,
+                    self.rotation, self.density, self.frequency, self.damping,
+                    self.fulcrum_offset, self.fulcrum_radius)
 
 
 class Portal(_os.Other):
+    __slots__ = _slots(_os.Other,
+                       own=('portal_x', 'portal_y', 'target_x', 'target_y',
+                            'appear_at_circle', 'deactivate_at_circle', 'min_touch_time', 'start_disabled'))
+    _MODIFIERS = (('start_disabled', 'off', None),)
+    _BOUNDS_ATTRIBUTES = ('portal_x', 'portal_y')
+
     def __init__(self,
                  portal_x: int | float,
                  portal_y: int | float,
@@ -616,18 +714,19 @@ class Portal(_os.Other):
         self.min_touch_time = min_touch_time
         self.start_disabled = start_disabled
 
-    def _update_modifiers(self):
-        super()._update_modifiers()
-        if self.start_disabled:
-            self._add_modifier("off")
+    @staticmethod
+    def _bounds_of(obj):
+        return obj.portal_x - 20.25, obj.portal_x + 20.25, obj.portal_y - 20.25, obj.portal_y + 20.25
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('portal', self.portal_x, self.portal_y, self.target_x, self.target_y,
-                             self.appear_at_circle, self.deactivate_at_circle, self.min_touch_time)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('portal', self.portal_x, self.portal_y, self.target_x, self.target_y,
+                self.appear_at_circle, self.deactivate_at_circle, self.min_touch_time)
 
 
 class Dummy(_os.Other):
+    __slots__ = _slots(_os.Other, own=('x', 'y'))
+    _BOUNDS_ATTRIBUTES = ('x', 'y')
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float):
@@ -637,12 +736,17 @@ class Dummy(_os.Other):
         self.x = x_pos
         self.y = y_pos
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('dummy', self.x, self.y)
-        return super()._to_str(enumeration)
+    @staticmethod
+    def _bounds_of(obj):
+        return obj.x, obj.x, obj.y, obj.y
+
+    def _fields(self):
+        return ('dummy', self.x, self.y)
 
 
 class ParticleRectangle(_os.Rectangle):
+    __slots__ = _slots(_os.Rectangle)
+
     def __init__(self, x_pos, y_pos, width, height, rotation=0, coords_by_center=False):
         """
         Splits into a bunch of tiny movable circles with high restitution.
@@ -661,19 +765,21 @@ class ParticleRectangle(_os.Rectangle):
         self.rotation = rotation
         self.coords_by_center = coords_by_center
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         if self.coords_by_center:
-            self._set_attributes('partR', self.x, self.y, self.width / 2, self.height / 2, self.rotation)
+            return ('partR', self.x, self.y, self.width / 2, self.height / 2, self.rotation)
         else:
             half_w = self.width / 2
             half_h = self.height / 2
-            self._set_attributes('partR', self.x + half_w, self.y + half_h, half_w, half_h, self.rotation)
-        return super()._to_str(enumeration)
+            return ('partR', self.x + half_w, self.y + half_h, half_w, half_h, self.rotation)
 
 
 # GENERATORS ###########################################################################################################
 
 class CircleGenerator(_ot.Generator, _ot.Moveable, _os.Circle):
+    __slots__ = _slots(_ot.Generator, _ot.Moveable, _os.Circle)
+    _MODIFIERS = (('damping', 'damping {}', 0),)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -713,19 +819,15 @@ class CircleGenerator(_ot.Generator, _ot.Moveable, _os.Circle):
         self.start_off = start_off
         self.bullet = bullet
 
-    def _update_modifiers(self):
-        super()._update_modifiers()
-        if self.damping != 0:
-            self._add_modifier(f"damping {self.damping}")
-
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         # The timed settings are multiplied by 60, as they are stored in frames, with 60 FPS.
-        self._set_attributes('tmc', self.x, self.y, self.radius, self.density,
-                             self.disappear_after * 60, self.wait_between * 60, self.init_delay * 60)
-        return super()._to_str(enumeration)
+        return ('tmc', self.x, self.y, self.radius, self.density,
+                self.disappear_after * 60, self.wait_between * 60, self.init_delay * 60)
 
 
 class RectangleGenerator(_ot.Generator, _ot.Moveable, _os.Rectangle):
+    __slots__ = _slots(_ot.Generator, _ot.Moveable, _os.Rectangle)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -777,23 +879,24 @@ class RectangleGenerator(_ot.Generator, _ot.Moveable, _os.Rectangle):
         self.bullet = bullet
         self.coords_by_center = coords_by_center
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         # The timed settings are multiplied by 60, as they are stored in frames, with 60 FPS.
         # The extra 0 value likely used to be rotational damping, but it is not read in the import script.
         if self.coords_by_center:
-            self._set_attributes('tmb', self.x, self.y, self.width / 2, self.height / 2,
-                                 self.density, 0, self.rotation, self.damping,
-                                 self.disappear_after * 60, self.wait_between * 60, self.init_delay * 60)
+            return ('tmb', self.x, self.y, self.width / 2, self.height / 2,
+                    self.density, 0, self.rotation, self.damping,
+                    self.disappear_after * 60, self.wait_between * 60, self.init_delay * 60)
         else:
             half_w = self.width / 2
             half_h = self.height / 2
-            self._set_attributes('tmb', self.x + half_w, self.y + half_h, half_w, half_h,
-                                 self.density, self.damping, self.rotation, self.damping,
-                                 self.disappear_after * 60, self.wait_between * 60, self.init_delay * 60)
-        return super()._to_str(enumeration)
+            return ('tmb', self.x + half_w, self.y + half_h, half_w, half_h,
+                    self.density, self.damping, self.rotation, self.damping,
+                    self.disappear_after * 60, self.wait_between * 60, self.init_delay * 60)
 
 
 class TriangleGenerator(_ot.Generator, _ot.Moveable, _os.Triangle):
+    __slots__ = _slots(_ot.Generator, _ot.Moveable, _os.Triangle)
+
     def __init__(self,
                  x1: int | float,
                  y1: int | float,
@@ -842,17 +945,20 @@ class TriangleGenerator(_ot.Generator, _ot.Moveable, _os.Triangle):
         self.start_off = start_off
         self.bullet = bullet
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         # The timed settings are multiplied by 60, as they are stored in frames, with 60 FPS.
         # The extra 0 values do nothing.
-        self._set_attributes('tmt', self.x1, self.y1, self.x2, self.y2, self.x3, self.y3, self.density, 0, 0,
-                             self.disappear_after * 60, self.wait_between * 60, self.init_delay * 60)
-        return super()._to_str(enumeration)
+        return ('tmt', self.x1, self.y1, self.x2, self.y2, self.x3, self.y3, self.density, 0, 0,
+                self.disappear_after * 60, self.wait_between * 60, self.init_delay * 60)
 
 
 # CONNECTIONS ##########################################################################################################
 
 class Glue(_os.Other):
+    __slots__ = _slots(_os.Other, own=('obj1', 'obj2'))
+    # The text contains the ids of obj1 and obj2.
+    _CACHES_TEXT = False
+
     def __init__(self, obj1, obj2):
         """
         Glues two movable objects together
@@ -863,12 +969,13 @@ class Glue(_os.Other):
         self.obj1 = obj1
         self.obj2 = obj2
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('/ GLUE', self.obj1.get_id(), self.obj2.get_id())
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('/ GLUE', self.obj1.get_id(), self.obj2.get_id())
 
 
 class Rope(_os.Connection):
+    __slots__ = _slots(_os.Connection, own=('offset1_x', 'offset1_y', 'offset2_x', 'offset2_y', 'max_length'))
+
     def __init__(self, obj1, obj2,
                  offset1_x: int | float = 0,
                  offset1_y: int | float = 0,
@@ -897,12 +1004,13 @@ class Rope(_os.Connection):
         self.offset2_y = offset2_y
         self.max_length = max_length
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('r', '', self.offset1_x, self.offset1_y, self.offset2_x, self.offset2_y, self.max_length)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('r', '', self.offset1_x, self.offset1_y, self.offset2_x, self.offset2_y, self.max_length)
 
 
 class FixedDistanceConnection(_os.Connection):
+    __slots__ = _slots(_os.Connection, own=('also_move_destination',))
+
     def __init__(self, obj1, obj2,
                  also_move_destination: bool = False):
         """
@@ -916,12 +1024,13 @@ class FixedDistanceConnection(_os.Connection):
         self.obj2 = obj2
         self.also_move_destination = also_move_destination
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('fd', int(self.also_move_destination))
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('fd', int(self.also_move_destination))
 
 
 class DistanceConnection(_os.Connection):
+    __slots__ = _slots(_os.Connection, own=('offset1_x', 'offset1_y', 'offset2_x', 'offset2_y'))
+
     def __init__(self, obj1, obj2,
                  offset1_x: int | float = 0,
                  offset1_y: int | float = 0,
@@ -944,12 +1053,16 @@ class DistanceConnection(_os.Connection):
         self.offset2_x = offset2_x
         self.offset2_y = offset2_y
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('d', self.offset1_x, self.offset1_y, self.offset2_x, self.offset2_y)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('d', self.offset1_x, self.offset1_y, self.offset2_x, self.offset2_y)
 
 
 class Pulley(_os.Connection):
+    __slots__ = _slots(_os.Connection,
+                       own=('pulley1_x', 'pulley1_y', 'pulley2_x', 'pulley2_y',
+                            'offset1_x', 'offset1_y', 'offset2_x', 'offset2_y', 'ratio', 'unlock_movement'))
+    _MODIFIERS = (('unlock_movement', 'p_free_hmovement', None),)
+
     def __init__(self, obj1, obj2,
                  pulley1_x: int | float = 0,
                  pulley1_y: int | float = -100,
@@ -991,18 +1104,15 @@ class Pulley(_os.Connection):
         self.ratio = ratio
         self.unlock_movement = unlock_movement
 
-    def _update_modifiers(self):
-        super()._update_modifiers()
-        if self.unlock_movement:
-            self._add_modifier("p_free_hmovement")
-
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('/ p_description', self.offset1_x, self.offset1_y, self.offset2_x, self.offset2_y,
-                             self.pulley1_x, self.pulley1_y, self.pulley2_x, self.pulley2_y, self.ratio)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('/ p_description', self.offset1_x, self.offset1_y, self.offset2_x, self.offset2_y,
+                self.pulley1_x, self.pulley1_y, self.pulley2_x, self.pulley2_y, self.ratio)
 
 
 class Hinge(_ot.Rotatable, _os.Connection):
+    __slots__ = _slots(_ot.Rotatable, _os.Connection,
+                       own=('offset_x', 'offset_y', 'draw_connection_line', 'enable_collisions'))
+
     def __init__(self, obj1, obj2,
                  offset_x: int | float = 0,
                  offset_y: int | float = 0,
@@ -1031,14 +1141,15 @@ class Hinge(_ot.Rotatable, _os.Connection):
         self.motor_speed = motor_speed
         self.torque = torque
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('hinge', '', self.offset_x, self.offset_y,
-                             int(self.draw_connection_line), int(self.enable_collisions),
-                             self.motor_speed, self.torque)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('hinge', '', self.offset_x, self.offset_y,
+                int(self.draw_connection_line), int(self.enable_collisions),
+                self.motor_speed, self.torque)
 
 
 class Slider(_os.Connection):
+    __slots__ = _slots(_os.Connection, own=('offset_x', 'offset_y'))
+
     def __init__(self, obj1, obj2,
                  offset_x: int | float = 0,
                  offset_y: int | float = 0):
@@ -1055,13 +1166,14 @@ class Slider(_os.Connection):
         self.offset_x = offset_x
         self.offset_y = offset_y
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         # The extra 0 values appear to do nothing, but are initialized around ±1 when created in-game, so idk.
-        self._set_attributes('pr', 0, 0, 0, 0, self.offset_x, self.offset_y)
-        return super()._to_str(enumeration)
+        return ('pr', 0, 0, 0, 0, self.offset_x, self.offset_y)
 
 
 class SpecialConnection(_os.Connection):
+    __slots__ = _slots(_os.Connection, own=('collectable', 'target', 'action', 'args'))
+
     def __init__(self, collectable, target, action, *args):
         """
         Perform an action to a target object upon the collection of a collectable.
@@ -1097,14 +1209,15 @@ class SpecialConnection(_os.Connection):
         self.action = action
         self.args = args
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self._set_attributes('spc', f"'{self.action}'", *self.args)
-        return super()._to_str(enumeration)
+    def _fields(self):
+        return ('spc', f"'{self.action}'", *self.args)
 
 
 # COLLECTABLES #########################################################################################################
 
 class Collectable(_os.Collectable):
+    __slots__ = _slots(_os.Collectable)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -1141,13 +1254,14 @@ class Collectable(_os.Collectable):
         self.disable_on_trigger = disable_on_trigger
         self.sound = sound
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         tag = 'io' if self.collect_from_object else 'i'
-        self._set_attributes(f"ic '{tag}'", self.x, self.y, self.appear_at_segment)
-        return super()._to_str(enumeration)
+        return (f"ic '{tag}'", self.x, self.y, self.appear_at_segment)
 
 
 class GravityCollectable(_os.Collectable):
+    __slots__ = _slots(_os.Collectable, own=('grav_dir', 'grav_strength'))
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -1191,14 +1305,15 @@ class GravityCollectable(_os.Collectable):
         self.grav_dir = grav_dir
         self.grav_strength = grav_strength
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         tag = 'im' if self.collect_from_object else 'ig'
-        self._set_attributes(f"ic '{tag}'", self.x, self.y, self.appear_at_segment, '',
-                             self.grav_dir, self.grav_strength)
-        return super()._to_str(enumeration)
+        return (f"ic '{tag}'", self.x, self.y, self.appear_at_segment, '',
+                self.grav_dir, self.grav_strength)
 
 
 class SizeCollectable(_os.Collectable):
+    __slots__ = _slots(_os.Collectable, own=('size', 'by_player_percent'))
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -1242,15 +1357,16 @@ class SizeCollectable(_os.Collectable):
         self.size = size
         self.by_player_percent = by_player_percent
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         tag = 'iso' if self.collect_from_object else 'is'
         new_size = self.size * 32 if self.by_player_percent else self.size - .5
 
-        self._set_attributes(f"ic '{tag}'", self.x, self.y, self.appear_at_segment, '', new_size)
-        return super()._to_str(enumeration)
+        return (f"ic '{tag}'", self.x, self.y, self.appear_at_segment, '', new_size)
 
 
 class DisconnectCollectable(_os.Collectable):
+    __slots__ = _slots(_os.Collectable)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -1287,13 +1403,14 @@ class DisconnectCollectable(_os.Collectable):
         self.disable_on_trigger = disable_on_trigger
         self.sound = sound
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         tag = 'irbo' if self.collect_from_object else 'irb'
-        self._set_attributes(f"ic '{tag}'", self.x, self.y, self.appear_at_segment)
-        return super()._to_str(enumeration)
+        return (f"ic '{tag}'", self.x, self.y, self.appear_at_segment)
 
 
 class SpeedCollectable(_os.Collectable):
+    __slots__ = _slots(_os.Collectable, own=('speed', 'density'))
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -1337,13 +1454,14 @@ class SpeedCollectable(_os.Collectable):
         self.speed = speed
         self.density = density
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         tag = 'ipso' if self.collect_from_object else 'ips'
-        self._set_attributes(f"ic '{tag}'", self.x, self.y, self.appear_at_segment, '', self.speed, self.density)
-        return super()._to_str(enumeration)
+        return (f"ic '{tag}'", self.x, self.y, self.appear_at_segment, '', self.speed, self.density)
 
 
 class SpecialCollectable(_os.Collectable):
+    __slots__ = _slots(_os.Collectable)
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -1380,13 +1498,14 @@ class SpecialCollectable(_os.Collectable):
         self.disable_on_trigger = disable_on_trigger
         self.sound = sound
 
-    def _to_str(self, enumeration: bool = False) -> str:
+    def _fields(self):
         tag = 'ispo' if self.collect_from_object else 'isp'
-        self._set_attributes(f"ic '{tag}'", self.x, self.y, self.appear_at_segment)
-        return super()._to_str(enumeration)
+        return (f"ic '{tag}'", self.x, self.y, self.appear_at_segment)
 
 
 class InputTrigger(_os.Collectable):
+    __slots__ = _slots(_os.Collectable, own=('input', 'action'))
+
     def __init__(self,
                  x_pos: int | float,
                  y_pos: int | float,
@@ -1425,8 +1544,7 @@ class InputTrigger(_os.Collectable):
         self.disable_on_trigger = disable_on_trigger
         self.sound = sound
 
-    def _to_str(self, enumeration: bool = False) -> str:
-
+    def _fields(self):
         if self.input == 'every_frame':
             trigger_type = 9
         elif self.input == 'on_trigger':
@@ -1434,5 +1552,4 @@ class InputTrigger(_os.Collectable):
         else:
             trigger_type = _INPUT_TRIGGER_MAP[self.input, self.action]
 
-        self._set_attributes('ispt', self.x, self.y, trigger_type)
-        return super()._to_str(enumeration)
+        return ('ispt', self.x, self.y, trigger_type)
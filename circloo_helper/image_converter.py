@@ -1,4 +1,4 @@
-from typing import Callable
+from typing import Callable, Sequence
 import numpy as np
 from PIL import Image
 import matplotlib.pyplot as plt
@@ -13,22 +13,29 @@ class CHImage(CustomObject):
 
     def __init__(self,
                  filepath: str,
-                 obj: Object,
+                 obj: Object | Sequence[Object],
                  downsample_factor: int,
                  threshold: int | float = .5,
                  channel_weights: tuple[int | float, int | float, int | float] = (1, 1, 1),
                  ditherer: Callable[[np.array], np.array] = floyd_steinberg,
-                 show_img: bool = True):
+                 show_img: bool = True,
+                 workers: int | None = None):
         """
-        Converts an image into circloO objects via dithering & grayscale conversion.
+        Converts an image into circloO objects via dithering & grayscale conversion, or via posterization.
         Usage without dithering (using MoveableRectangles) is natively in the game using Ctrl+Shift+F4.
         :param filepath:            Path to input image
         :param obj:                 Object to be tiled into image. Top-left object of the image has obj's coordinates.
+                                        If a sequence of Objects (darkest first), the grayscale image is posterized
+                                        into len(obj) + 1 evenly spaced levels instead of dithered: the darkest level
+                                        is tiled with obj[0], the next with obj[1], and so on, and the lightest level
+                                        is left empty. threshold and ditherer are then unused.
         :param downsample_factor:   Factor to downscale/downsample image; 1 for no change; should be higher for images with higher resolutions
         :param threshold:           Threshold for grayscale conversion; default is 0.5
         :param channel_weights:     Weights for RGB channels; default is (1, 1, 1)
         :param ditherer:            Dithering function (found in `dithering` module); default is floyd_steinberg
         :param show_img:            If True, displays the processed image; default is True
+        :param workers:             If greater than 1, large images are decomposed into Rectangles in this many parallel
+                                        threads (see Pixels); default is None
         """
         super().__init__()
 
@@ -39,6 +46,7 @@ class CHImage(CustomObject):
         self._threshold = threshold
         self._channel_weights = channel_weights
         self._ditherer = ditherer
+        self._workers = workers
 
         self._is_already_built = False
 
@@ -53,16 +61,32 @@ class CHImage(CustomObject):
             data = data[:, :, np.newaxis]
 
         data_downsampled = data[::self._downsample_factor, ::self._downsample_factor, :]
-        data_dithered = self._ditherer(data_downsampled)
 
-        data_avg = np.average(data_dithered[:, :, :3], axis=2, weights=np.asarray(self._channel_weights))
-        pix_arr = np.where(data_avg >= self._threshold, 0, 1)
+        if isinstance(self._obj, Object):
+            data_dithered = self._ditherer(data_downsampled)
+
+            data_avg = np.average(data_dithered[:, :, :3], axis=2, weights=np.asarray(self._channel_weights))
+            pix_arr = np.where(data_avg >= self._threshold, 0, 1)
+            palette = self._obj
+        else:
+            pix_arr, palette = self._posterize(data_downsampled)
 
         if self._show_img:
             plt.imshow(pix_arr, cmap='Greys')
             plt.show()
 
-        self._obj_cache.extend(Pixels(pix_arr, self._obj).build_objs())
+        self._obj_cache.extend(Pixels(pix_arr, palette, workers=self._workers).build_objs())
 
         self._is_already_built = True
         return self._obj_cache
+
+    def _posterize(self, data: np.ndarray) -> tuple[np.ndarray, dict[int, Object]]:
+        """
+        :return: an array of labels, from len(self._obj) for the darkest level to 0 for the lightest, and the palette
+            that maps each label to its Object.
+        """
+        levels = len(self._obj)
+        data_avg = np.average(data[:, :, :3], axis=2, weights=np.asarray(self._channel_weights))
+        level = np.minimum((data_avg * (levels + 1)).astype(int), levels)
+        # Label 0 (the lightest level) is not in the palette, so it is left empty, like 0's of a binary array.
+        return levels - level, {levels - index: obj for index, obj in enumerate(self._obj)}
@@ -0,0 +1,158 @@
+import mmap as _mmap
+
+import numpy as np
+
+from .level import Level
+from .level_parser import ParseReport, _parse_lines, _add_connections
+from .object import Object
+
+# Number of bytes of the level file that are searched for '<' lines at a time; keeps memory flat for huge files.
+_SCAN_SIZE = 1 << 26
+
+
+class LazyLevel:
+    def __init__(self, path: str):
+        """
+        Read-only view of a level file that only parses the Objects that are accessed.
+        The file is memory-mapped and indexed by the offsets of its '<' lines when opened, which is much faster
+        than parsing it; each Object is only parsed when object_at() or iteration reaches it.
+        Useful to inspect very large levels, e.g. to find the Players or the Objects in a range of ids.
+        Use as a context manager, or call close() when done.
+        :param path:    File path of the level
+        """
+        self._file = open(path, 'rb')
+        try:
+            self._mm = _mmap.mmap(self._file.fileno(), 0, access=_mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be memory-mapped.
+            self._file.close()
+            raise ValueError("This text does not appear to contain a circloO level.")
+
+        if not self._mm[:32].replace(b'\r\n', b'\n').startswith(b"/\n/ circloO level"):
+            self.close()
+            raise ValueError("This text does not appear to contain a circloO level.")
+
+        # Object i is written between the (i-1)th and the ith '<' line; the first Object also follows the header.
+        self._ends = self._index()
+        self._cache: dict[int, Object] = {}
+        # Problems found in the Objects that were parsed so far. Each parse (opening the file, object_at() or a pass
+        #   of iteration) also raises a single summary warning for the problems it found.
+        self.report = ParseReport()
+
+        # Level settings, read from the lines before the first Object's '<' line.
+        self.settings = Level()
+        if len(self) > 0:
+            problems = ParseReport()
+            obj = self._parse(0, problems)
+            if obj is not None:
+                self._cache[0] = obj
+            self._warn(problems)
+
+    def __len__(self):
+        return len(self._ends)
+
+    def __iter__(self):
+        """
+        Parse and yield every Object in order. Objects are not kept, unless they were accessed with object_at().
+        Objects that cannot be parsed are skipped, as with parse(); see report.
+        """
+        problems = ParseReport()
+        try:
+            for index in range(len(self)):
+                obj = self._cache.get(index)
+                if obj is None:
+                    obj = self._parse(index, problems)
+                if obj is not None:
+                    yield obj
+        finally:
+            self._warn(problems)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def _index(self) -> np.ndarray:
+        """:return: the offsets of every '<' line that closes an Object."""
+        buffer = np.frombuffer(self._mm, dtype=np.uint8)
+        ends = []
+        for start in range(1, len(buffer), _SCAN_SIZE):
+            # '<' is rare outside of '<' lines, so only the bytes before each '<' are checked for a new line.
+            candidates = np.flatnonzero(buffer[start:start + _SCAN_SIZE] == ord('<')) + start
+            ends.append(candidates[buffer[candidates - 1] == ord('\n')])
+        del buffer
+        ends = np.concatenate(ends) if ends else np.empty(0, dtype=np.int64)
+
+        # Lines skipped by '/ SKIP n' are not part of any Object, even if they start with '<'.
+        skip_at = self._mm.find(b"\n/ SKIP ")
+        while skip_at != -1:
+            line_end = self._mm.find(b"\n", skip_at + 1)
+            try:
+                count = int(self._mm[skip_at + 8:line_end if line_end != -1 else len(self._mm)])
+            except ValueError:
+                count = 0
+            skip_end = line_end
+            for _ in range(count):
+                if skip_end == -1:
+                    break
+                skip_end = self._mm.find(b"\n", skip_end + 1)
+            if skip_end == -1:
+                skip_end = len(self._mm)
+            ends = ends[(ends <= line_end) | (ends > skip_end)]
+            skip_at = self._mm.find(b"\n/ SKIP ", skip_at + 1)
+
+        return ends
+
+    def _warn(self, problems: ParseReport):
+        """Add problems to report and raise a single warning summarizing them, if there are any."""
+        self.report.update(problems)
+        problems.warn()
+
+    def _parse(self, index: int, problems: ParseReport) -> Object | None:
+        """
+        :param index:       Index of the Object
+        :param problems:    ParseReport that collects the problems found in the Object
+        :return: the Object at index, connected to the Objects it refers to, or None if it cannot be parsed.
+        """
+        start = int(self._ends[index - 1]) if index > 0 else 0
+        lines = self._mm[start:int(self._ends[index])].decode().splitlines()
+        lines.append('<')
+
+        report = ParseReport()
+        obj = None
+        for obj, connections, line_number in _parse_lines(lines, self.settings, report):
+            obj._set_id(index)
+            if connections:
+                try:
+                    _add_connections(self, obj, connections)
+                except Exception as e:
+                    report.add_error(line_number, e)
+            break
+
+        if report.errors or report.unknown_keywords:
+            # Line numbers are counted from the start of the record; only count the lines before it when needed.
+            offset = int(np.count_nonzero(np.frombuffer(self._mm, dtype=np.uint8, count=start) == ord('\n')))
+            report.lines = [(line_number + offset, error) for line_number, error in report.lines]
+            problems.update(report)
+        return obj
+
+    def _materialize(self, index: int) -> Object:
+        problems = ParseReport()
+        obj = self._parse(index, problems)
+        self._warn(problems)
+        if obj is None:
+            raise ValueError(f"Object {index} could not be parsed.")
+        return obj
+
+    def object_at(self, index: int) -> Object:
+        """:return: the Object at the given index, parsing it on first access. Later calls return the same Object."""
+        index = range(len(self))[index]
+        obj = self._cache.get(index)
+        if obj is None:
+            obj = self._cache[index] = self._materialize(index)
+        return obj
@@ -1,8 +1,18 @@
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
 from random import randint as _randint
+import io
+import math
 import time
 import pyperclip
 
-from .object import Object, CustomObject
+from .object import Object, CustomObject, _combined_bounds
+from .object_columns import ObjectColumns
+from .spatial_index import SpatialIndex
+
+
+def _format_chunk(objs: list, precision: int | None) -> str:
+    """Convert consecutive Objects to text. Runs in a worker process of Level.write()."""
+    return '\n'.join(text for text in (obj._to_str(enumeration=True, precision=precision) for obj in objs) if text)
 
 
 class Level:
@@ -19,7 +29,8 @@ class Level:
                  camera_follow_one_player_only: bool = False,
                  affect_all_players_by_collectables: bool = False,
                  line_extra_width: int | float = 0,
-                 gravcontrol: bool = False):
+                 gravcontrol: bool = False,
+                 precision: int | None = None):
         """
         circloO Level
         :param segments:    Number of collectables to collect before level is completed; default is 7
@@ -34,9 +45,13 @@ class Level:
         :param affect_all_players_by_collectables:  If True, affect all players by collectables; default is False
         :param line_extra_width:                    Alter size of sprite for line/curve/arc; can be negative; default is 0
         :param gravcontrol:         If True, control direction of gravity with left/right instead of horizontal speed
+        :param precision:           Maximum number of decimals written for Object attributes; trailing zeros are trimmed,
+                                        integral floats are written as ints and -0.0 as 0. If None (default),
+                                        numbers are written in full, e.g. 1523.3333333333333
         """
         self._objs = []
         self._size = 0
+        self._index: SpatialIndex | None = None
         self._LEVELSCRIPT_VERSION = 10
 
         # Header variables.
@@ -55,6 +70,9 @@ class Level:
         self.line_extra_width = line_extra_width
         self.gravcontrol = gravcontrol
 
+        # Export options
+        self.precision = precision
+
     def __len__(self):
         return self._size
 
@@ -97,14 +115,82 @@ class Level:
 
     def _to_str(self) -> str:
         """Convert the level into a string."""
-        text = []
-        text.append(self._make_header())
+        return '\n'.join(self.iter_lines())
+
+    def iter_lines(self):
+        """
+        Lazily convert the level into text, one piece at a time.
+        The first piece is the header, and each following piece is the text of a single Object.
+        Joining the pieces with newlines gives the same text as str(Level).
+        """
+        yield self._make_header()
+
+        for obj in self._objs:
+            if isinstance(obj, CustomObject):
+                yield from obj._iter_strs(enumeration=True, precision=self.precision)
+            else:
+                yield obj._to_str(enumeration=True, precision=self.precision)
+
+    def write(self, fp, workers: int | None = None):
+        """
+        Write the level text to an open text file handle fp.
+        Objects are written one at a time, so the full level text is never held in memory.
+        :param fp:      Open text file handle
+        :param workers: If greater than 1, Objects are converted to text in this many worker processes.
+                            The Objects are split into chunks of consecutive ids, which are written in order.
+                            Faster for very large levels; on Windows and macOS, call this from within
+                            an `if __name__ == '__main__':` block.
+        """
+        if workers is not None and workers > 1:
+            fp.write(self._make_header())
+            for text in self._iter_chunks(workers):
+                if text:
+                    fp.write('\n')
+                    fp.write(text)
+            return
 
-        # Append each object in objs to level
+        lines = self.iter_lines()
+        fp.write(next(lines))
+        for line in lines:
+            fp.write('\n')
+            fp.write(line)
+
+    def _iter_leaves(self):
+        """Yield every Object in the Level with its id set, expanding CustomObjects."""
         for obj in self._objs:
-            text.append(obj._to_str(enumeration=True))
+            if isinstance(obj, CustomObject):
+                yield from obj._iter_leaves()
+            else:
+                yield obj
+
+    def _iter_chunks(self, workers: int):
+        """Convert the Objects to text in worker processes, yielding the text of each chunk in order."""
+        leaves = list(self._iter_leaves())
+        # A few chunks per worker keeps the workers busy even if some chunks take longer than others.
+        size = max(1, math.ceil(len(leaves) / (workers * 4)))
+        chunks = [leaves[i:i + size] for i in range(0, len(leaves), size)]
+        with _ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(_format_chunk, chunks, [self.precision] * len(chunks))
+
+    def bounds(self) -> tuple[float, float, float, float] | None:
+        """
+        :return: the axis-aligned bounding box of every Object in the Level as (xmin, xmax, ymin, ymax),
+            or None if no Object has one. Objects without a bounding box (e.g. Connections) are skipped.
+        Each Object's box is cached, so calling this again after a few changes is cheap.
+        """
+        return _combined_bounds(self._iter_leaves())
 
-        return '\n'.join(text)
+    def index(self, rebuild: bool = False, cell_size: float | None = None) -> SpatialIndex:
+        """
+        :return: a spatial index of the bounding boxes of the Objects in the Level, for region, point and
+            nearest-Object queries; see SpatialIndex. It is built on first use and kept up to date by add().
+        :param rebuild:     If True, build the index again, e.g. after moving Objects that were already indexed
+        :param cell_size:   Width and height of the index's grid cells; if given, the index is built again with it.
+                                If None, it is chosen from the sizes of the Objects.
+        """
+        if rebuild or self._index is None or (cell_size is not None and cell_size != self._index.cell_size):
+            self._index = SpatialIndex(self._objs, cell_size)
+        return self._index
 
     def add(self, obj: Object | CustomObject):
         """Add an object to the Level."""
@@ -117,6 +203,22 @@ class Level:
         else:
             self._size += 1
 
+        if self._index is not None:
+            self._index.add(obj)
+
+    def add_many(self, obj_type: type, columns=None, **kwargs) -> ObjectColumns:
+        """
+        Add many Objects of the same type to the Level at once, stored as columns instead of separate Objects.
+        See ObjectColumns for details.
+        :param obj_type:    Object class of every new Object, e.g. SolidRectangle
+        :param columns:     Mapping of attribute names to sequences of values, e.g. {'x': xs, 'y': ys, 'width': 10}
+        :param kwargs:      Additional columns, as with columns
+        :return: the ObjectColumns that was added
+        """
+        block = ObjectColumns(obj_type, columns, **kwargs)
+        self.add(block)
+        return block
+
     def object_at(self, index):
         """:return: the object at the given index."""
         return self._objs[index]
@@ -130,14 +232,40 @@ class Level:
         Copy level text contents to clipboard.
         Also returns the level text, so you can do print(Level().to_clipboard) to simplify workflows.
         """
-        txt = str(self)
+        buffer = io.StringIO()
+        self.write(buffer)
+        txt = buffer.getvalue()
         pyperclip.copy(txt)
         return txt
 
-    def to_file(self, path: str):
+    def save_cache(self, path: str, source: str | None = None):
+        """
+        Save the Level to a binary cache file, which loads much faster than level text is parsed.
+        Objects are stored as typed NumPy arrays per class, with bools packed into a bitfield and connections
+        stored as Object indexes. CustomObjects are stored as the Objects they are composed of.
+        :param path:    File path of the cache. read_file() uses the cache at the level file's path + '.npz'
+        :param source:  Path of the level file this Level was read from. Its hash is stored, so the cache is only
+                            used while the level file is unchanged.
+        """
+        from .level_cache import save
+        save(self, path, source)
+
+    @staticmethod
+    def load_cache(path: str, source: str | None = None) -> 'Level':
+        """
+        Load a Level from a cache file written by save_cache().
+        :param path:    File path of the cache
+        :param source:  If given, raise a ValueError unless the cache was saved from the current contents of this file
+        :return: the cached Level
+        """
+        from .level_cache import load
+        return load(path, source)
+
+    def to_file(self, path: str, workers: int | None = None):
         """
         Save level text to path.
+        :param path:    File path
+        :param workers: Number of worker processes used to convert Objects to text; see write()
         """
-        txt = str(self)
         with open(path, 'w') as f:
-            f.write(txt)
+            self.write(f, workers)
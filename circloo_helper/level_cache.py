@@ -0,0 +1,282 @@
+from collections import deque as _deque
+from itertools import repeat as _repeat
+from numbers import Integral as _Integral, Real as _Real
+import hashlib as _hashlib
+import json as _json
+
+import numpy as np
+
+from .level import Level
+from .object import Object, _gc_paused, _slot_names
+from .object_columns import ObjectColumns
+from .object_shapes import Collectable as _Collectable
+
+# Increased whenever the layout of cache files changes; caches of other versions are ignored.
+_FORMAT_VERSION = 1
+
+# File name suffix of the cache that read_file() looks for next to a level file.
+CACHE_SUFFIX = '.npz'
+
+# Number of bytes of the level file that are hashed at a time.
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Slots that only hold state derived from the other attributes or from the Object's position in the Level.
+_DERIVED_SLOTS = ('_id', '_text', '_text_state', '_bounds', '_bounds_state')
+
+# Column kinds:
+#   'flag'      bools; all flag columns of a class are packed into a single bitfield
+#   'int'       ints, as int64
+#   'float'     floats, as float64
+#   'number'    a mix of ints and floats, as float64 plus a mask of which values are ints
+#   'ref'       Objects of the Level (or None), as the index of the Object in the Level (or -1)
+#   'json'      anything else (strings, tuples, Sounds, ...), as one JSON string per value
+
+
+def source_hash(path: str) -> str:
+    """:return: the SHA-256 hash of the file at path, as stored in caches by Level.save_cache()."""
+    digest = _hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _object_classes() -> dict[str, type]:
+    """:return: every Object class that has been imported, by 'module.qualname'."""
+    classes = {}
+    pending = [Object]
+    while pending:
+        cls = pending.pop()
+        classes[f'{cls.__module__}.{cls.__qualname__}'] = cls
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+def _class_name(cls: type) -> str:
+    return f'{cls.__module__}.{cls.__qualname__}'
+
+
+def _stored_slots(cls: type) -> list[str]:
+    return [name for name in _slot_names(cls) if name not in _DERIVED_SLOTS]
+
+
+def _value_kind(value) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return 'flag'
+    if isinstance(value, _Integral):
+        return 'int'
+    if isinstance(value, _Real):
+        return 'float'
+    if value is None or isinstance(value, Object):
+        return 'ref'
+    return 'json'
+
+
+def _column_kind(values: list) -> str:
+    kinds = set(map(_value_kind, values))
+    if len(kinds) == 1:
+        kind = kinds.pop()
+        if kind == 'int' and not all(-2 ** 63 <= value < 2 ** 63 for value in values):
+            return 'json'
+        return kind
+    if kinds == {'int', 'float'} and all(float(value) == value for value in values):
+        return 'number'
+    return 'json'
+
+
+def _encode(value, indexes: dict[int, int]):
+    """:return: value converted to JSON-compatible types; tuples, Sounds and Objects are tagged with their type."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (np.generic, np.ndarray)):
+        return _encode(value.tolist(), indexes)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item, indexes) for item in value]
+    if isinstance(value, tuple):
+        return {'tuple': [_encode(item, indexes) for item in value]}
+    if isinstance(value, _Collectable.Sound):
+        return {'sound': [_encode(getattr(value, name), indexes) for name in _Collectable.Sound.__slots__]}
+    if isinstance(value, Object):
+        if id(value) not in indexes:
+            raise ValueError(f"A connection refers to a {type(value).__name__} that is not in the Level.")
+        return {'ref': indexes[id(value)]}
+    raise TypeError(f"{type(value).__name__} values cannot be cached.")
+
+
+def _decode(value, leaves: list):
+    if isinstance(value, list):
+        return [_decode(item, leaves) for item in value]
+    if isinstance(value, dict):
+        (tag, content), = value.items()
+        if tag == 'tuple':
+            return tuple(_decode(item, leaves) for item in content)
+        if tag == 'sound':
+            return _Collectable.Sound(*content)
+        if tag == 'ref':
+            return leaves[content]
+    return value
+
+
+def save(lvl: Level, path: str, source: str | None = None):
+    """See Level.save_cache()."""
+    leaves = list(lvl._iter_leaves())
+    indexes = {id(leaf): index for index, leaf in enumerate(leaves)}
+
+    # Objects are grouped by class; order holds the class code of each leaf, or -(n + 1) for the nth ObjectColumns.
+    codes: dict[type, int] = {}
+    groups: list[list[Object]] = []
+    blocks: list[ObjectColumns] = []
+    order = np.empty(len(leaves), dtype=np.int32)
+    for index, leaf in enumerate(leaves):
+        if isinstance(leaf, ObjectColumns):
+            blocks.append(leaf)
+            order[index] = -len(blocks)
+            continue
+        code = codes.get(type(leaf))
+        if code is None:
+            code = codes[type(leaf)] = len(groups)
+            groups.append([])
+        groups[code].append(leaf)
+        order[index] = code
+
+    arrays = {'order': order}
+    classes = []
+    for cls, code in codes.items():
+        objs = groups[code]
+        columns = []
+        flags = np.zeros(len(objs), dtype=np.uint64)
+        flag_count = 0
+        for name in _stored_slots(cls):
+            values = [getattr(obj, name) for obj in objs]
+            kind = _column_kind(values)
+            if kind == 'flag' and flag_count < 64:
+                flags |= np.array(values, dtype=np.uint64) << np.uint64(flag_count)
+                flag_count += 1
+            elif kind == 'flag':
+                arrays[f'c{code}.{name}'] = np.array(values, dtype=np.bool_)
+                kind = 'bool'
+            elif kind == 'int':
+                arrays[f'c{code}.{name}'] = np.array(values, dtype=np.int64)
+            elif kind == 'float':
+                arrays[f'c{code}.{name}'] = np.array(values, dtype=np.float64)
+            elif kind == 'number':
+                arrays[f'c{code}.{name}'] = np.array(values, dtype=np.float64)
+                arrays[f'c{code}.{name}.is_int'] = np.array([isinstance(value, _Integral) for value in values])
+            elif kind == 'ref':
+                try:
+                    arrays[f'c{code}.{name}'] = np.array([-1 if value is None else indexes[id(value)]
+                                                          for value in values], dtype=np.int64)
+                except KeyError:
+                    raise ValueError(f"A connection of a {cls.__name__} refers to an Object that is not in the Level.")
+            else:
+                arrays[f'c{code}.{name}'] = np.array([_json.dumps(_encode(value, indexes)) for value in values],
+                                                     dtype=np.str_)
+            columns.append((name, kind))
+        if flag_count:
+            arrays[f'c{code}.flags'] = flags
+        classes.append({'name': _class_name(cls), 'columns': columns})
+
+    for number, block in enumerate(blocks):
+        arrays[f'b{number}'] = np.asarray(block.rows)
+        for name, mask in block._integral.items():
+            arrays[f'b{number}.{name}'] = mask
+    settings = {name: _encode(value, indexes) for name, value in vars(lvl).items()
+                if name not in ('_objs', '_size', '_index')}
+
+    meta = {'version': _FORMAT_VERSION,
+            'source': source_hash(source) if source is not None else None,
+            'settings': settings,
+            'classes': classes,
+            'blocks': [_class_name(block.obj_type) for block in blocks],
+            'integral': [sorted(block._integral) for block in blocks]}
+    arrays['meta'] = np.array(_json.dumps(meta))
+
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+def load(path: str, source: str | None = None) -> Level:
+    """See Level.load_cache()."""
+    with _gc_paused():
+        return _load(path, source)
+
+
+def _set_all(cls: type, name: str, objs: list, values: list):
+    """Set attribute name of every Object in objs to the matching value, without a Python loop."""
+    _deque(map(getattr(cls, name).__set__, objs, values), maxlen=0)
+
+
+def _load(path: str, source: str | None) -> Level:
+    with np.load(path, allow_pickle=False) as data:
+        meta = _json.loads(data['meta'].item())
+        if meta.get('version') != _FORMAT_VERSION:
+            raise ValueError(f"{path} was written by another version of circloO_Helper.")
+        if source is not None and meta['source'] != source_hash(source):
+            raise ValueError(f"{path} is not a cache of the current contents of {source}.")
+
+        known = _object_classes()
+        order = data['order']
+        leaves = np.empty(len(order), dtype=object)
+
+        integral = meta.get('integral', [[]] * len(meta['blocks']))
+        for number, name in enumerate(meta['blocks']):
+            obj_type = known.get(name)
+            if obj_type is None:
+                raise ValueError(f"{path} contains Objects of class {name}, which has not been imported.")
+            block = ObjectColumns(obj_type, data[f'b{number}'])
+            block._integral = {column: data[f'b{number}.{column}'] for column in integral[number]}
+            leaves[np.flatnonzero(order == -(number + 1))[0]] = block
+
+        # Ids of the leaves, as assigned by Level.add(); ObjectColumns take up one id per row.
+        sizes = np.ones(len(order), dtype=np.int64)
+        is_block = order < 0
+        sizes[is_block] = [len(block) for block in leaves[is_block]]
+        ids = np.cumsum(sizes) - sizes
+
+        late = []   # (cls, objs, name, kind, column) of attributes that can refer to other Objects
+        for code, entry in enumerate(meta['classes']):
+            cls = known.get(entry['name'])
+            if cls is None:
+                raise ValueError(f"{path} contains Objects of class {entry['name']}, which has not been imported.")
+            positions = np.flatnonzero(order == code)
+            objs = list(map(cls.__new__, _repeat(cls, len(positions))))
+            leaves[positions] = objs
+
+            _set_all(cls, '_id', objs, ids[positions].tolist())
+            for name in _DERIVED_SLOTS[1:]:
+                _set_all(cls, name, objs, _repeat(None))
+            flag_number = 0
+            for name, kind in entry['columns']:
+                if kind == 'flag':
+                    column = ((data[f'c{code}.flags'] >> np.uint64(flag_number)) & np.uint64(1)).astype(bool)
+                    flag_number += 1
+                elif kind in ('ref', 'json'):
+                    late.append((cls, objs, name, kind, data[f'c{code}.{name}']))
+                    continue
+                else:
+                    column = data[f'c{code}.{name}']
+                values = column.tolist()
+                if kind == 'number':
+                    values = [int(value) if is_int else value
+                              for value, is_int in zip(values, data[f'c{code}.{name}.is_int'].tolist())]
+                _set_all(cls, name, objs, values)
+
+        leaves = leaves.tolist()
+        for cls, objs, name, kind, column in late:
+            if kind == 'ref':
+                values = [None if index == -1 else leaves[index] for index in column.tolist()]
+            else:
+                values = [_decode(_json.loads(text), leaves) for text in column.tolist()]
+            _set_all(cls, name, objs, values)
+
+    lvl = Level()
+    for name, value in meta['settings'].items():
+        setattr(lvl, name, _decode(value, leaves))
+    # Same as adding every leaf with Level.add(), whose ids were already set above.
+    for position in np.flatnonzero(is_block).tolist():
+        leaves[position]._set_id(int(ids[position]))
+    lvl._objs = leaves
+    lvl._size = int(sizes.sum())
+    return lvl
@@ -0,0 +1,196 @@
+from collections import Counter as _Counter
+from copy import copy as _copy
+from operator import attrgetter as _attrgetter
+from types import NoneType as _NoneType
+
+from .level import Level
+from .level_cache import _stored_slots
+from .object import CustomObject, Object, _gc_paused, _remap_references
+from .object_columns import ObjectColumns
+from .object_shapes import Collectable as _Collectable
+
+__all__ = ["structural_key", "diff", "merge", "LevelDiff"]
+
+# Types of attribute values that can be part of a key as they are.
+_PLAIN_TYPES = frozenset((bool, int, float, str, _NoneType, tuple))
+
+# Reads every attribute that defines an Object of a class at once; filled in by _getter().
+_GETTERS: dict[type, object] = {}
+
+
+def _getter(cls: type) -> _attrgetter:
+    getter = _GETTERS.get(cls)
+    if getter is None:
+        names = _stored_slots(cls)
+        if len(names) > 1:
+            getter = _attrgetter(*names)
+        else:
+            # attrgetter() of a single name returns the value itself instead of a tuple.
+            getter = lambda obj: tuple(getattr(obj, name) for name in names)
+        _GETTERS[cls] = getter
+    return getter
+
+
+def _key(obj, keys: dict[int, tuple]) -> tuple:
+    """
+    :param keys:    Keys that were already computed, by id() of their Object; updated with obj's key
+    :return: the structural key of an Object or ObjectColumns; see structural_key().
+    """
+    key = keys.get(id(obj))
+    if key is not None:
+        return key
+
+    if isinstance(obj, ObjectColumns):
+        rows = obj.rows
+        key = (ObjectColumns, obj.obj_type, rows.dtype, rows.tobytes())
+    else:
+        values = _getter(type(obj))(obj)
+        if not all(map(_PLAIN_TYPES.__contains__, map(type, values))):
+            keys[id(obj)] = (type(obj), None)   # Placeholder, in case of references back to obj.
+            values = tuple(_value_key(value, keys) for value in values)
+        key = (type(obj), values)
+    keys[id(obj)] = key
+    return key
+
+
+def _value_key(value, keys: dict[int, tuple]):
+    if isinstance(value, Object):
+        # Connected Objects are compared by their own keys, not by their ids.
+        return _key(value, keys)
+    if isinstance(value, _Collectable.Sound):
+        return (_Collectable.Sound,) + tuple(getattr(value, name) for name in _Collectable.Sound.__slots__)
+    if isinstance(value, list):
+        return tuple(_value_key(item, keys) for item in value)
+    return value
+
+
+def structural_key(obj: Object | ObjectColumns) -> tuple:
+    """
+    :return: a hashable key that is equal for Objects of the same class with equal attributes, i.e. Objects that are
+        written as the same level text. Connected Objects (e.g. the obj1 and obj2 of Connections) are compared by their
+        own keys, so the key does not depend on the ids of the Objects in a Level. Numbers are compared by value,
+        so 1 and 1.0 are equal. ObjectColumns are compared as a whole, by their Object type and rows.
+    """
+    return _key(obj, {})
+
+
+def _iter_units(lvl: Level):
+    """Yield the Objects and ObjectColumns of a Level, expanding other CustomObjects."""
+    for obj in lvl.get_objs():
+        if isinstance(obj, CustomObject):
+            yield from obj._iter_leaves()
+        else:
+            yield obj
+
+
+def _settings(lvl: Level) -> dict:
+    return {name: value for name, value in vars(lvl).items() if name not in ('_objs', '_size', '_index')}
+
+
+class LevelDiff:
+    def __init__(self, removed: list, added: list, unchanged: int, settings: dict):
+        """
+        Differences between two Levels, as returned by diff().
+        Objects are matched by structural_key(); if an Object occurs more often in one Level, the extra ones differ.
+        :param removed:     Objects of the first Level without a match in the second, in Level order
+        :param added:       Objects of the second Level without a match in the first, in Level order
+        :param unchanged:   Number of Objects of the second Level with a match in the first
+        :param settings:    Level settings that differ, as {name: (value in the first Level, value in the second)}
+        """
+        self.removed = removed
+        self.added = added
+        self.unchanged = unchanged
+        self.settings = settings
+
+    def __bool__(self):
+        """:return: True if the Levels differ."""
+        return bool(self.removed or self.added or self.settings)
+
+    def __repr__(self):
+        return f"LevelDiff({self.summary()})"
+
+    def summary(self) -> str:
+        """:return: a one-line description of the differences, e.g. "2 removed, 5 added, 120 unchanged"."""
+        text = f"{len(self.removed)} removed, {len(self.added)} added, {self.unchanged} unchanged"
+        if self.settings:
+            text += f"; settings changed: {', '.join(self.settings)}"
+        return text
+
+
+def diff(level_a: Level, level_b: Level) -> LevelDiff:
+    """
+    Compare the Objects and settings of two Levels in linear time, regardless of the order of their Objects.
+    CustomObjects are compared by the Objects they are composed of; ObjectColumns are compared as a whole.
+    :return: the differences, as a LevelDiff
+    """
+    keys = {}
+    units_a = list(_iter_units(level_a))
+    units_b = list(_iter_units(level_b))
+    keys_a = [_key(obj, keys) for obj in units_a]
+    keys_b = [_key(obj, keys) for obj in units_b]
+
+    remaining_b = _Counter(keys_b)
+    removed = []
+    for obj, key in zip(units_a, keys_a):
+        if remaining_b[key] > 0:
+            remaining_b[key] -= 1
+        else:
+            removed.append(obj)
+
+    remaining_a = _Counter(keys_a)
+    added = []
+    for obj, key in zip(units_b, keys_b):
+        if remaining_a[key] > 0:
+            remaining_a[key] -= 1
+        else:
+            added.append(obj)
+
+    settings_a = _settings(level_a)
+    settings_b = _settings(level_b)
+    settings = {name: (settings_a.get(name), settings_b.get(name))
+                for name in dict.fromkeys([*settings_a, *settings_b]) if settings_a.get(name) != settings_b.get(name)}
+    return LevelDiff(removed, added, len(units_b) - len(added), settings)
+
+
+def merge(*levels: Level) -> Level:
+    """
+    Merge Levels into a new Level in linear time, keeping the settings of the first Level.
+    Every Object of each Level is added in order, except those identical (see structural_key()) to an Object of an
+    earlier Level; identical Objects within a single Level (e.g. stacked on purpose) are all kept.
+    The Objects are copies, so the merged Levels are left unaltered; references between Objects (e.g. the obj1 and
+    obj2 of Connections) point to the copies, or to the copy of the first identical Object for one that was skipped.
+    CustomObjects are added as the Objects they are composed of; ObjectColumns are kept whole.
+    :param levels:  Levels to merge
+    :return: the merged Level
+    """
+    from .tools import _copy_many
+
+    if not levels:
+        raise ValueError("At least one Level is needed.")
+
+    new_lvl = _copy(levels[0])
+    new_lvl._objs = []
+    new_lvl._size = 0
+    new_lvl._index = None
+
+    keys = {}
+    # Copy of the first Object with each key, from the Levels merged so far.
+    earlier: dict[tuple, Object | ObjectColumns] = {}
+    copy_of: dict[int, Object | ObjectColumns] = {}
+    with _gc_paused():
+        for lvl in levels:
+            units = list(_iter_units(lvl))
+            copies = _copy_many(units)
+            current = {}
+            for obj, new_obj in zip(units, copies):
+                key = _key(obj, keys)
+                first = earlier.get(key)
+                if first is None:
+                    first = new_obj
+                    current.setdefault(key, new_obj)
+                    new_lvl.add(new_obj)
+                copy_of[id(obj)] = first
+            for key, new_obj in current.items():
+                earlier.setdefault(key, new_obj)
+        _remap_references(new_lvl.get_objs(), copy_of)
+    return new_lvl
@@ -1,10 +1,18 @@
+from collections import Counter as _Counter
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from types import SimpleNamespace as _SimpleNamespace
 from warnings import warn
+import math
+import os as _os
 import re
+import zipfile as _zipfile
 from pyperclip import paste
 
 from .level import Level
+from . import level_cache as _level_cache
 from .circloo_objects import *
-from .object import Object
+from .object import Object, _gc_paused, _slot_names
+from .object_columns import _prototype
 from .object_shapes import Connection
 from .object_types import Generator
 
@@ -22,7 +30,6 @@ _INPUT_TRIGGER_MAP = {
     10: ('on_trigger', None)
 }
 
-
 def _add_connections(lvl: Level, obj: Connection, indexes: list[int]):
     for idx in indexes[-2:]:
         if not obj.obj1:
@@ -45,329 +52,513 @@ def _parse_sfx(s: str):
     return group, note
 
 
-def parse(level_text: str) -> Level:
+# CONVERSIONS ##########################################################################################################
+# Each converts one token of an Object line to the value of an attribute.
 
-    if not level_text.startswith("/\n/ circloO level"):
-        raise ValueError("This text does not appear to contain a circloO level.")
+def _double(token: str) -> float:
+    """Half widths/heights in the level text --> full widths/heights."""
+    return float(token) * 2
 
-    lvl = Level()
+
+def _seconds(token: str) -> float:
+    """Frames in the level text --> seconds."""
+    return float(token) / 60
+
+
+def _flip_angle(token: str) -> float:
+    """Clockwise angles in the level text --> counter-clockwise angles."""
+    return 360 - float(token)
+
+
+def _flag(token: str) -> bool:
+    return bool(int(token))
+
+
+class _ObjectSpec:
+    def __init__(self, cls: type, attributes: tuple, start: int = 0, constants: dict | None = None):
+        """
+        Precompiled description of an Object line: which attribute each token on the line sets.
+        Calling the spec with the tokens of a line builds the Object without going through its constructor.
+        :param cls:         Object class to build
+        :param attributes:  Attribute set by each token, in order; None skips a token.
+                                Tokens are converted with float(), unless the attribute is given as
+                                (name, conversion); see CONVERSIONS.
+        :param start:       Index of the first token after the keyword
+        :param constants:   Attributes that have the same value for every Object built from this spec
+        """
+        self._cls = cls
+        self._stop = start + len(attributes)
+
+        self._fields = []   # (name, token index, conversion)
+        for index, attribute in enumerate(attributes, start):
+            if attribute is None:
+                continue
+            name, conversion = attribute if isinstance(attribute, tuple) else (attribute, float)
+            self._fields.append((name, index, conversion))
+
+        # Every other attribute keeps the value that the constructor gives it by default.
+        constants = constants or {}
+        prototype = _prototype(cls)
+        given = {name for name, _, _ in self._fields} | set(constants)
+        self._defaults = ([(name, getattr(prototype, name)) for name in _slot_names(cls) if name not in given]
+                          + list(constants.items()))
+
+    def __call__(self, args: list[str]) -> Object:
+        if len(args) < self._stop:
+            raise ValueError(f"expected {self._stop} values for {self._cls.__name__}, got {len(args)}")
+        cls = self._cls
+        obj = cls.__new__(cls)
+        for name, value in self._defaults:
+            setattr(obj, name, value)
+        # Converting the tokens one at a time in a plain loop is faster than map()ing float() over them: a line only
+        #   has a handful of tokens. They cannot be converted across lines, since modifier lines such as 'damping'
+        #   may set the same attributes later, and iter_parse() yields each Object as soon as it is complete.
+        for name, index, conversion in self._fields:
+            setattr(obj, name, conversion(args[index]))
+        return obj
+
+
+# OBJECT BUILDERS ######################################################################################################
+# For Objects that do not fit an _ObjectSpec.
+
+def _build_player(args: list[str]) -> Player:
+    restitution = args[5] if len(args) > 5 else 0
+    return Player(*map(float, args[0:5]), restitution, bullet=False)
+
+
+def _build_input_trigger(args: list[str]) -> InputTrigger:
+    x, y, trigger_type = args[0:3]
+    inp, action = _INPUT_TRIGGER_MAP[int(trigger_type)]
+    return InputTrigger(float(x), float(y), inp, action)
+
+
+def _build_special_connection(args: list[str]) -> SpecialConnection:
+    action, *numbers = args
+    return SpecialConnection(None, None, action.replace("'", ''), *map(float, numbers))
+
+
+def _build_glue(args: list[str]) -> Glue:
+    return Glue(None, None)
+
+
+_RECTANGLE = ('x', 'y', ('width', _double), ('height', _double), 'rotation')
+_TRIANGLE = ('x1', 'y1', 'x2', 'y2', 'x3', 'y3')
+_COLLECTABLE = ('x', 'y', ('appear_at_segment', int))
+_BY_CENTER = {'coords_by_center': True}
+_FROM_OBJECT = {'collect_from_object': True}
+_UNCONNECTED = {'obj1': None, 'obj2': None}
+
+# Object keywords, as keyword: builder(tokens after the keyword) -> Object.
+#   Keywords of lines starting with '/' or 'ic' include the second token, e.g. "ic 'i'".
+_OBJECT_KEYWORDS = {
+    # Solid objects
+    'c':        _ObjectSpec(SolidCircle, ('x', 'y', 'radius')),
+    'b':        _ObjectSpec(SolidRectangle, _RECTANGLE, constants=_BY_CENTER),
+    't':        _ObjectSpec(SolidTriangle, _TRIANGLE),
+    'l_at':     _ObjectSpec(Line, ('x1', 'y1', 'x2', 'y2', 'thickness')),
+    'curve':    _ObjectSpec(Curve, ('start_x', 'start_y', 'ctr1_x', 'ctr1_y', 'ctr2_x', 'ctr2_y', 'end_x', 'end_y',
+                                    'thickness', 'resolution')),
+    '/ LE_ARC_DESCRIPTION': _ObjectSpec(Arc, ('center_x', 'center_y',
+                                              ('start_angle', _flip_angle), ('end_angle', _flip_angle),
+                                              'radius', 'ctr_x', 'ctr_y', None, 'thickness')),
+    # Growing, moveable & rotatable objects
+    'gc':       _ObjectSpec(GrowingCircle, ('x', 'y', 'radius')),
+    'rGr':      _ObjectSpec(GrowingRectangle, _RECTANGLE, constants=_BY_CENTER),
+    'mc':       _ObjectSpec(MoveableCircle, ('x', 'y', 'radius', 'density', 'damping')),
+    'mb':       _ObjectSpec(MoveableRectangle, ('x', 'y', ('width', _double), ('height', _double),
+                                                'density', None, 'rotation', 'damping'), constants=_BY_CENTER),
+    'mt':       _ObjectSpec(MoveableTriangle, _TRIANGLE + ('density',)),
+    'rr':       _ObjectSpec(RotatableRectangle, ('x', 'y', 'width', 'height', 'rotation', 'density', 'damping'),
+                            constants=_BY_CENTER),
+    'rc':       _ObjectSpec(RotatableCircle, ('x', 'y', 'radius', 'motor_speed', 'torque')),
+    'wr':       _ObjectSpec(SpringyRectangle, _RECTANGLE + ('density', 'frequency', 'damping',
+                                                            'fulcrum_offset', 'fulcrum_radius'), constants=_BY_CENTER),
+    # Generators
+    'tmc':      _ObjectSpec(CircleGenerator, ('x', 'y', 'radius', 'density', ('disappear_after', _seconds),
+                                              ('wait_between', _seconds), ('init_delay', _seconds))),
+    'tmb':      _ObjectSpec(RectangleGenerator, ('x', 'y', ('width', _double), ('height', _double),
+                                                 'density', None, 'rotation', 'damping',
+                                                 ('disappear_after', _seconds), ('wait_between', _seconds),
+                                                 ('init_delay', _seconds)), constants=_BY_CENTER),
+    'tmt':      _ObjectSpec(TriangleGenerator, _TRIANGLE + ('density', None, None, ('disappear_after', _seconds),
+                                                            ('wait_between', _seconds), ('init_delay', _seconds))),
+    # Other objects
+    'portal':   _ObjectSpec(Portal, ('portal_x', 'portal_y', 'target_x', 'target_y',
+                                     ('appear_at_circle', int), ('deactivate_at_circle', int), 'min_touch_time')),
+    'y':        _build_player,
+    'dummy':    _ObjectSpec(Dummy, ('x', 'y')),
+    'partR':    _ObjectSpec(ParticleRectangle, _RECTANGLE, constants=_BY_CENTER),
+    'ispt':     _build_input_trigger,
+    # Collectables
+    "ic 'i'":   _ObjectSpec(Collectable, _COLLECTABLE),
+    "ic 'io'":  _ObjectSpec(Collectable, _COLLECTABLE, constants=_FROM_OBJECT),
+    "ic 'ig'":  _ObjectSpec(GravityCollectable, _COLLECTABLE + (None, 'grav_dir', 'grav_strength')),
+    "ic 'im'":  _ObjectSpec(GravityCollectable, _COLLECTABLE + (None, 'grav_dir', 'grav_strength'),
+                            constants=_FROM_OBJECT),
+    "ic 'is'":  _ObjectSpec(SizeCollectable, _COLLECTABLE + (None, 'size'), constants={'by_player_percent': False}),
+    "ic 'iso'": _ObjectSpec(SizeCollectable, _COLLECTABLE + (None, 'size'),
+                            constants={'by_player_percent': False, **_FROM_OBJECT}),
+    "ic 'irb'": _ObjectSpec(DisconnectCollectable, _COLLECTABLE),
+    "ic 'irbo'": _ObjectSpec(DisconnectCollectable, _COLLECTABLE, constants=_FROM_OBJECT),
+    "ic 'ips'": _ObjectSpec(SpeedCollectable, _COLLECTABLE + (None, 'speed', 'density')),
+    "ic 'ipso'": _ObjectSpec(SpeedCollectable, _COLLECTABLE + (None, 'speed', 'density'), constants=_FROM_OBJECT),
+    "ic 'isp'": _ObjectSpec(SpecialCollectable, _COLLECTABLE),
+    "ic 'ispo'": _ObjectSpec(SpecialCollectable, _COLLECTABLE, constants=_FROM_OBJECT),
+    # Connections
+    'r':        _ObjectSpec(Rope, ('offset1_x', 'offset1_y', 'offset2_x', 'offset2_y', 'max_length'),
+                            start=1, constants=_UNCONNECTED),
+    'hinge':    _ObjectSpec(Hinge, ('offset_x', 'offset_y', ('draw_connection_line', _flag),
+                                    ('enable_collisions', _flag), 'motor_speed', 'torque'),
+                            start=1, constants=_UNCONNECTED),
+    'pr':       _ObjectSpec(Slider, ('offset_x', 'offset_y'), start=4, constants=_UNCONNECTED),
+    'fd':       _ObjectSpec(FixedDistanceConnection, (('also_move_destination', _flag),), constants=_UNCONNECTED),
+    'd':        _ObjectSpec(DistanceConnection, ('offset1_x', 'offset1_y', 'offset2_x', 'offset2_y'),
+                            constants=_UNCONNECTED),
+    '/ p_description': _ObjectSpec(Pulley, ('pulley1_x', 'pulley1_y', 'pulley2_x', 'pulley2_y',
+                                            'offset1_x', 'offset1_y', 'offset2_x', 'offset2_y', 'ratio'),
+                                   constants=_UNCONNECTED),
+    '/ GLUE':   _build_glue,
+    'spc':      _build_special_connection,
+}
+
+
+# MODIFIERS & LEVEL SETTINGS ###########################################################################################
+
+def _setter(attribute: str, conversion=None):
+    """:return: a handler that sets attribute to the converted first argument, or to True if conversion is None."""
+    if conversion is None:
+        def handler(target, args):
+            setattr(target, attribute, True)
+    else:
+        def handler(target, args):
+            setattr(target, attribute, conversion(args[0]))
+    return handler
+
+
+def _set_off(obj: Object, args: list[str]):
+    if isinstance(obj, Generator):
+        obj.start_off = True
+    else:
+        # portal or collectable
+        obj.start_disabled = True
+
+
+def _set_sfx(obj: Object, args: list[str]):
+    if args[0] == "'none'":
+        ### NOTE: this gets rid of any volume/pitch info. very much edge-case, but notable
+        obj.mute()
+    else:
+        group, note = _parse_sfx(args[0])
+        if len(args) >= 4:
+            volume, pitch, play = args[1:4]
+        else:
+            volume, pitch, play = 1, 1, -1
+        obj.set_sound(group, note, float(volume), float(pitch), int(play))
+
+
+def _check_version(lvl: Level, args: list[str]):
+    if int(args[0]) < 10:
+        raise ValueError('circloO_Helper has only been tested with levelscript versions >= 10. '
+                         'Please update your circloO app to the latest version.')
+    if int(args[0]) > 10:
+        raise ValueError('circloO_Helper has not been updated to this version yet.')
+
+
+def _set_total_circles(lvl: Level, args: list[str]):
+    lvl.segments = float(args[0])
+    lvl.start_full = bool(int(args[1]))
+
+
+def _set_grav(lvl: Level, args: list[str]):
+    lvl.grav_scale = float(args[0])
+    lvl.grav_dir = float(args[1])
+
+
+def _set_music(lvl: Level, args: list[str]):
+    lvl.music = tuple(args[-2:])
+
+
+_MODIFIER_KEYWORDS = {
+    'attr':             _setter('attractor', float),
+    'wheelsprite':      _setter('wheelsprite'),
+    'iGrow':            _setter('part_of_segment', int),
+    'zoomFactor':       _setter('zoom', float),
+    'trigger':          _setter('is_trigger'),
+    'off':              _set_off,
+    'ott':              _setter('disable_on_trigger'),
+    'sfx':              _set_sfx,
+    'fixrot':           _setter('fix_rotation'),
+    'noanim':           _setter('no_fade'),
+    'samePosition':     _setter('keep_pos'),
+    'bullet':           _setter('bullet'),
+    'damping':          _setter('damping', float),
+    'p_free_hmovement': _setter('unlock_movement'),
+}
+
+_LEVEL_KEYWORDS = {
+    'levelscriptVersion':               _check_version,
+    'totalCircles':                     _set_total_circles,
+    'COLORS':                           _setter('color', int),
+    'grav':                             _set_grav,
+    'recommend_sfx':                    _setter('recommend_sfx'),
+    'music':                            _set_music,
+    'followOne':                        _setter('camera_follow_one_player_only'),
+    'affectAllPlayersByCollectibles':   _setter('affect_all_players_by_collectables'),
+    'use_legacy_line_drawing':          _setter('line_extra_width', str),
+    'gravcontrol':                      _setter('gravcontrol'),
+    '/ LE_DEFAULT_LINE_THICKNESS':      _setter('default_line_thickness', float),
+}
+
+
+# PARSER ###############################################################################################################
+
+class ParseReport:
+    def __init__(self, max_lines: int = 20):
+        """
+        Problems found while parsing a level. Pass one to parse(), read_file(), read_clipboard() or iter_parse()
+        to inspect them; otherwise, only a single summary warning is raised per level.
+        :param max_lines:   Number of offending lines whose line number and error are kept
+        """
+        self.max_lines = max_lines
+        self.errors: _Counter[str] = _Counter()             # Error kind (exception name) --> number of lines
+        self.lines: list[tuple[int, str]] = []              # (line number, error) of the first offending lines
+        self.unknown_keywords: _Counter[str] = _Counter()   # Unknown keyword --> number of lines
+
+    def __repr__(self):
+        return f"ParseReport({self.summary() or 'no problems'})"
+
+    @property
+    def error_count(self) -> int:
+        """:return: the number of lines that could not be parsed."""
+        return sum(self.errors.values())
+
+    def add_error(self, line_number: int, error: Exception):
+        self.errors[type(error).__name__] += 1
+        if len(self.lines) < self.max_lines:
+            self.lines.append((line_number, f"{type(error).__name__}: {error}"))
+
+    def update(self, other: 'ParseReport'):
+        """Add the problems of other, e.g. of a later part of the same level."""
+        self.errors.update(other.errors)
+        self.lines.extend(other.lines[:self.max_lines - len(self.lines)])
+        self.unknown_keywords.update(other.unknown_keywords)
+
+    def summary(self) -> str:
+        """:return: a one-line description of the problems, or an empty string if there are none."""
+        parts = []
+        if self.errors:
+            kinds = ', '.join(f"{kind}: {count}" for kind, count in self.errors.most_common())
+            line_numbers = ', '.join(str(line_number) for line_number, _ in self.lines[:5])
+            parts.append(f"{self.error_count} line(s) could not be parsed ({kinds}); first at line(s) {line_numbers}")
+        if self.unknown_keywords:
+            keywords = ', '.join(f"{keyword} ({count})" for keyword, count in self.unknown_keywords.most_common(5))
+            parts.append(f"unknown keywords: {keywords}")
+        return '; '.join(parts)
+
+    def warn(self):
+        """Raise a single warning summarizing the problems, if there are any."""
+        if self.errors or self.unknown_keywords:
+            warn(f"Level parsed with problems: {self.summary()}. Use a ParseReport for details.")
+
+
+def _skip_header(lines):
+    """:return: an iterator over the lines after the 2-line header, which is checked to belong to a circloO level."""
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    lines = iter(lines)
+
+    head = [next(lines, '').rstrip('\r\n') for _ in range(2)]
+    if head[0] != '/' or not head[1].startswith('/ circloO level'):
+        raise ValueError("This text does not appear to contain a circloO level.")
+    return lines
+
+
+def _fail(report: ParseReport, line_number: int, error: Exception, strict: bool):
+    report.add_error(line_number, error)
+    if strict:
+        raise ValueError(f"Line {line_number} could not be parsed: {error}") from error
+
+
+def iter_parse(lines, level: Level | None = None, strict: bool = False, report: ParseReport | None = None):
+    """
+    Parse a level one Object at a time, without holding the whole level text or all of its Objects in memory.
+    Useful to filter or transform very large levels; parse() and read_file() collect its Objects into a Level.
+    :param lines:   Level text, or an iterable of its lines, e.g. an open file handle
+    :param level:   Level that receives the level settings (gravity, music, ...); if None, they are discarded
+    :param strict:  If True, raise a ValueError at the first line that cannot be parsed instead of skipping it
+    :param report:  ParseReport that collects the problems found; if None, a single warning summarizes them
+    :return: generator of (obj, connections) pairs, yielded as soon as each Object's '<' line is read.
+                connections holds the ids of the Objects that obj connects to, if any; the id of an Object is
+                its position in the order yielded. obj1 and obj2 of connections are left as None.
+    """
+    lines = _skip_header(lines)
+    problems = report if report is not None else ParseReport()
+    for obj, connections, _ in _parse_lines(lines, level if level is not None else Level(), problems, 3, strict):
+        yield obj, connections
+    if report is None:
+        problems.warn()
+
+
+def _parse_lines(lines, lvl: Level, report: ParseReport, first_line: int = 1, strict: bool = False):
+    """
+    Parse level lines without checking for the level header; see iter_parse().
+    :return: generator of (obj, connections, line number of its '<' line)
+    """
     cur_obj: Object | None = None
     connections = []
     skip = 0
 
-    for line in level_text.splitlines():
-        try:
-            if skip > 0:
-                # print("SKIPPED LINE")       # DEBUG
-                skip -= 1
-                continue
-            # print("NEW LINE:", line)        # DEBUG
-
-            split_line = line.split(' ')
-            # print(split_line)            # DEBUG
-
-            match split_line[0]:
+    for line_number, line in enumerate(lines, first_line):
+        if skip > 0:
+            skip -= 1
+            continue
 
-                case 'levelscriptVersion':
-                    # Verify version.
-                    if int(split_line[1]) < 10:
-                        raise ValueError('circloO_Helper has only been tested with levelscript versions >= 10. '
-                                         'Please update your circloO app to the latest version.')
-                    if int(split_line[1]) > 10:
-                        raise ValueError('circloO_Helper has not been updated to this version yet.')
+        split_line = line.rstrip('\r\n').split(' ')
+        keyword = split_line[0]
+        if keyword == '<':
+            if cur_obj is not None:
+                yield cur_obj, connections, line_number
+            connections = []
+            cur_obj = None
+            continue
 
-                case '/':
-                    if len(split_line) <= 1:
-                        continue
-                    match split_line[1]:
-                        case 'SKIP':
-                            skip = int(split_line[2])
-                        case 'LE_DEFAULT_LINE_THICKNESS':
-                            lvl.default_line_thickness = float(split_line[2])
-                        case 'LE_ARC_DESCRIPTION':
-                            cx, cy, sa, ea, rad, crx, cry, _, thickness = split_line[2:11]
-                            cur_obj = Arc(float(cx), float(cy),
-                                          360 - float(sa), 360 - float(ea),
-                                          float(rad),
-                                          float(crx), float(cry),
-                                          float(thickness))
-                        case 'p_description':
-                            cur_obj = Pulley(None, None, *map(float, split_line[2:11]))
-                        case 'GLUE':
-                            cur_obj = Glue(None, None)
-                            connections = list(map(int, split_line[2: 4]))
-
-                # LEVEL MODIFIERS.
-
-                case 'totalCircles':
-                    lvl.segments = float(split_line[1])
-                    lvl.start_full = bool(int(split_line[2]))
-
-                case 'COLORS':
-                    lvl.color = int(split_line[1])
-
-                case 'grav':
-                    lvl.grav_scale = float(split_line[1])
-                    lvl.grav_dir = float(split_line[2])
-
-                case 'recommend_sfx':
-                    lvl.recommend_sfx = True
-
-                case 'music':
-                    lvl.music = tuple(split_line[-2:])
-
-                case 'followOne':
-                    lvl.camera_follow_one_player_only = True
-
-                case 'affectAllPlayersByCollectibles':
-                    lvl.affect_all_players_by_collectables = True
-
-                case 'use_legacy_line_drawing':
-                    lvl.line_extra_width = split_line[1]
-
-                case 'gravcontrol':
-                    lvl.gravcontrol = True
-
-                # OBJECTS.
-
-                case 'c':
-                    cur_obj = SolidCircle(*map(float, split_line[1:4]))
-
-                case 'b':
-                    cur_obj = SolidRectangle(*map(float, split_line[1:6]), coords_by_center=True)
-                    cur_obj.width *= 2
-                    cur_obj.height *= 2
-
-                case 't':
-                    cur_obj = SolidTriangle(*map(float, split_line[1:7]))
-
-                case 'l_at':
-                    cur_obj = Line(*map(float, split_line[1:6]))
-
-                case 'curve':
-                    cur_obj = Curve(*map(float, split_line[1:11]))
-
-                case 'gc':
-                    cur_obj = GrowingCircle(*map(float, split_line[1:4]))
-
-                case 'rGr':
-                    cur_obj = GrowingRectangle(*map(float, split_line[1:6]), coords_by_center=True)
-                    cur_obj.width *= 2
-                    cur_obj.height *= 2
-
-                case 'mc':
-                    cur_obj = MoveableCircle(*map(float, split_line[1:6]))
-
-                case 'mb':
-                    x, y, width, height, density, _, rotation, damping = split_line[1:9]
-                    cur_obj = MoveableRectangle(float(x), float(y), float(width) * 2, float(height) * 2,
-                                                float(density), float(damping), float(rotation),
-                                                coords_by_center=True)
-
-                case 'mt':
-                    cur_obj = MoveableTriangle(*map(float, split_line[1:8]))
-
-                case 'rr':
-                    cur_obj = RotatableRectangle(*map(float, split_line[1:8]), coords_by_center=True)
-
-                case 'rc':
-                    cur_obj = RotatableCircle(*map(float, split_line[1:6]))
-
-                case 'wr':
-                    cur_obj = SpringyRectangle(*map(float, split_line[1:11]), coords_by_center=True)
-                    cur_obj.width *= 2
-                    cur_obj.height *= 2
-
-                case 'tmc':
-                    x, y, radius, density, disp_after, wait_bw, delay = split_line[1:8]
-                    cur_obj = CircleGenerator(float(x), float(y), float(radius), float(density),
-                                              float(disp_after) / 60, float(wait_bw) / 60, float(delay) / 60)
-
-                case 'tmb':
-                    x, y, width, height, density, _, rotation, damping, disp_after, wait_bw, delay = split_line[1:12]
-                    cur_obj = RectangleGenerator(float(x), float(y),
-                                                 float(width) * 2, float(height) * 2,
-                                                 float(density), float(rotation), float(damping),
-                                                 float(disp_after) / 60, float(wait_bw) / 60, float(delay) / 60,
-                                                 coords_by_center=True)
-
-                case 'tmt':
-                    disp_after, wait_bw, delay = split_line[10:13]
-                    cur_obj = TriangleGenerator(*map(float, split_line[1:8]),
-                                                float(disp_after) / 60, float(wait_bw) / 60, float(delay) / 60)
-
-                case 'portal':
-                    appear, disp, min_time = split_line[5:8]
-                    cur_obj = Portal(*map(float, split_line[1:5]), int(appear), int(disp), float(min_time))
-
-                case 'y':
-                    restitution = split_line[6] if len(split_line) > 6 else 0
-                    cur_obj = Player(*map(float, split_line[1:6]), restitution, bullet=False)
-
-                case 'dummy':
-                    cur_obj = Dummy(*map(float, split_line[1:3]))
-
-                case 'partR':
-                    cur_obj = ParticleRectangle(*map(float, split_line[1:6]), coords_by_center=True)
-                    cur_obj.width *= 2
-                    cur_obj.height *= 2
-
-                case 'ispt':
-                    x, y, trigger_type = split_line[1:4]
-                    inp, action = _INPUT_TRIGGER_MAP[int(trigger_type)]
-                    cur_obj = InputTrigger(float(x), float(y), inp, action)
-
-                # COLLECTABLES.
-
-                case 'ic':
-                    match split_line[1]:
-                        case "'i'":
-                            x, y, appear = split_line[2:5]
-                            cur_obj = Collectable(float(x), float(y), int(appear))
-                        case "'io'":
-                            x, y, appear = split_line[2:5]
-                            cur_obj = Collectable(float(x), float(y), int(appear), collect_from_object=True)
-                        case "'ig'":
-                            x, y, appear, _, direction, strength = split_line[2:8]
-                            cur_obj = GravityCollectable(float(x), float(y), int(appear), float(direction), float(strength))
-                        case "'im'":
-                            x, y, appear, _, direction, strength = split_line[2:8]
-                            cur_obj = GravityCollectable(float(x), float(y), int(appear), float(direction), float(strength),
-                                                         collect_from_object=True)
-                        case "'is'":
-                            x, y, appear, _, size = split_line[2:7]
-                            cur_obj = SizeCollectable(float(x), float(y), int(appear), float(size), by_player_percent=False)
-                        case "'iso'":
-                            x, y, appear, _, size = split_line[2:7]
-                            cur_obj = SizeCollectable(float(x), float(y), int(appear), float(size), by_player_percent=False,
-                                                      collect_from_object=True)
-                        case "'irb'":
-                            x, y, appear = split_line[2:5]
-                            cur_obj = DisconnectCollectable(float(x), float(y), int(appear))
-                        case "'irbo'":
-                            x, y, appear = split_line[2:5]
-                            cur_obj = DisconnectCollectable(float(x), float(y), int(appear), collect_from_object=True)
-                        case "'ips'":
-                            x, y, appear, _, speed, density = split_line[2:8]
-                            cur_obj = SpeedCollectable(float(x), float(y), int(appear), float(speed), float(density))
-                        case "'ipso'":
-                            x, y, appear, _, speed, density = split_line[2:8]
-                            cur_obj = SpeedCollectable(float(x), float(y), int(appear), float(speed), float(density),
-                                                       collect_from_object=True)
-                        case "'isp'":
-                            x, y, appear = split_line[2:5]
-                            cur_obj = SpecialCollectable(float(x), float(y), int(appear))
-                        case "'ispo'":
-                            x, y, appear = split_line[2:5]
-                            cur_obj = SpecialCollectable(float(x), float(y), int(appear), collect_from_object=True)
-
-                # CONNECTIONS.
-
-                case 'r':
-                    cur_obj = Rope(None, None, *map(float, split_line[2:7]))
-
-                case 'hinge':
-                    x, y, draw, coll, speed, torque = split_line[2:8]
-                    cur_obj = Hinge(None, None,
-                                    float(x), float(y),
-                                    bool(int(draw)), bool(int(coll)),
-                                    float(speed), float(torque))
-
-                case 'pr':
-                    cur_obj = Slider(None, None, *map(float, split_line[5:7]))
-
-                case 'fd':
-                    cur_obj = FixedDistanceConnection(None, None, bool(int(split_line[1])))
-
-                case 'd':
-                    cur_obj = DistanceConnection(None, None, *map(float, split_line[1:5]))
-
-                case 'spc':
-                    action, *args = split_line[1:]
-                    args = map(float, args)
-                    action = action.replace("'", '')
-                    cur_obj = SpecialConnection(None, None, action, *args)
-
-                # OBJECT MODIFIERS.
-
-                case 'attr':
-                    cur_obj.attractor = float(split_line[1])
-
-                case 'wheelsprite':
-                    cur_obj.wheelsprite = True
-
-                case 'iGrow':
-                    cur_obj.part_of_segment = int(split_line[1])
-
-                case 'zoomFactor':
-                    cur_obj.zoom = float(split_line[1])
-
-                case 'trigger':
-                    cur_obj.is_trigger = True
-
-                case 'off':
-                    if isinstance(cur_obj, Generator):
-                        cur_obj.start_off = True
-                    else:
-                        # portal or collectable
-                        cur_obj.start_disabled = True
-
-                case 'ott':
-                    cur_obj.disable_on_trigger = True
-
-                case 'sfx':
-                    if split_line[1] == "'none'":
-                        ### NOTE: this gets rid of any volume/pitch info. very much edge-case, but notable
-                        cur_obj.mute()
-                    else:
-                        group, note = _parse_sfx(split_line[1])
-                        if len(split_line) >= 5:
-                            volume, pitch, play = split_line[2:5]
-                        else:
-                            volume, pitch, play = 1, 1, -1
-                        cur_obj.set_sound(group, note, float(volume), float(pitch), int(play))
-
-                case 'fixrot':
-                    cur_obj.fix_rotation = True
-
-                case 'noanim':
-                    cur_obj.no_fade = True
-
-                case 'samePosition':
-                    cur_obj.keep_pos = True
-
-                case 'bullet':
-                    cur_obj.bullet = True
-
-                case 'damping':
-                    cur_obj.damping = float(split_line[1])
-
-                case 'p_free_hmovement':
-                    cur_obj.unlock_movement = True
-
-                case '>':
-                    connections.append(int(split_line[1]))
-
-                case '<':
-                    if cur_obj:
-                        lvl.add(cur_obj)
-                        if len(connections) > 0:
-                            _add_connections(lvl, cur_obj, connections)
-                    connections.clear()
-                    cur_obj = None
+        try:
+            if (keyword == '/' or keyword == 'ic') and len(split_line) > 1:
+                keyword = f'{keyword} {split_line[1]}'
+                args = split_line[2:]
+            else:
+                args = split_line[1:]
+
+            spec = _OBJECT_KEYWORDS.get(keyword)
+            if spec is not None:
+                cur_obj = spec(args)
+                if keyword == '/ GLUE':
+                    connections = list(map(int, args[0:2]))
+            elif keyword in _MODIFIER_KEYWORDS:
+                _MODIFIER_KEYWORDS[keyword](cur_obj, args)
+            elif keyword == '>':
+                connections.append(int(args[0]))
+            elif keyword in _LEVEL_KEYWORDS:
+                _LEVEL_KEYWORDS[keyword](lvl, args)
+            elif keyword == '/ SKIP':
+                skip = int(args[0])
+            elif keyword and keyword[0] != '/':
+                # Lines starting with '/' are comments and editor settings, which are ignored.
+                report.unknown_keywords[keyword] += 1
 
         except Exception as e:
-            warn(f"One or more objects could not be parsed: {e}")
+            _fail(report, line_number, e, strict)
+
+
+def _collect(lvl: Level, records, report: ParseReport, strict: bool = False) -> Level:
+    """Add the (obj, connections, line number) records to lvl in order, connecting each Object to earlier ones."""
+    with _gc_paused():
+        for obj, connections, line_number in records:
+            lvl.add(obj)
+            if connections:
+                try:
+                    _add_connections(lvl, obj, connections)
+                except Exception as e:
+                    _fail(report, line_number, e, strict)
 
     return lvl
 
 
-def read_clipboard() -> Level:
-    lvl = parse(paste())
+def _read_level(lines, strict: bool, report: ParseReport | None) -> Level:
+    """Parse lines into a new Level, connecting its Objects to each other."""
+    lines = _skip_header(lines)
+    lvl = Level()
+    problems = report if report is not None else ParseReport()
+    _collect(lvl, _parse_lines(lines, lvl, problems, 3, strict), problems, strict)
+    if report is None:
+        problems.warn()
     return lvl
 
 
-def read_file(path: str) -> Level:
+def _parse_chunk(text: str, first_line: int, strict: bool) -> tuple[list, dict, ParseReport]:
+    """
+    Parse consecutive records of a level. Runs in a worker process of parse().
+    :return: the (obj, connections, line number) records, the level settings that were set, and the problems found
+    """
+    # Level settings are recorded instead of applied, since the Level lives in the main process.
+    settings = _SimpleNamespace()
+    report = ParseReport()
+    with _gc_paused():
+        records = list(_parse_lines(text.splitlines(), settings, report, first_line, strict))
+    return records, vars(settings), report
+
+
+def _iter_chunk_records(level_text: str, lvl: Level, workers: int, strict: bool, report: ParseReport):
+    """Parse level_text in worker processes, yielding the records of each chunk in order."""
+    # Chunks end right after a '<' line, so every record is parsed by a single worker.
+    #   A few chunks per worker keeps the workers busy even if some chunks take longer than others.
+    size = max(1, math.ceil(len(level_text) / (workers * 4)))
+    chunks = []
+    first_lines = []
+    start = 0
+    line_number = 1
+    while start < len(level_text):
+        end = level_text.find('\n<', start + size)
+        end = level_text.find('\n', end + 1) if end != -1 else -1
+        end = end + 1 if end != -1 else len(level_text)
+        chunks.append(level_text[start:end])
+        first_lines.append(line_number)
+        line_number += chunks[-1].count('\n')
+        start = end
+
+    with _ProcessPoolExecutor(max_workers=workers) as executor:
+        for records, settings, chunk_report in executor.map(_parse_chunk, chunks, first_lines,
+                                                            [strict] * len(chunks)):
+            for name, value in settings.items():
+                setattr(lvl, name, value)
+            report.update(chunk_report)
+            yield from records
+
+
+def parse(level_text: str, workers: int | None = None, strict: bool = False,
+          report: ParseReport | None = None) -> Level:
+    """
+    Parse level text.
+    :param level_text:  Level text
+    :param workers:     If greater than 1, the level is split into chunks of consecutive records, which are parsed in
+                            this many worker processes and then connected in order. Gives the same Level as parsing
+                            serially; faster for very large levels. On Windows and macOS, call this from within an
+                            `if __name__ == '__main__':` block.
+    :param strict:      If True, raise a ValueError at the first line that cannot be parsed instead of skipping it
+    :param report:      ParseReport that collects the problems found; if None, a single warning summarizes them
+    :return: the parsed Level
+    """
+    # '/ SKIP' lines can hide the lines after them from the parser, so records cannot be split around them.
+    if workers is None or workers <= 1 or '\n/ SKIP ' in level_text:
+        return _read_level(level_text, strict, report)
+
+    if not level_text.startswith(("/\n/ circloO level", "/\r\n/ circloO level")):
+        raise ValueError("This text does not appear to contain a circloO level.")
+
+    lvl = Level()
+    problems = report if report is not None else ParseReport()
+    _collect(lvl, _iter_chunk_records(level_text, lvl, workers, strict, problems), problems, strict)
+    if report is None:
+        problems.warn()
+    return lvl
+
+
+def read_clipboard(strict: bool = False, report: ParseReport | None = None) -> Level:
+    lvl = parse(paste(), strict=strict, report=report)
+    return lvl
+
+
+def read_file(path: str, strict: bool = False, report: ParseReport | None = None, use_cache: bool = True) -> Level:
+    # A cache holds no parse problems, so it is only used when they are neither raised nor reported.
+    if use_cache and not strict and report is None and _os.path.exists(path + _level_cache.CACHE_SUFFIX):
+        # Written by Level.save_cache(path + '.npz', source=path); ignored if the file has changed since, or if it
+        #   cannot be read, e.g. because it is corrupt or was written by another version.
+        try:
+            return _level_cache.load(path + _level_cache.CACHE_SUFFIX, source=path)
+        except (OSError, EOFError, KeyError, ValueError, _zipfile.BadZipFile):
+            pass
+
+    # The file is parsed line by line, so its text is never read into memory all at once.
     with open(path, 'r') as f:
-        lvl = parse(f.read())
+        lvl = _read_level(f, strict, report)
     return lvl
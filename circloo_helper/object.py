@@ -1,56 +1,369 @@
+from contextlib import contextmanager as _contextmanager
+from numbers import Integral as _Integral, Real as _Real
+from collections import deque as _deque
+from operator import attrgetter as _attrgetter
+from types import SimpleNamespace as _SimpleNamespace
+import gc as _gc
+
+import numpy as np
+
+
+class _Templates(dict):
+    """Format strings with a given number of space-separated fields, e.g. {3: '{} {} {}'}, created on first use."""
+
+    def __missing__(self, count: int) -> str:
+        template = self[count] = ' '.join(['{}'] * count)
+        return template
+
+
+_TEMPLATES = _Templates()
+
+
+def _format_number(value, precision: int | None = None) -> str:
+    """
+    Convert a field value to text.
+    :param value:       Field value; only non-integer numbers are affected by precision
+    :param precision:   Maximum number of decimals. Trailing zeros are trimmed, so integral values are written as ints,
+                            and -0 is written as 0. If None, the value is written with str().
+    """
+    if precision is None:
+        return str(value)
+    kind = type(value)
+    # Exact type checks skip the slower checks against the number ABCs for almost every field.
+    if kind is not float and (kind is int or kind is str
+                              or isinstance(value, (str, _Integral)) or not isinstance(value, _Real)):
+        return str(value)
+    text = f'{value:.{precision}f}'
+    if precision > 0 and '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+
+@_contextmanager
+def _gc_paused():
+    """
+    Pause the cyclic garbage collector while creating many Objects at once, e.g. when parsing a level.
+    Objects do not form reference cycles, so collecting only slows down their creation.
+    """
+    enabled = _gc.isenabled()
+    _gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            _gc.enable()
+
+
 class Object:
+    # Objects use __slots__ instead of an instance dict, since CustomObjects such as Pixels can create millions of them.
+    #   Mixins (shapes and types) declare no slots of their own; they list their attributes in _SLOTS,
+    #   and each concrete class combines the _SLOTS of its bases into its __slots__.
+    #   _text caches the Object's text; it is reused while _text_state (the precision and the values of all other slots,
+    #   read by _text_getter) is unchanged. Attribute assignment is not hooked, since that slows down every Object.
+    #   _bounds caches the bounding box in the same way, while _bounds_state (see _BOUNDS_ATTRIBUTES) is unchanged.
+    __slots__ = ('_id', '_text', '_text_state', '_bounds', '_bounds_state')
+    _SLOTS = ()
+
+    # Modifiers written on the lines after an Object's attributes, as (attribute, text, default) entries.
+    #   If default is None, text is added whenever the attribute is truthy.
+    #   Otherwise, text is formatted with the attribute's value whenever the attribute is not equal to default.
+    # Each class only lists its own modifiers; they are combined along the MRO in __init_subclass__.
+    _MODIFIERS = ()
+    _modifier_table = ()
+    _has_modifiers = False
+    _modifier_getter = None
+    _modifier_defaults = ()
+
+    # Attributes that the bounding box depends on, read by _bounds_of(); see bounds().
+    #   Shapes that have a bounding box list them and override _bounds_of().
+    _BOUNDS_ATTRIBUTES = ()
+    _bounds_getter = None
+
+    # If True, the ids of obj1 and obj2 are written before the Object's first line ("> id").
+    #   Set by the Connection shape; Glue also has obj1 and obj2 but does not label them this way.
+    _CONNECTS = False
+
+    # If False, the text is never cached, e.g. because it contains the ids of other Objects, which can change without
+    #   this Object changing.
+    _CACHES_TEXT = True
+
+    # Set per class in __init_subclass__; see __copy__() and _to_str().
+    _all_slots = ()
+    _slot_getter = None
+    _text_getter = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        table = []
+        for klass in reversed(cls.__mro__):
+            table.extend(klass.__dict__.get('_MODIFIERS', ()))
+        cls._modifier_table = tuple(table)
+        # Classes without any modifiers skip _modifier_text() entirely.
+        cls._has_modifiers = bool(table) or cls._modifier_text is not Object._modifier_text
+        # Reads every attribute of the table at once; while they equal _modifier_defaults, the table adds no modifier.
+        #   A single attribute is read as a value rather than a tuple.
+        if table:
+            defaults = tuple(False if default is None else default for _, _, default in table)
+            cls._modifier_getter = _attrgetter(*[attribute for attribute, _, _ in table])
+            cls._modifier_defaults = defaults if len(defaults) > 1 else defaults[0]
+        cls._bounds_getter = _attrgetter(*cls._BOUNDS_ATTRIBUTES) if cls._BOUNDS_ATTRIBUTES else None
+
+        names = _slot_names(cls)
+        cls._all_slots = tuple(names)
+        cls._slot_getter = _attrgetter(*names)
+        # Reads everything that the text can depend on at once, to check whether the cached text is still valid.
+        names = [name for name in names if name not in _CACHE_SLOTS] or ['__class__']
+        getter = _attrgetter(*names)
+        if cls.__dictoffset__:
+            # Instances of classes without __slots__ keep their other attributes in a __dict__.
+            cls._text_getter = staticmethod(lambda obj: (getter(obj), tuple(obj.__dict__.items())))
+        else:
+            cls._text_getter = getter
+
     def __init__(self):
         self._id = -1
-        self._attributes = []
-        self._modifiers = []
+        self._text = None
+        self._text_state = None
+        self._bounds = None
+        self._bounds_state = None
 
     def __repr__(self):
         return self._to_str()
 
+    def __copy__(self):
+        # Copy the slots directly; copy() would otherwise restore them one by one through copyreg and setattr().
+        cls = type(self)
+        new = cls.__new__(cls)
+        try:
+            values = cls._slot_getter(self)
+        except AttributeError:
+            # Some slots were never set.
+            for name in cls._all_slots:
+                if hasattr(self, name):
+                    setattr(new, name, getattr(self, name))
+        else:
+            # A plain loop is faster than map() over the dozen or so slots of an Object.
+            for name, value in zip(cls._all_slots, values):
+                setattr(new, name, value)
+        if cls.__dictoffset__:
+            new.__dict__.update(self.__dict__)
+        return new
+
+    def touch(self):
+        """
+        Mark the cached text (and bounding box) as out of date so that the Object is converted to text again on the next
+        export.
+        Changes to attributes are detected automatically; only call this after changing an attribute in place
+        (e.g. editing the Sound of a Collectable) or replacing a number with an equal one of another type (1 -> 1.0).
+        """
+        self._text_state = None
+        self._bounds_state = None
+
     def _set_id(self, id: int):
         self._id = id
 
-    def _set_attributes(self, *args):
-        """This method must be called in every subclass."""
-        self._attributes = list(args)
+    @staticmethod
+    def _bounds_of(obj) -> tuple:
+        """
+        Override in shapes that have a bounding box, along with _BOUNDS_ATTRIBUTES.
+        :param obj: an Object, or any object whose attributes are NumPy columns of the _BOUNDS_ATTRIBUTES of many Objects
+        :return: (xmin, xmax, ymin, ymax), as numbers or as NumPy columns.
+        """
+        raise TypeError(f"{type(obj).__name__} has no bounding box.")
 
-    def _add_modifier(self, modifier):
-        self._modifiers.append(modifier)
+    def bounds(self) -> tuple[float, float, float, float]:
+        """
+        :return: the axis-aligned bounding box of the Object as (xmin, xmax, ymin, ymax).
+        The box is cached, and only computed again after the attributes it depends on change.
+        """
+        if self._bounds_getter is None:
+            raise TypeError(f"{type(self).__name__} has no bounding box.")
+        state = self._bounds_getter(self)
+        if state != self._bounds_state:
+            self._bounds = tuple(map(float, self._bounds_of(self)))
+            self._bounds_state = state
+        return self._bounds
 
-    def _update_modifiers(self):
-        """This method must be overridden in each subclass that uses modifiers."""
-        self._modifiers.clear()
+    def _fields(self) -> tuple:
+        """
+        This must be overridden in every subclass.
+        :return: the attributes written on the Object's first line, starting with its levelscript keyword.
+        """
+        return ()
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        """This should be overridden in every subclass to call _set_attributes()."""
-        self._update_modifiers()
-        primary = ' '.join(map(str, self._attributes))
-        secondary = ''.join(['\n' + str(m) for m in self._modifiers])  # New lines included here.
-        connstr = ""
-        if (hasattr(self, 'obj1')
-                and hasattr(self, 'obj2')
-                and type(self).__name__ != 'Glue'):     # Glue has connections but does not label them the same way.
-            connstr = f"> {self.obj1.get_id()}\n> {self.obj2.get_id()}\n"
+    def _modifier_text(self, precision: int | None = None) -> str:
+        """
+        :param precision:   Maximum number of decimals of numbers; see _format_number()
+        :return: the modifier lines from the modifier table, each preceded by a new line.
+        Override to add modifiers the table cannot describe.
+        """
+        text = ''
+        if self._modifier_getter is None or self._modifier_getter(self) == self._modifier_defaults:
+            return text
+        for attribute, modifier, default in self._modifier_table:
+            value = getattr(self, attribute)
+            if default is None:
+                if value:
+                    text += '\n' + modifier
+            elif value != default:
+                text += '\n' + modifier.format(_format_number(value, precision))
+        return text
 
-        line_enumeration = f"\n< {self._id}" if enumeration else ""
+    def _to_str(self, enumeration: bool = False, precision: int | None = None) -> str:
+        state = (precision, self._text_getter(self))
+        if state == self._text_state:
+            text = self._text
+        else:
+            fields = self._fields()
+            if precision is not None:
+                fields = [_format_number(field, precision) for field in fields]
+            text = _TEMPLATES[len(fields)].format(*fields)
+            if self._has_modifiers:
+                text += self._modifier_text(precision)
+            if self._CACHES_TEXT:
+                self._text = text
+                self._text_state = state
 
-        return connstr + primary + secondary + line_enumeration
+        # The ids of connected Objects can change without this Object changing, so they are never cached.
+        if self._CONNECTS:
+            text = f"> {self.obj1.get_id()}\n> {self.obj2.get_id()}\n" + text
+        if enumeration:
+            text += f"\n< {self._id}"
+        return text
 
     def get_id(self) -> int:
         return self._id
 
 
+# Slots that caches are kept in; the text does not depend on them.
+_CACHE_SLOTS = frozenset(Object.__slots__)
+
+
+def _leaf_boxes(leaves) -> tuple[list, np.ndarray]:
+    """
+    :param leaves:  Objects and ObjectColumns; Objects without a bounding box are skipped
+    :return: (owners, boxes): one (xmin, xmax, ymin, ymax) row of boxes per Object, in order, and the leaf it belongs
+        to; ObjectColumns have one box per row.
+    Boxes that are out of date are computed for all Objects of a class at once, and cached in each Object.
+    """
+    owners = []
+    boxes = []
+    stale: dict[type, tuple[list[Object], list[int]]] = {}
+    for leaf in leaves:
+        if not isinstance(leaf, Object):
+            # ObjectColumns compute the boxes of all their rows at once.
+            rows = leaf._row_bounds()
+            owners.extend([leaf] * len(rows))
+            boxes.extend(rows.tolist())
+        elif leaf._bounds_getter is not None:
+            if leaf._bounds_getter(leaf) != leaf._bounds_state:
+                objs, positions = stale.setdefault(type(leaf), ([], []))
+                objs.append(leaf)
+                positions.append(len(boxes))
+            owners.append(leaf)
+            boxes.append(leaf._bounds)
+
+    for cls, (objs, positions) in stale.items():
+        states = list(map(cls._bounds_getter, objs))
+        names = cls._BOUNDS_ATTRIBUTES
+        values = np.array(states, dtype=float).reshape(len(objs), len(names))
+        columns = _SimpleNamespace(**{name: values[:, i] for i, name in enumerate(names)})
+        new_boxes = list(zip(*(np.broadcast_to(column, len(objs)).tolist() for column in cls._bounds_of(columns))))
+        _deque(map(Object._bounds.__set__, objs, new_boxes), maxlen=0)
+        _deque(map(Object._bounds_state.__set__, objs, states), maxlen=0)
+        for position, box in zip(positions, new_boxes):
+            boxes[position] = box
+
+    return owners, np.array(boxes, dtype=float).reshape(len(boxes), 4)
+
+
+def _combined_bounds(leaves) -> tuple[float, float, float, float] | None:
+    """
+    :param leaves:  Objects and ObjectColumns; Objects without a bounding box are skipped
+    :return: the bounding box of all leaves as (xmin, xmax, ymin, ymax), or None if none of them has one.
+    """
+    _, boxes = _leaf_boxes(leaves)
+    if len(boxes) == 0:
+        return None
+    return (float(boxes[:, 0].min()), float(boxes[:, 1].max()),
+            float(boxes[:, 2].min()), float(boxes[:, 3].max()))
+
+
+def _remap_references(objs: list, copy_of: dict[int, Object]):
+    """
+    Point the references of objs to other Objects (e.g. the obj1 and obj2 of Connections) to their replacements.
+    :param objs:    Objects to update; anything else is skipped
+    :param copy_of: Replacement of each referenced Object, by id() of the Object; others are left as they are
+    """
+    groups: dict[type, list[Object]] = {}
+    for obj in objs:
+        if isinstance(obj, Object):
+            groups.setdefault(type(obj), []).append(obj)
+
+    for cls, group in groups.items():
+        for name in _slot_names(cls):
+            values = [getattr(obj, name, None) for obj in group]
+            if any(isinstance(value, Object) for value in values):
+                values = [copy_of.get(id(value), value) if isinstance(value, Object) else value for value in values]
+                _deque(map(getattr(cls, name).__set__, group, values), maxlen=0)
+
+
+def _slot_names(cls: type) -> list[str]:
+    """:return: the names of all slots of an Object class, including those of its bases."""
+    return [name for klass in reversed(cls.__mro__) for name in klass.__dict__.get('__slots__', ())]
+
+
+def _slots(*bases, own: tuple = ()) -> tuple:
+    """
+    :param bases:   mixin classes whose _SLOTS are combined, in order
+    :param own:     attribute names added by the concrete class itself
+    :return: a __slots__ tuple holding every attribute of bases and own, without duplicates.
+    """
+    names = []
+    for base in bases:
+        names.extend(base._SLOTS)
+    names.extend(own)
+    return tuple(dict.fromkeys(names))
+
+
 class CustomObject:
     def __init__(self):
         super().__init__()
         self._id: int = -1
         self._obj_cache: list[Object | 'CustomObject'] = list()
+        self._is_built: bool = False
+        self._size: int = 0
 
     def __repr__(self):
         return self._to_str()
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith('_'):
+            # A parameter changed, so the cached Objects no longer match it.
+            super().__setattr__('_is_built', False)
+
     def __len__(self):
-        return len(self.build_objs())
+        self._get_objs()
+        return self._size
+
+    def invalidate(self):
+        """
+        Mark the cached Objects as out of date so that they are rebuilt the next time they are needed.
+        Assigning to a parameter already does this; only call this after changing a parameter in place
+        (e.g. editing the contents of an array or the attributes of a template Object).
+        """
+        self._is_built = False
+
+    def _get_objs(self):
+        """
+        :return: the cached Objects, calling build_objs() only if they are missing or out of date.
+        """
+        if not self._is_built:
+            self.build_objs()
+            self._size = sum(len(obj) if isinstance(obj, CustomObject) else 1 for obj in self._obj_cache)
+            self._is_built = True
+        return self._obj_cache
 
     def build_objs(self):
         """
@@ -60,8 +373,9 @@ class CustomObject:
             # Implementation / Object definition; each Object should be added to self._obj_cache\n
             return self._obj_cache\n
         """
-        self._obj_cache.clear()
-        return list()
+        # A new list is used (instead of clearing the old one) so that copies never share a cache.
+        self._obj_cache = list()
+        return self._obj_cache
 
     def _update_ids(self):
         if self._id == -1:
@@ -70,7 +384,7 @@ class CustomObject:
         cur_id = self._id
         for obj in self._obj_cache:
             obj._set_id(cur_id)
-            cur_id += 1
+            cur_id += len(obj) if isinstance(obj, CustomObject) else 1
 
     def _set_id(self, id: int):
         self._id = id
@@ -78,12 +392,34 @@ class CustomObject:
     def get_id(self):
         return self._id
 
-    def _to_str(self, enumeration: bool = False) -> str:
-        self.build_objs()
+    def bounds(self) -> tuple[float, float, float, float] | None:
+        """
+        :return: the axis-aligned bounding box of all Objects of this CustomObject as (xmin, xmax, ymin, ymax),
+            or None if none of them has one. Objects without a bounding box (e.g. Connections) are skipped.
+        """
+        return _combined_bounds(self._iter_leaves())
+
+    def _iter_leaves(self):
+        """Yield the Objects that this CustomObject is composed of, with their ids set, expanding nested CustomObjects."""
+        self._get_objs()
+        self._update_ids()
+
+        for obj in self._obj_cache:
+            if isinstance(obj, CustomObject):
+                yield from obj._iter_leaves()
+            else:
+                yield obj
+
+    def _iter_strs(self, enumeration: bool = False, precision: int | None = None):
+        """Yield the text of each Object that this CustomObject is composed of."""
+        self._get_objs()
         self._update_ids()
 
-        text = []
         for obj in self._obj_cache:
-            text.append(obj._to_str(enumeration=enumeration))
+            if isinstance(obj, CustomObject):
+                yield from obj._iter_strs(enumeration=enumeration, precision=precision)
+            else:
+                yield obj._to_str(enumeration=enumeration, precision=precision)
 
-        return '\n'.join(text)
+    def _to_str(self, enumeration: bool = False, precision: int | None = None) -> str:
+        return '\n'.join(self._iter_strs(enumeration=enumeration, precision=precision))
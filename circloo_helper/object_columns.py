@@ -0,0 +1,257 @@
+import inspect as _inspect
+from copy import copy as _copy
+from itertools import repeat as _repeat
+from operator import is_ as _is
+from types import SimpleNamespace as _SimpleNamespace
+
+import numpy as np
+
+from .object import CustomObject, Object, _format_number
+import circloo_helper.circloo_objects as _o
+
+# Object types that can be stored in columns.
+#   All of their attributes are numbers or bools, and their _fields() only branch on coords_by_center,
+#   so _fields() can be evaluated on whole columns at once.
+COLUMN_TYPES = (_o.SolidCircle, _o.SolidRectangle, _o.SolidTriangle, _o.Line, _o.Arc, _o.Curve,
+                _o.GrowingCircle, _o.GrowingRectangle,
+                _o.MoveableCircle, _o.MoveableRectangle, _o.MoveableTriangle,
+                _o.RotatableRectangle, _o.RotatableCircle, _o.SpringyRectangle,
+                _o.Portal, _o.Dummy, _o.ParticleRectangle,
+                _o.CircleGenerator, _o.RectangleGenerator, _o.TriangleGenerator)
+
+# Number of rows converted to text at a time; keeps memory flat for very large blocks.
+_CHUNK_SIZE = 100_000
+
+
+def _prototype(obj_type: type) -> Object:
+    """Create an instance of obj_type with every required constructor argument set to 0."""
+    required = [0 for param in _inspect.signature(obj_type).parameters.values()
+                if param.default is param.empty
+                and param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD)]
+    return obj_type(*required)
+
+
+def _attribute_names(obj: Object) -> list[str]:
+    """:return: names of all public number/bool attributes of obj."""
+    return [name for name in dir(obj)
+            if not name.startswith('_') and isinstance(getattr(obj, name), (bool, int, float))]
+
+
+def _integral_mask(values) -> np.ndarray | None:
+    """
+    :param values:  Values of a column, as given to ObjectColumns
+    :return: which values are Python ints, or None if values is not a sequence of Python objects or holds no ints.
+    NumPy stores ints mixed with floats as floats; the mask keeps them written as ints, as they are for single Objects.
+    """
+    if not isinstance(values, (list, tuple)) and not (isinstance(values, np.ndarray) and values.dtype == object):
+        return None
+    mask = np.fromiter(map(_is, map(type, values), _repeat(int)), dtype=bool, count=len(values))
+    return mask if mask.any() else None
+
+
+def _as_text(value, count: int, precision: int | None = None) -> np.ndarray:
+    """
+    Convert a column (or a single value shared by all rows) to an array of strings.
+    Floats are formatted the same way as _format_number() formats single values.
+    Columns of Python objects (see ObjectColumns._column()) are converted one value at a time, so each value keeps the
+    text of its own type.
+    """
+    if np.ndim(value) == 0:
+        return np.full(count, _format_number(value, precision))
+    value = np.asarray(value)
+    if value.dtype == object:
+        return np.array([_format_number(item, precision) for item in value.tolist()], dtype=str).reshape(len(value))
+    if count > 0 and (value == value[0]).all():
+        # Converting numbers to strings is the slowest step, so constant columns are only converted once.
+        return np.full(count, _format_number(value[0].item(), precision))
+    if precision is None or value.dtype.kind != 'f':
+        return value.astype(str)
+    text = np.char.mod(f'%.{precision}f', value)
+    if precision > 0:
+        text = np.char.rstrip(np.char.rstrip(text, '0'), '.')
+    return np.where(text == '-0', '0', text)
+
+
+class ObjectColumns(CustomObject):
+    def __init__(self, obj_type: type, columns=None, **kwargs):
+        """
+        Many Objects of a single type, stored as a NumPy record array with one row per Object.
+        Rows are converted to text all at once instead of one Object at a time, and no Python Object is created
+        for a row unless it is accessed, so this is much faster and lighter than adding each Object separately.
+        Also available as Level.add_many(obj_type, columns).
+        :param obj_type:    Object class of every row, e.g. SolidRectangle; see COLUMN_TYPES for supported classes
+        :param columns:     Mapping (or NumPy record array) of attribute names to values, e.g. {'x': xs, 'y': ys}.
+                                Names are the Object's attribute names (x, width, ...), not its parameter names (x_pos, ...)
+                                A single value is shared by every row. Missing attributes use obj_type's defaults.
+        :param kwargs:      Additional columns, as with columns
+        """
+        super().__init__()
+
+        if obj_type not in COLUMN_TYPES:
+            raise TypeError(f"{obj_type.__name__} cannot be stored in ObjectColumns.")
+
+        given = {}
+        if columns is not None:
+            names = columns.dtype.names if isinstance(columns, np.ndarray) else columns.keys()
+            given.update({name: columns[name] for name in names})
+        given.update(kwargs)
+
+        self._obj_type = obj_type
+        self._prototype = _prototype(obj_type)
+        self._names = _attribute_names(self._prototype)
+
+        unknown = set(given) - set(self._names)
+        if unknown:
+            raise AttributeError(f"{obj_type.__name__} has no attribute(s) {', '.join(sorted(unknown))}")
+
+        integral = {name: _integral_mask(values) for name, values in given.items()}
+        given = {name: np.asarray(values) for name, values in given.items()}
+        count = max((len(values) for values in given.values() if values.ndim > 0), default=0)
+
+        dtype = []
+        for name in self._names:
+            default = getattr(self._prototype, name)
+            if isinstance(default, bool):
+                dtype.append((name, np.bool_))
+            elif name in given and given[name].dtype.kind in 'iub' and isinstance(default, int):
+                dtype.append((name, np.int64))
+            elif name not in given and isinstance(default, int):
+                dtype.append((name, np.int64))
+            else:
+                dtype.append((name, np.float64))
+
+        rows = np.recarray(count, dtype=dtype)
+        for name in self._names:
+            rows[name] = given.get(name, getattr(self._prototype, name))
+        self._rows = rows
+        # Rows of float columns that were given as Python ints, by attribute name; see _column().
+        self._integral = {name: mask for name, mask in integral.items()
+                          if mask is not None and rows.dtype[name].kind == 'f'}
+
+    @property
+    def obj_type(self) -> type:
+        return self._obj_type
+
+    @property
+    def rows(self) -> np.recarray:
+        """The underlying record array, with one field per attribute. Editing it changes the Objects in place."""
+        return self._rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index: int) -> Object:
+        """:return: a new Object built from the row at index. Changes to it are only kept after assigning it back."""
+        index = range(len(self._rows))[index]
+        obj = _copy(self._prototype)
+        for name in self._names:
+            setattr(obj, name, self._column(name, index).item())
+        if self._id != -1:
+            obj._set_id(self._id + index)
+        return obj
+
+    def __setitem__(self, index: int, obj: Object):
+        """Overwrite the row at index with the attributes of obj."""
+        if not isinstance(obj, self._obj_type):
+            raise TypeError(f"Expected {self._obj_type.__name__}, got {type(obj).__name__}.")
+        index = range(len(self._rows))[index]
+        for name in self._names:
+            value = getattr(obj, name)
+            self._rows[name][index] = value
+            if self._rows.dtype[name].kind == 'f' and (type(value) is int or name in self._integral):
+                mask = self._integral.setdefault(name, np.zeros(len(self._rows), dtype=bool))
+                mask[index] = type(value) is int
+
+    def _column(self, name: str, selection=slice(None)) -> np.ndarray:
+        """
+        :param selection:   Index, slice or mask of the rows to read
+        :return: the values of attribute name in the selected rows. Float columns that were given ints (see
+            _integral_mask()) are returned as Python objects, with the whole numbers among those ints as ints.
+        """
+        column = self._rows[name][selection]
+        integral = self._integral.get(name)
+        if integral is None:
+            return column
+        integral = integral[selection] & np.isfinite(column) & (column == np.trunc(column))
+        if not integral.any():
+            return column
+        mixed = np.asarray(column, dtype=object)
+        if mixed.ndim == 0:
+            return np.asarray(int(column), dtype=object)
+        mixed[integral] = column[integral].astype(np.int64).astype(object)
+        return mixed
+
+    def build_objs(self):
+        """Create a separate Object for every row. This is slow for large arrays; use only when Objects are needed."""
+        super().build_objs()
+        self._obj_cache.extend(self[i] for i in range(len(self._rows)))
+        return self._obj_cache
+
+    def bounds(self) -> tuple[float, float, float, float] | None:
+        """:return: the bounding box of all rows as (xmin, xmax, ymin, ymax), computed on whole columns at once."""
+        boxes = self._row_bounds()
+        if len(boxes) == 0:
+            return None
+        return (float(boxes[:, 0].min()), float(boxes[:, 1].max()),
+                float(boxes[:, 2].min()), float(boxes[:, 3].max()))
+
+    def _row_bounds(self) -> np.ndarray:
+        """:return: the bounding box of each row, as rows of (xmin, xmax, ymin, ymax); empty if rows have none."""
+        if len(self._rows) == 0 or self._obj_type._bounds_getter is None:
+            return np.empty((0, 4))
+        return np.stack([np.broadcast_to(column, len(self._rows)).astype(float)
+                         for column in self._obj_type._bounds_of(self._rows)], axis=1)
+
+    def _iter_leaves(self):
+        # Rows are formatted together, so the block is never split into separate Objects.
+        yield self
+
+    def _iter_strs(self, enumeration: bool = False, precision: int | None = None):
+        for start in range(0, len(self._rows), _CHUNK_SIZE):
+            stop = min(start + _CHUNK_SIZE, len(self._rows))
+            yield '\n'.join(self._format_rows(start, stop, enumeration, precision))
+
+    def _format_rows(self, start: int, stop: int, enumeration: bool, precision: int | None = None) -> np.ndarray:
+        """:return: an array with the text of each row from start to stop."""
+        columns = {name: self._column(name, slice(start, stop)) for name in self._names}
+
+        if 'coords_by_center' in self._names:
+            # _fields() branches on coords_by_center, so each value is formatted as its own group.
+            by_center = columns['coords_by_center']
+            text = np.empty(stop - start, dtype=object)
+            for value in (False, True):
+                mask = by_center == value
+                if mask.any():
+                    group = {name: column[mask] for name, column in columns.items()}
+                    text[mask] = self._format_group(group, precision, coords_by_center=value)
+        else:
+            text = self._format_group(columns, precision).astype(object)
+
+        if enumeration and self._id != -1:
+            ids = np.arange(self._id + start, self._id + stop).astype(str)
+            text = text + np.char.add('\n< ', ids).astype(object)
+
+        return text
+
+    def _format_group(self, columns: dict, precision: int | None = None, **constants) -> np.ndarray:
+        """Evaluate _fields() and the modifier table on whole columns (see _column()) at once."""
+        count = len(next(iter(columns.values())))
+        view = _SimpleNamespace(**columns)
+        view.__dict__.update(constants)
+
+        text = None
+        for value in self._obj_type._fields(view):
+            column = _as_text(value, count, precision)
+            text = column if text is None else np.char.add(np.char.add(text, ' '), column)
+
+        for attribute, modifier, default in self._obj_type._modifier_table:
+            values = columns[attribute]
+            mask = values.astype(bool) if default is None else np.asarray(values != default, dtype=bool)
+            if not mask.any():
+                continue
+            prefix, placeholder, suffix = modifier.partition('{}')
+            if placeholder:
+                modifier = np.char.add(np.char.add(prefix, _as_text(values, count, precision)), suffix)
+            text = np.where(mask, np.char.add(np.char.add(text, '\n'), modifier), text)
+
+        return text
@@ -1,12 +1,21 @@
-from .object import Object as _Object
+import numpy as np
+
+from .object import Object as _Object, _format_number
 
 
 class _ObjectShape(_Object):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
 
 class Player(_ObjectShape):
+    __slots__ = ()
+    _SLOTS = ('x', 'y', 'size', 'speed', 'density', 'restitution', 'bullet')
+    _MODIFIERS = (('bullet', 'bullet', None),)
+    _BOUNDS_ATTRIBUTES = ('x', 'y', 'size')
+
     def __init__(self):
         super().__init__()
         self.x: int | float = -1
@@ -17,17 +26,23 @@ class Player(_ObjectShape):
         self.restitution: int | float = 0
         self.bullet: bool = True
 
-    def _update_modifiers(self):
-        super()._update_modifiers()
-        if self.bullet:
-            self._add_modifier("bullet")
+    @staticmethod
+    def _bounds_of(obj):
+        half_size = (obj.size * 64 + 1) / 2
+        return obj.x - half_size, obj.x + half_size, obj.y - half_size, obj.y + half_size
 
 
 class Other(_ObjectShape):
-    pass
+    __slots__ = ()
 
 
 class Circle(_ObjectShape):
+    __slots__ = ()
+    _SLOTS = ('x', 'y', 'radius', 'attractor', 'wheelsprite')
+    _MODIFIERS = (('attractor', 'attr {}', 0),
+                  ('wheelsprite', 'wheelsprite', None))
+    _BOUNDS_ATTRIBUTES = ('x', 'y', 'radius')
+
     def __init__(self):
         super().__init__()
         self.x: int | float = -1
@@ -36,15 +51,18 @@ class Circle(_ObjectShape):
         self.attractor: int | float = 0
         self.wheelsprite: bool = False
 
-    def _update_modifiers(self):
-        super()._update_modifiers()
-        if self.attractor != 0:
-            self._add_modifier(f"attr {self.attractor}")
-        if self.wheelsprite:
-            self._add_modifier("wheelsprite")
+    @staticmethod
+    def _bounds_of(obj):
+        # The actual radius of a circle is .5 greater than its written radius.
+        radius = obj.radius + 0.5
+        return obj.x - radius, obj.x + radius, obj.y - radius, obj.y + radius
 
 
 class Rectangle(_ObjectShape):
+    __slots__ = ()
+    _SLOTS = ('x', 'y', 'width', 'height', 'rotation', 'coords_by_center')
+    _BOUNDS_ATTRIBUTES = _SLOTS
+
     def __init__(self):
         super().__init__()
         self.x: int | float = -1
@@ -54,8 +72,26 @@ class Rectangle(_ObjectShape):
         self.rotation: int | float = 0
         self.coords_by_center: bool = False
 
+    @staticmethod
+    def _bounds_of(obj):
+        half_w = obj.width / 2
+        half_h = obj.height / 2
+        center_x = np.where(obj.coords_by_center, obj.x, obj.x + half_w)
+        center_y = np.where(obj.coords_by_center, obj.y, obj.y + half_h)
+        # Rectangles are rotated around their center.
+        radians = np.radians(obj.rotation)
+        cos = np.abs(np.cos(radians))
+        sin = np.abs(np.sin(radians))
+        extent_x = np.abs(half_w) * cos + np.abs(half_h) * sin
+        extent_y = np.abs(half_w) * sin + np.abs(half_h) * cos
+        return center_x - extent_x, center_x + extent_x, center_y - extent_y, center_y + extent_y
+
 
 class Triangle(_ObjectShape):
+    __slots__ = ()
+    _SLOTS = ('x1', 'y1', 'x2', 'y2', 'x3', 'y3')
+    _BOUNDS_ATTRIBUTES = _SLOTS
+
     def __init__(self):
         super().__init__()
         self.x1: int | float = -1
@@ -65,14 +101,26 @@ class Triangle(_ObjectShape):
         self.x3: int | float = -1
         self.y3: int | float = -1
 
+    @staticmethod
+    def _bounds_of(obj):
+        return (np.minimum(np.minimum(obj.x1, obj.x2), obj.x3), np.maximum(np.maximum(obj.x1, obj.x2), obj.x3),
+                np.minimum(np.minimum(obj.y1, obj.y2), obj.y3), np.maximum(np.maximum(obj.y1, obj.y2), obj.y3))
+
 
 class Line(_ObjectShape):
+    __slots__ = ()
+    _SLOTS = ('thickness',)
+
     def __init__(self):
         super().__init__()
         self.thickness: int | float = 3
 
 
 class Connection(_ObjectShape):
+    __slots__ = ()
+    _SLOTS = ('obj1', 'obj2')
+    _CONNECTS = True
+
     def __init__(self):
         super().__init__()
         self.obj1: _Object | None = None
@@ -80,7 +128,19 @@ class Connection(_ObjectShape):
 
 
 class Collectable(_ObjectShape):
+    __slots__ = ()
+    _SLOTS = ('x', 'y', 'appear_at_segment', 'part_of_segment', 'zoom', 'is_trigger', 'collect_from_object',
+              'start_disabled', 'disable_on_trigger', 'sound', '_is_mute')
+    _MODIFIERS = (('part_of_segment', 'iGrow {}', 0),
+                  ('zoom', 'zoomFactor {}', -1),
+                  ('is_trigger', 'trigger', None),
+                  ('start_disabled', 'off', None),
+                  ('disable_on_trigger', 'ott', None))
+    _BOUNDS_ATTRIBUTES = ('x', 'y')
+
     class Sound:
+        __slots__ = ('group', 'note', 'volume', 'pitch', 'play_if_no_function')
+
         def __init__(self, group='', note=0, volume=1, pitch=1, play_if_no_function=-1):
             """
             Sound that plays when collectable is activated.
@@ -111,28 +171,21 @@ class Collectable(_ObjectShape):
         self.sound: Collectable.Sound | None = None
         self._is_mute: bool = False
 
-    def _update_modifiers(self):
-        super()._update_modifiers()
-        if self.part_of_segment != 0:
-            self._add_modifier(f"iGrow {self.part_of_segment}")
-        if self.zoom != -1:
-            self._add_modifier(f"zoomFactor {self.zoom}")
-        if self.is_trigger:
-            self._add_modifier("trigger")
-        if self.start_disabled:
-            self._add_modifier("off")
-        if self.disable_on_trigger:
-            self._add_modifier("ott")
+    @staticmethod
+    def _bounds_of(obj):
+        return obj.x - 25, obj.x + 25, obj.y - 25, obj.y + 25
 
+    def _modifier_text(self, precision=None):
+        text = super()._modifier_text(precision)
+        # The sound modifier depends on several attributes, so it cannot be described by _MODIFIERS.
         if self._is_mute:
-            self._add_modifier("sfx 'none'")
+            text += "\nsfx 'none'"
         elif self.sound is not None:
-            sound_txt = f"sfx '{self.sound.group}{self.sound.note}'"
+            text += f"\nsfx '{self.sound.group}{self.sound.note}'"
             if self.sound.volume != 1 or self.sound.pitch != 1 or self.sound.play_if_no_function != -1:
-                sound_txt += f" {self.sound.volume} {self.sound.pitch} {self.sound.play_if_no_function}"
-            self._add_modifier(sound_txt)
-
-
+                text += (f" {_format_number(self.sound.volume, precision)}"
+                         f" {_format_number(self.sound.pitch, precision)} {self.sound.play_if_no_function}")
+        return text
 
     def set_sound(self, group='', note=0, volume=1, pitch=1, play_if_no_function=False, sound: Sound = None):
         if sound is not None:
@@ -2,15 +2,22 @@ from .object import Object as _Object
 
 
 class _ObjectType(_Object):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
 
 class Solid(_ObjectType):
-    pass
+    __slots__ = ()
 
 
 class Moveable(_ObjectType):
+    __slots__ = ()
+    _SLOTS = ('density', 'damping', 'fix_rotation', 'bullet')
+    _MODIFIERS = (('fix_rotation', 'fixrot', None),
+                  ('bullet', 'bullet', None))
+
     def __init__(self):
         super().__init__()
         self.density: int | float = 1
@@ -18,15 +25,13 @@ class Moveable(_ObjectType):
         self.fix_rotation: bool = False
         self.bullet: bool = False
 
-    def _update_modifiers(self):
-        super()._update_modifiers()
-        if self.fix_rotation:
-            self._add_modifier("fixrot")
-        if self.bullet:
-            self._add_modifier("bullet")
-
 
 class Generator(_ObjectType):
+    __slots__ = ()
+    _SLOTS = ('disappear_after', 'wait_between', 'init_delay', 'no_fade', 'start_off')
+    _MODIFIERS = (('no_fade', 'noanim', None),
+                  ('start_off', 'off', None))
+
     def __init__(self):
         super().__init__()
         self.disappear_after: int | float = 5
@@ -35,26 +40,21 @@ class Generator(_ObjectType):
         self.no_fade: bool = False
         self.start_off: bool = False
 
-    def _update_modifiers(self):
-        super()._update_modifiers()
-        if self.no_fade:
-            self._add_modifier("noanim")
-        if self.start_off:
-            self._add_modifier("off")
-
 
 class Growing(_ObjectType):
+    __slots__ = ()
+    _SLOTS = ('keep_pos',)
+    _MODIFIERS = (('keep_pos', 'samePosition', None),)
+
     def __init__(self):
         super().__init__()
         self.keep_pos: bool = False
 
-    def _update_modifiers(self):
-        super()._update_modifiers()
-        if self.keep_pos:
-            self._add_modifier("samePosition")
-
 
 class Rotatable(_ObjectType):
+    __slots__ = ()
+    _SLOTS = ('motor_speed', 'torque')
+
     def __init__(self):
         super().__init__()
         self.motor_speed: int | float = 0
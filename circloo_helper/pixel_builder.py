@@ -1,8 +1,9 @@
 import numpy as np
-import numba
 
-from .object import CustomObject, Object
-from .tools import translate, dimensions
+from .decomposition import DECOMPOSERS, greedy_boxes, tiled, _row_runs
+from .object import CustomObject, Object, _gc_paused
+from .object_columns import COLUMN_TYPES, ObjectColumns, _attribute_names
+from .tools import dimensions, _copies_of, _translated_columns
 from .object_shapes import Rectangle
 from .object_types import Generator
 
@@ -10,28 +11,54 @@ from .object_types import Generator
 class Pixels(CustomObject):
     def __init__(self,
                  arr: np.array,
-                 obj: Object,
+                 obj: Object | dict[int, Object],
                  scale_x: float | int | None = None,
                  scale_y: float | int | None = None,
-                 reduce_objects: bool = True):
+                 reduce_objects: bool = True,
+                 decomposer: str = 'greedy',
+                 as_columns: bool = False,
+                 workers: int | None = None):
         """
-        Tiles an input Object according to an input 2D or 3D binary array.
+        Tiles an input Object according to an input 2D or 3D binary array, or several Objects according to an array of
+            labels.
         :param arr:         2D or 3D binary array. Object is created in each cell with a 1, 0's are ignored.
                                 If 3D, third dimension is time (only usable for Generator type objects)
+                                If obj is a palette, an array of integer labels instead.
         :param obj:         Object to be tiled. Pixel array starts at obj coordinates.
-        :param scale_x:     Distance between each object (x). If None, value is the width of obj. Default is None.
-        :param scale_y:     Distance between each object (y). If None, value is the height of obj. Default is None.
+                                May also be a palette {label: Object}, e.g. {1: solid_rectangle, 2: growing_rectangle}:
+                                each label's Object is tiled in the cells with that label (starting at that Object's
+                                coordinates), and each label is reduced separately. Labels missing from the palette
+                                (such as 0) are left empty.
+        :param scale_x:     Distance between each object (x). If None, value is the width of obj (the first Object of a
+                                palette). Default is None.
+        :param scale_y:     Distance between each object (y). If None, value is the height of obj (the first Object of a
+                                palette). Default is None.
         :param reduce_objects:   If True, multiple object reduction steps will be taken. I highly discourage setting
-                                    this to False. For Rectangle objects, greedy rectangle decomposition will be
-                                    performed. For 3D arrays, Generators that are on for multiple frames will be merged
-                                    into a single Generator that stays on during all frames.
+                                    this to False. For Rectangle objects, rectangle decomposition will be performed
+                                    (see decomposer). For 3D arrays, Generators that are on for multiple frames will be
+                                    merged into a single Generator that stays on during all frames.
+        :param decomposer:  Rectangle decomposition used for 2D arrays of Rectangle objects when reduce_objects is True:
+                                'greedy', 'runs' (linear time, for large arrays), 'maximal' (largest rectangle at
+                                each corner, never more Objects than 'greedy') or 'optimal' (minimum number of Objects,
+                                slowest). See rectangle_counts(). Default is 'greedy'.
+        :param as_columns:  If True, and obj's type can be stored in ObjectColumns, the copies are stored as a single
+                                ObjectColumns instead of separate Objects, which is much faster and lighter for large
+                                arrays. Default is False.
+        :param workers:     If greater than 1, rectangle decomposition is split into this many bands of rows that are
+                                decomposed in parallel threads, and rectangles that line up across the seams between
+                                bands are fused (see decomposition.tiled()). Seams may add a few Rectangles, except with
+                                the 'runs' decomposer. Useful for very large arrays; arrays of fewer than about 4
+                                million cells are decomposed serially. Default is None.
         """
         super().__init__()
 
         self.arr = np.asarray(arr)
-        self.obj: Object = obj
+        self.obj: Object | dict[int, Object] = obj
 
         self.reduce_rectangles = reduce_objects
+        self.decomposer = decomposer
+        self.as_columns = as_columns
+        self.workers = workers
 
         if scale_x is not None:
             self.scale_x = scale_x
@@ -49,8 +76,17 @@ class Pixels(CustomObject):
             self.scale_y = None
             self._is_manually_scaled_y = False
 
+    def _layers(self) -> list[tuple[np.ndarray, Object]]:
+        """:return: the (array, Object) to tile for each label; a single Object is tiled according to arr itself."""
+        if not isinstance(self.obj, dict):
+            return [(self.arr, self.obj)]
+        if not self.obj:
+            raise ValueError("The palette must contain at least one Object")
+        return [(self.arr == label, obj) for label, obj in self.obj.items()]
+
     def _update_scale(self):
-        scale_x, scale_y = dimensions(self.obj)
+        template = next(iter(self.obj.values())) if isinstance(self.obj, dict) else self.obj
+        scale_x, scale_y = dimensions(template)
 
         if not self._is_manually_scaled_x:
             self.scale_x = scale_x
@@ -62,189 +98,86 @@ class Pixels(CustomObject):
         self._update_scale()
 
         if len(self.arr.shape) == 2:
-            return self._build_2d()
+            build = self._build_2d
 
         elif len(self.arr.shape) == 3:
-            return self._build_3d()
+            build = self._build_3d
 
         else:
             raise ValueError("Pixel array must be either 2D or 3D")
 
-    def _build_2d(self):
-        if self.reduce_rectangles and isinstance(self.obj, Rectangle):
-            rects = self._rectangle_decomposer_2d(self.arr)
-            for rect in rects:
-                (x, y), (width, height) = rect
-
-                obj = translate(self.obj, x * self.scale_x, y * self.scale_y)
-                obj.width *= width
-                obj.height *= height
+        with _gc_paused():
+            for arr, obj in self._layers():
+                build(arr, obj)
+        return self._obj_cache
 
-                self._obj_cache.append(obj)
+    @staticmethod
+    def _decompose(decomposer: str, arr: np.ndarray, workers: int | None = None) -> np.ndarray:
+        if decomposer not in DECOMPOSERS:
+            raise ValueError(f"Unknown decomposer {decomposer!r}; must be one of {', '.join(map(repr, DECOMPOSERS))}")
+        if workers is not None and workers > 1:
+            return tiled(decomposer, arr, workers=workers)
+        return DECOMPOSERS[decomposer](arr)
+
+    def rectangle_counts(self) -> dict[str, int]:
+        """
+        Counts the Rectangles that each decomposer would build for the (2D) array, without building any Objects,
+            e.g. to choose between a faster build and fewer Objects in the level. Labels of a palette are added up.
+        :return: {decomposer: number of Rectangles}
+        """
+        return {decomposer: sum(len(self._decompose(decomposer, arr, self.workers)) for arr, _ in self._layers())
+                for decomposer in DECOMPOSERS}
 
+    def _tile(self, obj: Object, x: np.ndarray, y: np.ndarray, **columns):
+        """
+        Add a copy of obj at each cell (x, y), all at once.
+        :param columns: Attributes that differ between the copies, as {attribute: column}, set after translating
+        """
+        changed = _translated_columns(obj, x * self.scale_x, y * self.scale_y)
+        changed.update(columns)
+        if self.as_columns and type(obj) in COLUMN_TYPES:
+            values = {name: getattr(obj, name) for name in _attribute_names(obj)}
+            values.update(changed)
+            self._obj_cache.append(ObjectColumns(type(obj), values))
         else:
-            for i in range(len(self.arr)):
-                for j in range(len(self.arr[i])):
-                    if self.arr[i][j] == 1:
-                        x = j * self.scale_x
-                        y = i * self.scale_y
-                        self._obj_cache.append(translate(self.obj, x, y))
+            self._obj_cache.extend(_copies_of(obj, len(x), changed))
 
-        return self._obj_cache
+    def _build_2d(self, arr: np.ndarray, obj: Object):
+        if self.reduce_rectangles and isinstance(obj, Rectangle):
+            x, y, width, height = self._decompose(self.decomposer, arr, self.workers).T
+            self._tile(obj, x, y, width=obj.width * width, height=obj.height * height)
+
+        else:
+            y, x = np.nonzero(arr == 1)
+            self._tile(obj, x, y)
 
-    def _build_3d(self):
+    def _build_3d(self, arr: np.ndarray, obj: Object):
 
-        if not isinstance(self.obj, Generator):
+        if not isinstance(obj, Generator):
             raise TypeError("Can only build a 3D pixel array with circloO Generator objects")
 
         if self.reduce_rectangles:
 
-            if isinstance(self.obj, Rectangle):
-                rects = self._rectangle_decomposer_3d(self.arr)
-                for rect in rects:
-                    (x, y, f), (width, height, duration) = rect
-
-                    obj = translate(self.obj, x * self.scale_x, y * self.scale_y)
-                    obj.width *= width
-                    obj.height *= height
-                    obj.init_delay += f * obj.disappear_after
-                    obj.disappear_after *= duration
-                    obj.wait_between = 9999
-
-                    self._obj_cache.append(obj)
+            if isinstance(obj, Rectangle):
+                if self.workers is not None and self.workers > 1:
+                    boxes = tiled(greedy_boxes, arr, workers=self.workers)
+                else:
+                    boxes = greedy_boxes(arr)
+                x, y, f, width, height, duration = boxes.T
+                self._tile(obj, x, y, width=obj.width * width, height=obj.height * height,
+                           init_delay=obj.init_delay + f * obj.disappear_after,
+                           disappear_after=obj.disappear_after * duration, wait_between=9999)
 
             else:
-                # Reduce depth/duration only.
-                #       This is the same algorithm as _rectangle_decomposer_3d, but only applied depth-wise.
-                arr = self.arr.copy()
+                # Reduce depth/duration only: each run of frames of a cell becomes one Generator.
                 a, b, c = arr.shape
-                for j in range(b):
-                    for k in range(c):
-                        for i in range(a):
-
-                            cur = arr[i, j, k]
-
-                            if cur == 0:
-                                continue
-
-                            depth = 1
-                            while i + depth < a and arr[i + depth, j, k] > 0:
-                                depth += 1
-
-                            obj = translate(self.obj, k * self.scale_x, j * self.scale_y)
-                            obj.init_delay += i * obj.disappear_after
-                            obj.disappear_after *= depth
-                            obj.wait_between = 9999
-
-                            self._obj_cache.append(obj)
-
-                            arr[i: i + depth, j, k] = 0
+                cells, f, stop = _row_runs(np.moveaxis(arr != 0, 0, -1).reshape(b * c, a))
+                y, x = np.divmod(cells, c)
+                self._tile(obj, x, y, init_delay=obj.init_delay + f * obj.disappear_after,
+                           disappear_after=obj.disappear_after * (stop - f), wait_between=9999)
 
         else:
             # No reductions.
-            a, b, c = self.arr.shape
-            for j in range(b):
-                for k in range(c):
-                    for i in range(a):
-                        if self.arr[i][j][k] == 1:
-                            obj = translate(self.obj, k * self.scale_x, j * self.scale_y)
-                            obj.init_delay += i * obj.disappear_after
-                            obj.wait_between = 9999
-
-                            self._obj_cache.append(obj)
-
-        return self._obj_cache
+            y, x, f = np.nonzero(np.moveaxis(arr == 1, 0, -1))
+            self._tile(obj, x, y, init_delay=obj.init_delay + f * obj.disappear_after, wait_between=9999)
 
-    @staticmethod
-    @numba.njit
-    def _rectangle_decomposer_2d(arr: np.array):
-        """
-        Decomposes a 2D numpy binary array into the minimum number of spanning rectangles
-            using a width->height greedy algorithm
-        :return: Generator that yields each rectangle as ((x, y), (width, height))
-        """
-        arr = arr.copy()
-        b, c = arr.shape
-        # b -> height of frame
-        # c -> width of frame
-
-        for j in range(b):
-            for k in range(c):
-                cur = arr[j, k]
-
-                if cur == 0:
-                    continue
-
-                # Find width.
-                width = 1
-                while k + width < c:
-                    if np.all(arr[j, k + width]):
-                        width += 1
-                    else:
-                        break
-
-                # Find height.
-                height = 1
-                while j + height < b:
-                    if np.all(arr[j + height, k:k + width]):
-                        height += 1
-                    else:
-                        break
-
-                yield (k, j), (width, height)
-
-                # Clear the determined region so that it is not processed again.
-                arr[j: j + height, k: k + width] = 0
-
-    @staticmethod
-    @numba.njit
-    def _rectangle_decomposer_3d(arr: np.array):
-        """
-        Decomposes a 3D numpy binary array into the minimum number of spanning rectangles
-            using a depth->width->height greedy algorithm
-        :return: Generator that yields each rectangle as ((x, y, z), (width, height, depth))
-        """
-        arr = arr.copy()
-        a, b, c = arr.shape
-        # a -> number of frames
-        # b -> height of frame
-        # c -> width of frame
-
-        for j in range(b):
-            for k in range(c):
-                for i in range(a):
-
-                    cur = arr[i, j, k]
-
-                    if cur == 0:
-                        continue
-
-                    # Find depth.
-                    depth = 1
-                    while i + depth < a and arr[i + depth, j, k] > 0:
-                        depth += 1
-
-                    # Find width.
-                    width = 1
-                    while k + width < c:
-                        if np.all(arr[i:i + depth, j, k + width]):
-                            width += 1
-                        else:
-                            break
-
-                    # Find height.
-                    height = 1
-                    while j + height < b:
-                        if np.all(arr[i:i + depth,
-                                      j + height,
-                                      k:k + width]):
-                            height += 1
-                        else:
-                            break
-
-                    yield (k, j, i), (width, height, depth)
-
-                    # Clear the determined region so that it is not processed again.
-                    arr[i: i + depth,
-                        j: j + height,
-                        k: k + width] = 0
@@ -0,0 +1,206 @@
+import math
+
+import numpy as np
+
+from .object import CustomObject, _leaf_boxes
+
+# Objects whose box covers more grid cells than this are not put in cells; they are checked by every query instead.
+_MAX_CELLS = 64
+
+
+def _cell_keys(cell_x: np.ndarray, cell_y: np.ndarray) -> np.ndarray:
+    """:return: a single int64 key for each grid cell (cell_x, cell_y)."""
+    return (cell_x.astype(np.int64) << 32) + cell_y.astype(np.int64)
+
+
+def _box_distances(boxes: np.ndarray, x, y) -> np.ndarray:
+    """:return: the distance from (x, y) to each box; 0 for boxes that contain the point."""
+    dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 1]), 0)
+    dy = np.maximum(np.maximum(boxes[:, 2] - y, y - boxes[:, 3]), 0)
+    return np.hypot(dx, dy)
+
+
+class SpatialIndex:
+    def __init__(self, objs=(), cell_size: float | None = None):
+        """
+        Uniform grid over the bounding boxes of Objects, to find the Objects in a region or near a point without
+        checking every Object. Usually created with Level.index(), which keeps it up to date as Objects are added.
+        The index holds the boxes the Objects had when they were added; call Level.index(rebuild=True) after moving them.
+        Queries return Objects (and ObjectColumns, whose rows are indexed separately) in the order they were added.
+        :param objs:        Objects, CustomObjects and ObjectColumns to index. Objects without a bounding box
+                                (e.g. Connections) are skipped, and CustomObjects are indexed by their Objects.
+        :param cell_size:   Width and height of the grid cells. If None, it is chosen from the sizes of the boxes
+                                of objs, so that each Object only covers a few cells.
+        """
+        self.cell_size = cell_size
+        self._owners = []
+        self._boxes = np.empty((0, 4))
+        self._count = 0
+        self._cells: dict[int, list[int]] = {}
+        self._large: list[int] = []
+        # Bounding box of all boxes, as (xmin, xmax, ymin, ymax).
+        self._extent = (math.inf, -math.inf, math.inf, -math.inf)
+
+        owners, boxes = _leaf_boxes(self._iter_leaves(objs))
+        if self.cell_size is None:
+            self.cell_size = self._default_cell_size(boxes)
+        self._insert(owners, boxes)
+
+    def __len__(self):
+        """:return: the number of indexed boxes."""
+        return self._count
+
+    @staticmethod
+    def _iter_leaves(objs):
+        for obj in objs:
+            if isinstance(obj, CustomObject):
+                yield from obj._iter_leaves()
+            else:
+                yield obj
+
+    @staticmethod
+    def _default_cell_size(boxes: np.ndarray) -> float:
+        if len(boxes) == 0:
+            return 100.0
+        sizes = np.maximum(boxes[:, 1] - boxes[:, 0], boxes[:, 3] - boxes[:, 2])
+        extent = max(boxes[:, 1].max() - boxes[:, 0].min(), boxes[:, 3].max() - boxes[:, 2].min())
+        # Cells about twice as large as a typical Object, but not so small that most cells are empty.
+        cell_size = max(2 * float(np.median(sizes)), float(extent) / math.sqrt(len(boxes)))
+        return cell_size if cell_size > 0 else 1.0
+
+    def add(self, obj):
+        """
+        Add an Object, CustomObject or ObjectColumns to the index; Level.add() calls this for the Level's index.
+        """
+        self._insert(*_leaf_boxes(self._iter_leaves([obj])))
+
+    def _insert(self, owners: list, boxes: np.ndarray):
+        start = self._count
+        count = len(boxes)
+        if count == 0:
+            return
+        if start + count > len(self._boxes):
+            grown = np.empty((max(2 * len(self._boxes), start + count), 4))
+            grown[:start] = self._boxes[:start]
+            self._boxes = grown
+        self._boxes[start:start + count] = boxes
+        self._owners.extend(owners)
+        self._count += count
+        xmin, xmax, ymin, ymax = self._extent
+        self._extent = (min(xmin, float(boxes[:, 0].min())), max(xmax, float(boxes[:, 1].max())),
+                        min(ymin, float(boxes[:, 2].min())), max(ymax, float(boxes[:, 3].max())))
+
+        first_x, last_x, first_y, last_y = self._cell_ranges(boxes)
+        widths = last_x - first_x + 1
+        spans = widths * (last_y - first_y + 1)
+        entries = np.arange(start, start + count)
+
+        is_large = spans > _MAX_CELLS
+        self._large.extend(entries[is_large].tolist())
+
+        # One (cell, entry) pair per cell covered by each box.
+        small = ~is_large
+        entries, first_x, first_y, widths, spans = (array[small] for array in (entries, first_x, first_y, widths, spans))
+        pair_entries = np.repeat(np.arange(len(entries)), spans)
+        offsets = np.arange(len(pair_entries)) - np.repeat(np.cumsum(spans) - spans, spans)
+        keys = _cell_keys(first_x[pair_entries] + offsets % widths[pair_entries],
+                          first_y[pair_entries] + offsets // widths[pair_entries])
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        pair_entries = entries[pair_entries[order]].tolist()
+
+        unique_keys, starts = np.unique(keys, return_index=True)
+        stops = np.append(starts[1:], len(keys)).tolist()
+        for key, first, stop in zip(unique_keys.tolist(), starts.tolist(), stops):
+            cell = self._cells.get(key)
+            if cell is None:
+                self._cells[key] = pair_entries[first:stop]
+            else:
+                cell.extend(pair_entries[first:stop])
+
+    def _cell_ranges(self, boxes: np.ndarray):
+        """:return: the first and last cell along x and y covered by each box."""
+        cells = np.floor(boxes / self.cell_size).astype(np.int64)
+        return cells[:, 0], cells[:, 1], cells[:, 2], cells[:, 3]
+
+    def _candidates(self, xmin, xmax, ymin, ymax) -> np.ndarray:
+        """:return: the sorted entries whose cells overlap the given box, which includes every box overlapping it."""
+        # Only the part of the box that overlaps the indexed boxes needs to be looked up.
+        extent_xmin, extent_xmax, extent_ymin, extent_ymax = self._extent
+        xmin, xmax = max(xmin, extent_xmin), min(xmax, extent_xmax)
+        ymin, ymax = max(ymin, extent_ymin), min(ymax, extent_ymax)
+        if xmin > xmax or ymin > ymax:
+            return np.empty(0, dtype=np.int64)
+        first_x, last_x = math.floor(xmin / self.cell_size), math.floor(xmax / self.cell_size)
+        first_y, last_y = math.floor(ymin / self.cell_size), math.floor(ymax / self.cell_size)
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(self._cells):
+            # Looking up every cell would take longer than checking every box.
+            return np.arange(self._count)
+
+        found = [self._large]
+        cells = self._cells
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                cell = cells.get((cell_x << 32) + cell_y)
+                if cell is not None:
+                    found.append(cell)
+        return np.unique(np.fromiter((entry for cell in found for entry in cell), dtype=np.int64))
+
+    def _owners_of(self, entries) -> list:
+        """:return: the Objects of entries, without duplicates, in the order of entries."""
+        return list(dict.fromkeys(self._owners[entry] for entry in entries.tolist()))
+
+    def query_rect(self, xmin, xmax, ymin, ymax, inside: bool = False) -> list:
+        """
+        :param xmin:    Left edge of the region; xmax, ymin and ymax are its other edges
+        :param inside:  If True, only return Objects whose bounding boxes lie completely within the region
+        :return: the Objects whose bounding boxes overlap the region (edges included).
+        """
+        entries = self._candidates(xmin, xmax, ymin, ymax)
+        boxes = self._boxes[entries]
+        if inside:
+            hit = (boxes[:, 0] >= xmin) & (boxes[:, 1] <= xmax) & (boxes[:, 2] >= ymin) & (boxes[:, 3] <= ymax)
+        else:
+            hit = (boxes[:, 0] <= xmax) & (boxes[:, 1] >= xmin) & (boxes[:, 2] <= ymax) & (boxes[:, 3] >= ymin)
+        return self._owners_of(entries[hit])
+
+    def query_point(self, x, y) -> list:
+        """:return: the Objects whose bounding boxes contain the point (x, y), edges included."""
+        return self.query_rect(x, x, y, y)
+
+    def nearest(self, x, y, count: int | None = 1, max_distance: float | None = None) -> list:
+        """
+        Find the Objects closest to a point, measured to the edges of their bounding boxes (0 if a box contains it).
+        E.g. nearest(x, y, count=None, max_distance=50) returns every Object within 50 units of (x, y).
+        :param x:               X coordinate of the point
+        :param y:               Y coordinate of the point
+        :param count:           Maximum number of Objects to return; if None, every Object within max_distance
+        :param max_distance:    Only return Objects at most this far from the point; if None, there is no limit
+        :return: the Objects, closest first; Objects at the same distance are in the order they were added.
+        """
+        if count is None and max_distance is None:
+            raise ValueError("Either count or max_distance must be given.")
+        if self._count == 0 or count == 0:
+            return []
+
+        xmin, xmax, ymin, ymax = self._extent
+        radius = self.cell_size
+        while True:
+            if max_distance is not None and radius >= max_distance:
+                radius = limit = max_distance
+                last = True
+            elif x - radius <= xmin and x + radius >= xmax and y - radius <= ymin and y + radius >= ymax:
+                # The search covers every box, so there is nothing left to find.
+                limit = math.inf
+                last = True
+            else:
+                limit = radius
+                last = False
+            entries = self._candidates(x - radius, x + radius, y - radius, y + radius)
+            distances = _box_distances(self._boxes[entries], x, y)
+            # Every box within the radius is among the candidates, so these are certain to be the closest ones.
+            within = distances <= limit
+            owners = self._owners_of(entries[within][np.argsort(distances[within], kind='stable')])
+            if last or (count is not None and len(owners) >= count):
+                return owners if count is None else owners[:count]
+            radius *= 2
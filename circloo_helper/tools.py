@@ -1,58 +1,21 @@
 import math
 import subprocess
+from collections import deque as _deque
 from copy import copy
+from functools import partial as _partial, singledispatch as _singledispatch
+from itertools import repeat as _repeat
+from operator import attrgetter as _attrgetter
 
-from .object import Object
+import numpy as np
+
+from .level import Level
+from .object import CustomObject, Object, _gc_paused, _slot_names
+from .object_columns import ObjectColumns
 import circloo_helper.object_shapes as _os
 from .circloo_objects import Line, Arc, Curve, Dummy, Portal
 
-__all__ = ["polar", "pivot", "translate", "scale", "dimensions", "centroid", "push_to_android", "combine"]
-
-
-def _get_curve_bbox(obj: Curve):
-    """Returns bounding box as (xmin, xmax, ymin, ymax)"""
-    from svgpathtools import CubicBezier
-    p0 = complex(obj.start_x, obj.start_y)
-    p1 = complex(obj.ctr1_x, obj.ctr1_y)
-    p2 = complex(obj.ctr2_x, obj.ctr2_y)
-    p3 = complex(obj.end_x, obj.end_y)
-    return CubicBezier(p0, p1, p2, p3).bbox()
-
-
-def _get_arc_bbox(obj: Arc):
-    """Returns bounding box as (xmin, xmax, ymin, ymax)"""
-
-    start = math.radians(obj.start_angle)
-    end = math.radians(obj.end_angle)
-    tau = math.tau
-
-    # Normalize so end >= start
-    while end < start:
-        end += tau
-
-    # Candidate angles (endpoints & cardinal directions)
-    candidate_angles = [start, end]
-
-    for angle in (0, tau / 4, tau / 2, 3 * tau / 4):
-        a = angle
-        while a < start:
-            a += tau
-        if a <= end:
-            candidate_angles.append(a)
-
-    xs = []
-    ys = []
-
-    for a in candidate_angles:
-        xs.append(obj.center_x + obj.radius * math.cos(a))
-        ys.append(obj.center_y + obj.radius * math.sin(a))
-
-    return (
-        min(xs),
-        max(xs),
-        min(ys),
-        max(ys),
-    )
+__all__ = ["polar", "pivot", "translate", "scale", "register_shape", "translate_many", "pivot_many", "scale_many",
+           "dimensions", "centroid", "push_to_android", "combine"]
 
 
 def polar(r, theta, start_x=1500, start_y=1500, in_degrees=True):
@@ -74,6 +37,40 @@ def polar(r, theta, start_x=1500, start_y=1500, in_degrees=True):
     return x, y
 
 
+# SINGLE-OBJECT TOOLS ##################################################################################################
+# Each tool is a functools.singledispatch function with one handler per kind of Object, found from the Object's class
+#   (and cached per class) instead of trying every kind in turn. The handlers of pivot(), translate() and scale() are
+#   registered from the kinds of shapes in _KINDS (see SHAPE KINDS). Handlers for new Object classes are added with
+#   register_shape(cls, kind), or with @tool.register(cls); e.g. a handler of pivot() takes the same arguments as
+#   pivot() and returns a rotated copy.
+#   Handlers copy the Object with Object.__copy__(), which copies its slots directly, instead of copy(), whose lookups
+#   cost about as much as dispatching the call.
+
+def _rotation(theta, in_degrees: bool):
+    """:return: (cos, sin, degrees) of theta."""
+    if in_degrees:
+        theta = math.radians(theta)
+    return math.cos(theta), math.sin(theta), math.degrees(theta)
+
+
+def _pivot_point(x, y, cos, sin, pivot_x, pivot_y):
+    """Pivots a single x/y point pair."""
+    translated_x = x - pivot_x
+    translated_y = y - pivot_y
+
+    rotated_x = translated_x * cos - translated_y * sin
+    rotated_y = translated_x * sin + translated_y * cos
+
+    return rotated_x + pivot_x, rotated_y + pivot_y
+
+
+def _scale_factors(by_x, by_y):
+    if by_x == 0 or by_y == 0:
+        raise ValueError("Cannot scale an object by 0.")
+    return by_x, by_x if by_y is None else by_y
+
+
+@_singledispatch
 def pivot(obj: Object, theta, pivot_x=1500, pivot_y=1500, in_degrees=True):
     """
     Rotate an Object around a pivot.
@@ -83,111 +80,80 @@ def pivot(obj: Object, theta, pivot_x=1500, pivot_y=1500, in_degrees=True):
     :param pivot_y:     Y coordinate of pivot point.
     :param in_degrees:  If True, assumes given angle theta is in degrees (instead of radians); default is True.
     """
-    def pivot_single(x, y):
-        """Pivots a single x/y point pair."""
-        translated_x = x - pivot_x
-        translated_y = y - pivot_y
+    # Object cannot be pivoted, a simple shallow copy will be returned.
+    return copy(obj)
 
-        rotated_x = translated_x * math.cos(theta) - translated_y * math.sin(theta)
-        rotated_y = translated_x * math.sin(theta) + translated_y * math.cos(theta)
 
-        new_x = rotated_x + pivot_x
-        new_y = rotated_y + pivot_y
+def _pivot_position(obj, theta, pivot_x=1500, pivot_y=1500, in_degrees=True):
+    cos, sin, _ = _rotation(theta, in_degrees)
+    new_obj = obj.__copy__()
+    new_obj.x, new_obj.y = _pivot_point(obj.x, obj.y, cos, sin, pivot_x, pivot_y)
+    return new_obj
 
-        return new_x, new_y
 
-    new_obj = copy(obj)
+def _pivot_rectangle(obj, theta, pivot_x=1500, pivot_y=1500, in_degrees=True):
+    cos, sin, degrees = _rotation(theta, in_degrees)
+    new_obj = obj.__copy__()
+    if obj.coords_by_center:
+        new_obj.x, new_obj.y = _pivot_point(obj.x, obj.y, cos, sin, pivot_x, pivot_y)
+    else:
+        half_w = obj.width / 2
+        half_h = obj.height / 2
 
-    if in_degrees:
-        theta = math.radians(theta)
+        new_x, new_y = _pivot_point(obj.x + half_w, obj.y + half_h, cos, sin, pivot_x, pivot_y)
 
-    if (isinstance(obj, _os.Circle)
-            or isinstance(obj, _os.Player)
-            or isinstance(obj, _os.Collectable)
-            or isinstance(obj, Dummy)):
-        new_x, new_y = pivot_single(obj.x, obj.y)
-        new_obj.x = new_x
-        new_obj.y = new_y
+        new_obj.x = new_x - half_w
+        new_obj.y = new_y - half_h
 
-    elif isinstance(obj, _os.Rectangle):
-        if obj.coords_by_center:
-            new_x, new_y = pivot_single(obj.x, obj.y)
+    new_obj.rotation = obj.rotation + degrees
+    return new_obj
 
-            new_obj.x = new_x
-            new_obj.y = new_y
-        else:
-            half_w = obj.width / 2
-            half_h = obj.height / 2
-
-            new_x, new_y = pivot_single(obj.x + half_w, obj.y + half_h)
-
-            new_obj.x = new_x - half_w
-            new_obj.y = new_y - half_h
-
-        new_rotation = obj.rotation + math.degrees(theta)
-        new_obj.rotation = new_rotation
-
-    elif isinstance(obj, _os.Triangle):
-        new_x1, new_y1 = pivot_single(obj.x1, obj.y1)
-        new_x2, new_y2 = pivot_single(obj.x2, obj.y2)
-        new_x3, new_y3 = pivot_single(obj.x3, obj.y3)
-
-        new_obj.x1 = new_x1
-        new_obj.y1 = new_y1
-        new_obj.x2 = new_x2
-        new_obj.y2 = new_y2
-        new_obj.x3 = new_x3
-        new_obj.y3 = new_y3
-
-    elif isinstance(obj, Line):
-        new_x1, new_y1 = pivot_single(obj.x1, obj.y1)
-        new_x2, new_y2 = pivot_single(obj.x2, obj.y2)
-
-        new_obj.x1 = new_x1
-        new_obj.y1 = new_y1
-        new_obj.x2 = new_x2
-        new_obj.y2 = new_y2
-
-    elif isinstance(obj, Arc):
-        new_x, new_y = pivot_single(obj.center_x, obj.center_y)
-        new_cx, new_cy = pivot_single(obj.ctr_x, obj.ctr_y)
-        new_start = obj.start_angle + math.degrees(theta)
-        new_end = obj.end_angle + math.degrees(theta)
-
-        new_obj.center_x = new_x
-        new_obj.center_y = new_y
-        new_obj.ctr_x = new_cx
-        new_obj.ctr_y = new_cy
-        new_obj.start_angle = new_start
-        new_obj.end_angle = new_end
-
-    elif isinstance(obj, Curve):
-        new_sx, new_sy = pivot_single(obj.start_x, obj.start_y)
-        new_c1x, new_c1y = pivot_single(obj.ctr1_x, obj.ctr1_y)
-        new_c2x, new_c2y = pivot_single(obj.ctr2_x, obj.ctr2_y)
-        new_ex, new_ey = pivot_single(obj.end_x, obj.end_y)
-
-        new_obj.start_x = new_sx
-        new_obj.start_y = new_sy
-        new_obj.ctr1_x = new_c1x
-        new_obj.ctr1_y = new_c1y
-        new_obj.ctr2_x = new_c2x
-        new_obj.ctr2_y = new_c2y
-        new_obj.end_x = new_ex
-        new_obj.end_y = new_ey
-
-    elif isinstance(obj, Portal):
-        new_x, new_y = pivot_single(obj.portal_x, obj.portal_y)
-        new_obj.portal_x = new_x
-        new_obj.portal_y = new_y
 
-    else:
-        # Object cannot be pivoted, a simple shallow copy will be returned.
-        pass
+def _pivot_triangle(obj, theta, pivot_x=1500, pivot_y=1500, in_degrees=True):
+    cos, sin, _ = _rotation(theta, in_degrees)
+    new_obj = obj.__copy__()
+    new_obj.x1, new_obj.y1 = _pivot_point(obj.x1, obj.y1, cos, sin, pivot_x, pivot_y)
+    new_obj.x2, new_obj.y2 = _pivot_point(obj.x2, obj.y2, cos, sin, pivot_x, pivot_y)
+    new_obj.x3, new_obj.y3 = _pivot_point(obj.x3, obj.y3, cos, sin, pivot_x, pivot_y)
+    return new_obj
+
+
+def _pivot_line(obj, theta, pivot_x=1500, pivot_y=1500, in_degrees=True):
+    cos, sin, _ = _rotation(theta, in_degrees)
+    new_obj = obj.__copy__()
+    new_obj.x1, new_obj.y1 = _pivot_point(obj.x1, obj.y1, cos, sin, pivot_x, pivot_y)
+    new_obj.x2, new_obj.y2 = _pivot_point(obj.x2, obj.y2, cos, sin, pivot_x, pivot_y)
+    return new_obj
+
 
+def _pivot_arc(obj, theta, pivot_x=1500, pivot_y=1500, in_degrees=True):
+    cos, sin, degrees = _rotation(theta, in_degrees)
+    new_obj = obj.__copy__()
+    new_obj.center_x, new_obj.center_y = _pivot_point(obj.center_x, obj.center_y, cos, sin, pivot_x, pivot_y)
+    new_obj.ctr_x, new_obj.ctr_y = _pivot_point(obj.ctr_x, obj.ctr_y, cos, sin, pivot_x, pivot_y)
+    new_obj.start_angle = obj.start_angle + degrees
+    new_obj.end_angle = obj.end_angle + degrees
     return new_obj
 
 
+def _pivot_curve(obj, theta, pivot_x=1500, pivot_y=1500, in_degrees=True):
+    cos, sin, _ = _rotation(theta, in_degrees)
+    new_obj = obj.__copy__()
+    new_obj.start_x, new_obj.start_y = _pivot_point(obj.start_x, obj.start_y, cos, sin, pivot_x, pivot_y)
+    new_obj.ctr1_x, new_obj.ctr1_y = _pivot_point(obj.ctr1_x, obj.ctr1_y, cos, sin, pivot_x, pivot_y)
+    new_obj.ctr2_x, new_obj.ctr2_y = _pivot_point(obj.ctr2_x, obj.ctr2_y, cos, sin, pivot_x, pivot_y)
+    new_obj.end_x, new_obj.end_y = _pivot_point(obj.end_x, obj.end_y, cos, sin, pivot_x, pivot_y)
+    return new_obj
+
+
+def _pivot_portal(obj, theta, pivot_x=1500, pivot_y=1500, in_degrees=True):
+    cos, sin, _ = _rotation(theta, in_degrees)
+    new_obj = obj.__copy__()
+    new_obj.portal_x, new_obj.portal_y = _pivot_point(obj.portal_x, obj.portal_y, cos, sin, pivot_x, pivot_y)
+    return new_obj
+
+
+@_singledispatch
 def translate(obj: Object, by_x=0, by_y=0):
     """
     Translate an Object by x and y.
@@ -195,92 +161,81 @@ def translate(obj: Object, by_x=0, by_y=0):
     :param by_x:    Number of units to be translated along the x-axis
     :param by_y:    Number of units to be translated along the y-axis
     """
-    def translate_single(x, y):
-        """Translates a single x/y point pair."""
-        return x + by_x, y + by_y
-
-    new_obj = copy(obj)
-
-    if (isinstance(obj, _os.Circle)
-            or isinstance(obj, _os.Player)
-            or isinstance(obj, _os.Collectable)
-            or isinstance(obj, Dummy)):
-        new_x, new_y = translate_single(obj.x, obj.y)
-        new_obj.x = new_x
-        new_obj.y = new_y
-
-    elif isinstance(obj, _os.Rectangle):
-        if obj.coords_by_center:
-            new_x, new_y = translate_single(obj.x, obj.y)
-
-            new_obj.x = new_x
-            new_obj.y = new_y
-        else:
-            half_w = obj.width / 2
-            half_h = obj.height / 2
-
-            new_x, new_y = translate_single(obj.x + half_w, obj.y + half_h)
-
-            new_obj.x = new_x - half_w
-            new_obj.y = new_y - half_h
-
-    elif isinstance(obj, _os.Triangle):
-        new_x1, new_y1 = translate_single(obj.x1, obj.y1)
-        new_x2, new_y2 = translate_single(obj.x2, obj.y2)
-        new_x3, new_y3 = translate_single(obj.x3, obj.y3)
-
-        new_obj.x1 = new_x1
-        new_obj.y1 = new_y1
-        new_obj.x2 = new_x2
-        new_obj.y2 = new_y2
-        new_obj.x3 = new_x3
-        new_obj.y3 = new_y3
-
-    elif isinstance(obj, Line):
-        new_x1, new_y1 = translate_single(obj.x1, obj.y1)
-        new_x2, new_y2 = translate_single(obj.x2, obj.y2)
-
-        new_obj.x1 = new_x1
-        new_obj.y1 = new_y1
-        new_obj.x2 = new_x2
-        new_obj.y2 = new_y2
-
-    elif isinstance(obj, Arc):
-        new_x, new_y = translate_single(obj.center_x, obj.center_y)
-        # new_cx, new_cy = translate_single(obj.ctr_x, obj.ctr_y)
-
-        new_obj.center_x = new_x
-        new_obj.center_y = new_y
-        # new_obj.ctr_x = new_cx
-        # new_obj.ctr_y = new_cy
-
-    elif isinstance(obj, Curve):
-        new_sx, new_sy = translate_single(obj.start_x, obj.start_y)
-        new_c1x, new_c1y = translate_single(obj.ctr1_x, obj.ctr1_y)
-        new_c2x, new_c2y = translate_single(obj.ctr2_x, obj.ctr2_y)
-        new_ex, new_ey = translate_single(obj.end_x, obj.end_y)
-
-        new_obj.start_x = new_sx
-        new_obj.start_y = new_sy
-        new_obj.ctr1_x = new_c1x
-        new_obj.ctr1_y = new_c1y
-        new_obj.ctr2_x = new_c2x
-        new_obj.ctr2_y = new_c2y
-        new_obj.end_x = new_ex
-        new_obj.end_y = new_ey
-
-    elif isinstance(obj, Portal):
-        new_x, new_y = translate_single(obj.portal_x, obj.portal_y)
-        new_obj.portal_x = new_x
-        new_obj.portal_y = new_y
+    # Object cannot be translated, a simple shallow copy will be returned.
+    return copy(obj)
+
+
+def _translate_position(obj, by_x=0, by_y=0):
+    new_obj = obj.__copy__()
+    new_obj.x = obj.x + by_x
+    new_obj.y = obj.y + by_y
+    return new_obj
+
 
+def _translate_rectangle(obj, by_x=0, by_y=0):
+    new_obj = obj.__copy__()
+    if obj.coords_by_center:
+        new_obj.x = obj.x + by_x
+        new_obj.y = obj.y + by_y
     else:
-        # Object cannot be translated, a simple shallow copy will be returned.
-        pass
+        half_w = obj.width / 2
+        half_h = obj.height / 2
+
+        new_obj.x = obj.x + half_w + by_x - half_w
+        new_obj.y = obj.y + half_h + by_y - half_h
+    return new_obj
+
+
+def _translate_triangle(obj, by_x=0, by_y=0):
+    new_obj = obj.__copy__()
+    new_obj.x1 = obj.x1 + by_x
+    new_obj.y1 = obj.y1 + by_y
+    new_obj.x2 = obj.x2 + by_x
+    new_obj.y2 = obj.y2 + by_y
+    new_obj.x3 = obj.x3 + by_x
+    new_obj.y3 = obj.y3 + by_y
+    return new_obj
 
+
+def _translate_line(obj, by_x=0, by_y=0):
+    new_obj = obj.__copy__()
+    new_obj.x1 = obj.x1 + by_x
+    new_obj.y1 = obj.y1 + by_y
+    new_obj.x2 = obj.x2 + by_x
+    new_obj.y2 = obj.y2 + by_y
+    return new_obj
+
+
+def _translate_arc(obj, by_x=0, by_y=0):
+    new_obj = obj.__copy__()
+    new_obj.center_x = obj.center_x + by_x
+    new_obj.center_y = obj.center_y + by_y
+    # new_obj.ctr_x = obj.ctr_x + by_x
+    # new_obj.ctr_y = obj.ctr_y + by_y
     return new_obj
 
 
+def _translate_curve(obj, by_x=0, by_y=0):
+    new_obj = obj.__copy__()
+    new_obj.start_x = obj.start_x + by_x
+    new_obj.start_y = obj.start_y + by_y
+    new_obj.ctr1_x = obj.ctr1_x + by_x
+    new_obj.ctr1_y = obj.ctr1_y + by_y
+    new_obj.ctr2_x = obj.ctr2_x + by_x
+    new_obj.ctr2_y = obj.ctr2_y + by_y
+    new_obj.end_x = obj.end_x + by_x
+    new_obj.end_y = obj.end_y + by_y
+    return new_obj
+
+
+def _translate_portal(obj, by_x=0, by_y=0):
+    new_obj = obj.__copy__()
+    new_obj.portal_x = obj.portal_x + by_x
+    new_obj.portal_y = obj.portal_y + by_y
+    return new_obj
+
+
+@_singledispatch
 def scale(obj: Object, by_x, by_y=None):
     """
     Scale an Object by x and y, originated from the centroid of the Object.
@@ -288,174 +243,578 @@ def scale(obj: Object, by_x, by_y=None):
     :param by_x:    Number of units to be scaled along the x-axis
     :param by_y:    Number of units to be scaled along the y-axis. If None, by_x is used for both axes.
     """
+    _scale_factors(by_x, by_y)
+    # Object cannot be scaled, a simple shallow copy will be returned.
+    return copy(obj)
+
+
+def _scale_player(obj, by_x, by_y=None):
+    by_x, by_y = _scale_factors(by_x, by_y)
+    new_obj = obj.__copy__()
+    new_obj.size = obj.size * by_x
+    return new_obj
+
+
+def _scale_circle(obj, by_x, by_y=None):
+    by_x, by_y = _scale_factors(by_x, by_y)
+    new_obj = obj.__copy__()
+    new_obj.radius = obj.radius * by_x
+    return new_obj
+
+
+def _scale_rectangle(obj, by_x, by_y=None):
+    by_x, by_y = _scale_factors(by_x, by_y)
+    new_obj = obj.__copy__()
+    new_obj.x = obj.x - obj.width / 2
+    new_obj.y = obj.y - obj.height / 2
+    new_obj.width = obj.width * by_x
+    new_obj.height = obj.height * by_y
+    return new_obj
+
+
+def _scale_triangle(obj, by_x, by_y=None):
+    by_x, by_y = _scale_factors(by_x, by_y)
+    cx = (obj.x1 + obj.x2 + obj.x3) / 3
+    cy = (obj.y1 + obj.y2 + obj.y3) / 3
+
+    new_obj = obj.__copy__()
+    new_obj.x1 = cx + (obj.x1 - cx) * by_x
+    new_obj.y1 = cy + (obj.y1 - cy) * by_y
+    new_obj.x2 = cx + (obj.x2 - cx) * by_x
+    new_obj.y2 = cy + (obj.y2 - cy) * by_y
+    new_obj.x3 = cx + (obj.x3 - cx) * by_x
+    new_obj.y3 = cy + (obj.y3 - cy) * by_y
+    return new_obj
+
+
+def _scale_line(obj, by_x, by_y=None):
+    by_x, by_y = _scale_factors(by_x, by_y)
+    cx = (obj.x1 + obj.x2) / 2
+    cy = (obj.y1 + obj.y2) / 2
+
+    new_obj = obj.__copy__()
+    new_obj.x1 = cx + (obj.x1 - cx) * by_x
+    new_obj.y1 = cy + (obj.y1 - cy) * by_y
+    new_obj.x2 = cx + (obj.x2 - cx) * by_x
+    new_obj.y2 = cy + (obj.y2 - cy) * by_y
+    new_obj.thickness = obj.thickness * ((by_x + by_y) / 2)
+    return new_obj
+
+
+def _scale_arc(obj, by_x, by_y=None):
+    by_x, by_y = _scale_factors(by_x, by_y)
+    new_obj = obj.__copy__()
+    new_obj.radius = obj.radius * by_x
+    new_obj.thickness = obj.thickness * ((by_x + by_y) / 2)
+    return new_obj
+
+
+def _scale_curve(obj, by_x, by_y=None):
+    by_x, by_y = _scale_factors(by_x, by_y)
+    cx = (obj.start_x + obj.ctr1_x + obj.ctr2_x + obj.end_x) / 4
+    cy = (obj.start_y + obj.ctr1_y + obj.ctr2_y + obj.end_y) / 4
+
+    new_obj = obj.__copy__()
+    new_obj.start_x = cx + (obj.start_x - cx) * by_x
+    new_obj.start_y = cy + (obj.start_y - cy) * by_y
+    new_obj.ctr1_x = cx + (obj.ctr1_x - cx) * by_x
+    new_obj.ctr1_y = cy + (obj.ctr1_y - cy) * by_y
+    new_obj.ctr2_x = cx + (obj.ctr2_x - cx) * by_x
+    new_obj.ctr2_y = cy + (obj.ctr2_y - cy) * by_y
+    new_obj.end_x = cx + (obj.end_x - cx) * by_x
+    new_obj.end_y = cy + (obj.end_y - cy) * by_y
+    new_obj.thickness = obj.thickness * ((by_x + by_y) / 2)
+    return new_obj
+
+
+# SHAPE KINDS ##########################################################################################################
+# The kind of shape of an Object class decides which of its attributes are transformed, and how. The single-Object
+#   tools, the batch transforms and Transform all look up the kind of an Object's class in _KINDS, so registering a
+#   class once with register_shape() supports it in all of them.
+
+# Kind of shape of each Object class.
+_KINDS = {
+    _os.Player:         'player',
+    _os.Circle:         'circle',
+    _os.Collectable:    'point',
+    Dummy:              'point',
+    _os.Rectangle:      'rect',
+    _os.Triangle:       'tri',
+    Line:               'line',
+    Arc:                'arc',
+    Curve:              'curve',
+    Portal:             'portal',
+}
+
+# Kind of each class, from the nearest class in its MRO that is in _KINDS; filled in by _kind_of().
+_CLASS_KINDS: dict[type, str | None] = {}
+
+# Handler of each kind in each tool; kinds that are missing are only copied by the tool.
+_HANDLERS = {
+    translate:  {'point': _translate_position, 'player': _translate_position, 'circle': _translate_position,
+                 'rect': _translate_rectangle, 'tri': _translate_triangle, 'line': _translate_line,
+                 'arc': _translate_arc, 'curve': _translate_curve, 'portal': _translate_portal},
+    pivot:      {'point': _pivot_position, 'player': _pivot_position, 'circle': _pivot_position,
+                 'rect': _pivot_rectangle, 'tri': _pivot_triangle, 'line': _pivot_line,
+                 'arc': _pivot_arc, 'curve': _pivot_curve, 'portal': _pivot_portal},
+    scale:      {'player': _scale_player, 'circle': _scale_circle, 'rect': _scale_rectangle, 'tri': _scale_triangle,
+                 'line': _scale_line, 'arc': _scale_arc, 'curve': _scale_curve},
+}
+
+
+def _kind_of(cls: type) -> str | None:
+    """:return: the kind of shape of cls, or None if it has none (e.g. Connections)."""
+    if cls not in _CLASS_KINDS:
+        _CLASS_KINDS[cls] = next((_KINDS[base] for base in cls.__mro__ if base in _KINDS), None)
+    return _CLASS_KINDS[cls]
+
+
+def _register_handlers(cls: type, kind: str):
+    for tool, handlers in _HANDLERS.items():
+        tool.register(cls, handlers.get(kind, tool.dispatch(object)))
+
+
+def register_shape(cls: type, kind: str):
+    """
+    Register an Object class as a kind of shape, so that pivot(), translate() and scale(), their batch versions
+        (pivot_many(), ...) and Transform all transform it like the built-in shapes of that kind.
+    :param cls:     Object class; it must have the attributes of the kind, with the same names as the built-in shapes
+    :param kind:    'point' (x, y), 'player' (x, y, size), 'circle' (x, y, radius),
+                        'rect' (x, y, width, height, rotation, coords_by_center), 'tri' (x1, y1, x2, y2, x3, y3),
+                        'line' (x1, y1, x2, y2, thickness), 'arc' (as Arc), 'curve' (as Curve) or 'portal' (as Portal)
+    """
+    if kind not in _HANDLERS[translate]:
+        raise ValueError(f"Unknown kind of shape {kind!r}; must be one of {', '.join(map(repr, _HANDLERS[translate]))}")
+    _KINDS[cls] = kind
+    _CLASS_KINDS.clear()
+    _register_handlers(cls, kind)
+
+
+for _shape, _shape_kind in _KINDS.items():
+    _register_handlers(_shape, _shape_kind)
+
+
+def _tool_kind(tool, cls: type):
+    """
+    :return: the kind of cls in tool; None if tool only copies it; or, if tool has a handler of its own for cls
+        (registered with @tool.register instead of register_shape()), that handler.
+    """
+    handler = tool.dispatch(cls)
+    if handler is tool.dispatch(object):
+        return None
+    kind = _kind_of(cls)
+    if kind is not None and handler is _HANDLERS[tool].get(kind):
+        return kind
+    return handler
+
+
+# BATCH TRANSFORMS #####################################################################################################
+# translate_many(), pivot_many() and scale_many() apply the same transform to many Objects at once.
+#   Objects are grouped by kind (the branch of translate()/pivot()/scale() they take), and the attributes of each
+#   group are transformed as NumPy columns, with the same operations in the same order as the single-Object tools.
+
+# (x, y) attribute pairs of each kind of Object.
+_POINTS = {
+    'point':    (('x', 'y'),),
+    'player':   (('x', 'y'),),
+    'circle':   (('x', 'y'),),
+    'rect':     (('x', 'y'),),
+    'tri':      (('x1', 'y1'), ('x2', 'y2'), ('x3', 'y3')),
+    'line':     (('x1', 'y1'), ('x2', 'y2')),
+    'arc':      (('center_x', 'center_y'), ('ctr_x', 'ctr_y')),
+    'curve':    (('start_x', 'start_y'), ('ctr1_x', 'ctr1_y'), ('ctr2_x', 'ctr2_y'), ('end_x', 'end_y')),
+    'portal':   (('portal_x', 'portal_y'),),
+}
+
+def _translate_columns(kind: str, cols: dict, by_x, by_y):
+    """translate() on columns of attributes; see _transform_many()."""
+    if kind == 'rect':
+        by_center = cols['coords_by_center'].astype(bool)
+        half_w = cols['width'] / 2
+        half_h = cols['height'] / 2
+        new_x = np.where(by_center, cols['x'], cols['x'] + half_w) + by_x
+        new_y = np.where(by_center, cols['y'], cols['y'] + half_h) + by_y
+        return {'x': np.where(by_center, new_x, new_x - half_w), 'y': np.where(by_center, new_y, new_y - half_h)}
+
+    # Only the center of an Arc is translated.
+    points = _POINTS[kind][:1] if kind == 'arc' else _POINTS[kind]
+    new = {}
+    for x, y in points:
+        new[x] = cols[x] + by_x
+        new[y] = cols[y] + by_y
+    return new
+
+
+def _translated_columns(obj: Object, by_x: np.ndarray, by_y: np.ndarray) -> dict:
+    """
+    :return: the attributes that translate() changes, as {attribute: column}, for copies of a single Object translated
+        by each (by_x, by_y) pair. Columns keep the types translate() gives, e.g. ints stay ints.
+    """
+    kind = _tool_kind(translate, type(obj))
+    if kind is None:
+        return {}
+    if not isinstance(kind, str):
+        # A class with a translate() handler of its own is translated one copy at a time.
+        by_x, by_y = np.broadcast_arrays(by_x, by_y)
+        copies = list(map(kind, _repeat(obj), by_x.tolist(), by_y.tolist()))
+        names = [name for name in _slot_names(type(obj)) if not name.startswith('_') and hasattr(obj, name)]
+        return {name: [getattr(new_obj, name) for new_obj in copies] for name in names
+                if any(getattr(new_obj, name) != getattr(obj, name) for new_obj in copies)}
+    if kind == 'rect' and obj.coords_by_center:
+        # Only x and y are moved, as for a point; the 'rect' columns would turn ints into floats.
+        kind = 'point'
+    names = _READS[_translate_columns].get(kind) or sum(_POINTS[kind], ())
+    return _translate_columns(kind, {name: np.asarray(getattr(obj, name)) for name in names}, by_x, by_y)
+
+
+def _pivot_columns(kind: str, cols: dict, theta, pivot_x, pivot_y):
+    """pivot() on columns of attributes, with theta in radians; see _transform_many()."""
+    cos = math.cos(theta)
+    sin = math.sin(theta)
+
+    def pivot_points(x, y):
+        translated_x = x - pivot_x
+        translated_y = y - pivot_y
+        return (translated_x * cos - translated_y * sin) + pivot_x, (translated_x * sin + translated_y * cos) + pivot_y
+
+    new = {}
+    if kind == 'rect':
+        by_center = cols['coords_by_center'].astype(bool)
+        half_w = cols['width'] / 2
+        half_h = cols['height'] / 2
+        new_x, new_y = pivot_points(np.where(by_center, cols['x'], cols['x'] + half_w),
+                                    np.where(by_center, cols['y'], cols['y'] + half_h))
+        new['x'] = np.where(by_center, new_x, new_x - half_w)
+        new['y'] = np.where(by_center, new_y, new_y - half_h)
+        new['rotation'] = cols['rotation'] + math.degrees(theta)
+        return new
+
+    for x, y in _POINTS[kind]:
+        new[x], new[y] = pivot_points(cols[x], cols[y])
+    if kind == 'arc':
+        new['start_angle'] = cols['start_angle'] + math.degrees(theta)
+        new['end_angle'] = cols['end_angle'] + math.degrees(theta)
+    return new
+
+
+def _scale_columns(kind: str, cols: dict, by_x, by_y):
+    """scale() on columns of attributes; see _transform_many()."""
+    if kind == 'player':
+        return {'size': cols['size'] * by_x}
+    if kind == 'circle':
+        return {'radius': cols['radius'] * by_x}
+    if kind == 'rect':
+        return {'x': cols['x'] - cols['width'] / 2, 'y': cols['y'] - cols['height'] / 2,
+                'width': cols['width'] * by_x, 'height': cols['height'] * by_y}
+    if kind == 'arc':
+        return {'radius': cols['radius'] * by_x, 'thickness': cols['thickness'] * ((by_x + by_y) / 2)}
+
+    # Points are scaled from their centroid.
+    points = _POINTS[kind]
+    cx = sum(cols[x] for x, _ in points) / len(points)
+    cy = sum(cols[y] for _, y in points) / len(points)
+    new = {}
+    for x, y in points:
+        new[x] = cx + (cols[x] - cx) * by_x
+        new[y] = cy + (cols[y] - cy) * by_y
+    if kind != 'tri':
+        new['thickness'] = cols['thickness'] * ((by_x + by_y) / 2)
+    return new
+
+
+# Attributes read by each kind of Object, per transform.
+_READS = {
+    _translate_columns: {'rect': ('x', 'y', 'width', 'height', 'coords_by_center')},
+    _pivot_columns:     {'rect': ('x', 'y', 'width', 'height', 'coords_by_center', 'rotation'),
+                         'arc': ('center_x', 'center_y', 'ctr_x', 'ctr_y', 'start_angle', 'end_angle')},
+    _scale_columns:     {'player': ('size',), 'circle': ('radius',), 'rect': ('x', 'y', 'width', 'height'),
+                         'arc': ('radius', 'thickness'), 'line': ('x1', 'y1', 'x2', 'y2', 'thickness'),
+                         'curve': ('start_x', 'start_y', 'ctr1_x', 'ctr1_y', 'ctr2_x', 'ctr2_y', 'end_x', 'end_y',
+                                   'thickness')},
+}
+
+
+def _copy_many(objs: list) -> list:
+    """
+    :return: shallow copies of objs, like copy(), but copying all Objects of a class at once. ObjectColumns get their
+        own copy of their rows.
+    """
+    new_objs = list(objs)
+    groups: dict[type, list[int]] = {}
+    for index, obj in enumerate(objs):
+        if isinstance(obj, Object):
+            groups.setdefault(type(obj), []).append(index)
+        else:
+            new_objs[index] = copy(obj)
+            if isinstance(obj, ObjectColumns):
+                # The rows are the ObjectColumns' data, so the copy must not share them.
+                new_objs[index]._rows = obj.rows.copy()
+                new_objs[index]._integral = {name: mask.copy() for name, mask in obj._integral.items()}
+
+    for cls, indexes in groups.items():
+        originals = [objs[index] for index in indexes]
+        names = _slot_names(cls)
+        try:
+            values = list(zip(*map(_attrgetter(*names), originals))) if len(names) > 1 else [originals]
+        except AttributeError:
+            # Some slots were never set.
+            copies = [copy(obj) for obj in originals]
+        else:
+            copies = list(map(cls.__new__, _repeat(cls, len(originals))))
+            for name, column in zip(names, values):
+                _deque(map(getattr(cls, name).__set__, copies, column), maxlen=0)
+        for index, new_obj in zip(indexes, copies):
+            new_objs[index] = new_obj
+    return new_objs
+
+
+def _copies_of(obj: Object, count: int, columns: dict) -> list:
+    """
+    :param columns: {attribute: column}; the nth copy gets the nth value of each column (or a value shared by all)
+    :return: count shallow copies of obj, like copy(), created at once with their attributes set column by column.
+    """
+    cls = type(obj)
+    copies = list(map(cls.__new__, _repeat(cls, count)))
+    for name in _slot_names(cls):
+        if name not in columns and hasattr(obj, name):
+            _deque(map(getattr(cls, name).__set__, copies, _repeat(getattr(obj, name), count)), maxlen=0)
+    for name, column in columns.items():
+        _deque(map(getattr(cls, name).__set__, copies, np.broadcast_to(column, count).tolist()), maxlen=0)
+    return copies
+
+
+def _leaves(objs):
+    """Yield objs, expanding CustomObjects (other than ObjectColumns) into the Objects they are composed of."""
+    for obj in objs:
+        if isinstance(obj, CustomObject):
+            yield from obj._iter_leaves()
+        else:
+            yield obj
+
+
+def _transform_many(objs, kind_of, transform, reads: dict, *args, tool_args: tuple = ()) -> list:
+    """
+    Apply transform to copies of objs, grouped by kind.
+    :param objs:        Objects, or a Level; CustomObjects other than ObjectColumns are expanded into their Objects
+    :param kind_of:     Function returning the kind of an Object class, None if the transform only copies it, or a
+                            handler(obj, *tool_args) returning a transformed copy, for a class with a handler of its own
+    :param transform:   Function(kind, {attribute: column}, *args) returning the {attribute: new column} that change
+    :param reads:       Attributes read by transform for each kind; kinds that are missing only read their points
+    :param tool_args:   Arguments of the handlers returned by kind_of
+    :return: the transformed copies, in the same order as objs (after expanding CustomObjects)
+    """
+    objs = list(objs._iter_leaves() if isinstance(objs, Level) else _leaves(objs))
+
+    with _gc_paused():
+        return _transform_groups(objs, kind_of, transform, reads, args, tool_args)
+
+
+def _transform_groups(objs: list, kind_of, transform, reads: dict, args: tuple, tool_args: tuple) -> list:
+    new_objs = _copy_many(objs)
+    groups: dict[str, list[int]] = {}
+    kinds = {}
+    for index, obj in enumerate(objs):
+        cls = obj.obj_type if isinstance(obj, ObjectColumns) else type(obj)
+        if cls not in kinds:
+            kinds[cls] = kind_of(cls)
+        kind = kinds[cls]
+        if kind is None:
+            continue
+
+        if isinstance(obj, ObjectColumns):
+            rows = obj.rows
+            if isinstance(kind, str):
+                # Rows of ObjectColumns are transformed directly as columns.
+                names = reads.get(kind) or sum(_POINTS[kind], ())
+                changed = transform(kind, {name: rows[name].astype(float) for name in names}, *args)
+            else:
+                row_objs = [kind(obj[row], *tool_args) for row in range(len(rows))]
+                changed = {name: [getattr(row_obj, name) for row_obj in row_objs] for name in rows.dtype.names}
+            columns = {name: obj._column(name) for name in rows.dtype.names}
+            columns.update(changed)
+            new_objs[index] = ObjectColumns(obj.obj_type, columns)
+        elif isinstance(kind, str):
+            groups.setdefault(kind, []).append(index)
+        else:
+            # A class with a handler of its own is transformed one Object at a time.
+            new_objs[index] = kind(obj, *tool_args)
+
+    for kind, indexes in groups.items():
+        group = [new_objs[index] for index in indexes]
+        names = reads.get(kind) or sum(_POINTS[kind], ())
+        values = np.array(list(map(_attrgetter(*names), group)), dtype=float).reshape(len(group), len(names))
+        changed = transform(kind, {name: values[:, i] for i, name in enumerate(names)}, *args)
+        for name, column in changed.items():
+            _deque(map(setattr, group, _repeat(name), np.broadcast_to(column, len(group)).tolist()), maxlen=0)
+
+    return new_objs
+
+
+def translate_many(objs, by_x=0, by_y=0) -> list:
+    """
+    Translate many Objects by x and y at once; much faster than translate() for large numbers of Objects.
+    Results match translate() up to floating point rounding, except that all translated attributes become floats.
+    :param objs:    List of Objects or a Level. Rows of ObjectColumns are translated as well; other CustomObjects are
+                        expanded into the Objects they are composed of.
+    :param by_x:    Number of units to be translated along the x-axis
+    :param by_y:    Number of units to be translated along the y-axis
+    :return: a list of translated copies, in the same order as objs (after expanding CustomObjects)
+    """
+    return _transform_many(objs, _partial(_tool_kind, translate), _translate_columns, _READS[_translate_columns],
+                           by_x, by_y, tool_args=(by_x, by_y))
+
+
+def pivot_many(objs, theta, pivot_x=1500, pivot_y=1500, in_degrees=True) -> list:
+    """
+    Rotate many Objects around a pivot at once; much faster than pivot() for large numbers of Objects.
+    Results match pivot() up to floating point rounding.
+    :param objs:        List of Objects or a Level. Rows of ObjectColumns are rotated as well; other CustomObjects
+                            are expanded into the Objects they are composed of.
+    :param theta:       Angle by which to rotate the Objects.
+    :param pivot_x:     X coordinate of pivot point.
+    :param pivot_y:     Y coordinate of pivot point.
+    :param in_degrees:  If True, assumes given angle theta is in degrees (instead of radians); default is True.
+    :return: a list of rotated copies, in the same order as objs (after expanding CustomObjects)
+    """
+    if in_degrees:
+        theta = math.radians(theta)
+    return _transform_many(objs, _partial(_tool_kind, pivot), _pivot_columns, _READS[_pivot_columns],
+                           theta, pivot_x, pivot_y, tool_args=(theta, pivot_x, pivot_y, False))
+
+
+def scale_many(objs, by_x, by_y=None) -> list:
+    """
+    Scale many Objects at once, each from its own centroid; much faster than scale() for large numbers of Objects.
+    Results match scale() up to floating point rounding.
+    :param objs:    List of Objects or a Level. Rows of ObjectColumns are scaled as well; other CustomObjects are
+                        expanded into the Objects they are composed of.
+    :param by_x:    Number of units to be scaled along the x-axis
+    :param by_y:    Number of units to be scaled along the y-axis. If None, by_x is used for both axes.
+    :return: a list of scaled copies, in the same order as objs (after expanding CustomObjects)
+    """
     if by_x == 0 or by_y == 0:
         raise ValueError("Cannot scale an object by 0.")
 
     if by_y is None:
         by_y = by_x
 
-    new_obj = copy(obj)
-
-    if isinstance(obj, _os.Player):
-        new_obj.size *= by_x
-
-    elif isinstance(obj, _os.Circle):
-        new_obj.radius *= by_x
-
-    elif isinstance(obj, _os.Rectangle):
-        new_obj.x -= obj.width / 2
-        new_obj.y -= obj.height / 2
-        new_obj.width *= by_x
-        new_obj.height *= by_y
-
-    elif isinstance(obj, _os.Triangle):
-        cx = (obj.x1 + obj.x2 + obj.x3) / 3
-        cy = (obj.y1 + obj.y2 + obj.y3) / 3
-
-        new_x1 = cx + (obj.x1 - cx) * by_x
-        new_y1 = cy + (obj.y1 - cy) * by_y
-        new_x2 = cx + (obj.x2 - cx) * by_x
-        new_y2 = cy + (obj.y2 - cy) * by_y
-        new_x3 = cx + (obj.x3 - cx) * by_x
-        new_y3 = cy + (obj.y3 - cy) * by_y
-
-        new_obj.x1 = new_x1
-        new_obj.y1 = new_y1
-        new_obj.x2 = new_x2
-        new_obj.y2 = new_y2
-        new_obj.x3 = new_x3
-        new_obj.y3 = new_y3
-
-    elif isinstance(obj, Line):
-        cx = (obj.x1 + obj.x2) / 2
-        cy = (obj.y1 + obj.y2) / 2
-
-        new_x1 = cx + (obj.x1 - cx) * by_x
-        new_y1 = cy + (obj.y1 - cy) * by_y
-        new_x2 = cx + (obj.x2 - cx) * by_x
-        new_y2 = cy + (obj.y2 - cy) * by_y
-
-        new_obj.x1 = new_x1
-        new_obj.y1 = new_y1
-        new_obj.x2 = new_x2
-        new_obj.y2 = new_y2
-
-        new_obj.thickness *= (by_x + by_y) / 2
-
-    elif isinstance(obj, Arc):
-        new_obj.radius *= by_x
-        new_obj.thickness *= (by_x + by_y) / 2
-
-    elif isinstance(obj, Curve):
-        cx = (obj.start_x + obj.ctr1_x + obj.ctr2_x + obj.end_x) / 4
-        cy = (obj.start_y + obj.ctr1_y + obj.ctr2_y + obj.end_y) / 4
-
-        new_start_x = cx + (obj.start_x - cx) * by_x
-        new_start_y = cy + (obj.start_y - cy) * by_y
-        new_ctr1_x = cx + (obj.ctr1_x - cx) * by_x
-        new_ctr1_y = cy + (obj.ctr1_y - cy) * by_y
-        new_ctr2_x = cx + (obj.ctr2_x - cx) * by_x
-        new_ctr2_y = cy + (obj.ctr2_y - cy) * by_y
-        new_end_x = cx + (obj.end_x - cx) * by_x
-        new_end_y = cy + (obj.end_y - cy) * by_y
-
-        new_obj.start_x = new_start_x
-        new_obj.start_y = new_start_y
-        new_obj.ctr1_x = new_ctr1_x
-        new_obj.ctr1_y = new_ctr1_y
-        new_obj.ctr2_x = new_ctr2_x
-        new_obj.ctr2_y = new_ctr2_y
-        new_obj.end_x = new_end_x
-        new_obj.end_y = new_end_y
-
-        new_obj.thickness *= (by_x + by_y) / 2
-
-    else:
-        # Object cannot be scaled, a simple shallow copy will be returned.
-        pass
-
-    return new_obj
+    return _transform_many(objs, _partial(_tool_kind, scale), _scale_columns, _READS[_scale_columns],
+                           by_x, by_y, tool_args=(by_x, by_y))
 
 
+@_singledispatch
 def dimensions(obj: Object):
     """Return the dimensions of an Object's bounding box as (width, height)."""
-    if isinstance(obj, _os.Connection):
-        raise TypeError("Connections have no dimensions.")
-
-    if isinstance(obj, _os.Circle):
-        width = height = obj.radius * 2 + 1     # actual circle radius is .5 greater than written radius
-    elif isinstance(obj, Arc):
-        xmin, xmax, ymin, ymax = _get_arc_bbox(obj)
-        width = xmax - xmin + obj.thickness * 2
-        height = ymax - ymin + obj.thickness * 2
-    elif isinstance(obj, _os.Rectangle):
-        width = obj.width
-        height = obj.height
-    elif isinstance(obj, _os.Triangle):
-        width = max(obj.x1, obj.x2, obj.x3) - min(obj.x1, obj.x2, obj.x3)
-        height = max(obj.y1, obj.y2, obj.y3) - min(obj.y1, obj.y2, obj.y3)
-    elif isinstance(obj, Line):
-        width = max(obj.x1, obj.x2) - min(obj.x1, obj.x2)
-        height = max(obj.y1, obj.y2) - min(obj.y1, obj.y2)
-        if width == 0:
-            width = obj.thickness * 2
-        if height == 0:
-            height = obj.thickness * 2
-    elif isinstance(obj, Curve):
-        xmin, xmax, ymin, ymax = _get_curve_bbox(obj)
-        width = xmax - xmin
-        height = ymax - ymin
-    elif isinstance(obj, _os.Collectable):
-        width = height = 50
-    elif isinstance(obj, Portal):
-        width = height = 40.5
-    elif isinstance(obj, _os.Player):
-        width = height = obj.size * 64 + 1
-    else:
-        raise TypeError(f"Object {type(obj)} has no dimensions.")
+    raise TypeError(f"Object {type(obj)} has no dimensions.")
+
+
+@dimensions.register(_os.Connection)
+def _connection_dimensions(obj):
+    raise TypeError("Connections have no dimensions.")
+
+
+@dimensions.register(_os.Circle)
+def _circle_dimensions(obj):
+    width = height = obj.radius * 2 + 1     # actual circle radius is .5 greater than written radius
     return width, height
 
 
+@dimensions.register(Arc)
+def _arc_dimensions(obj):
+    # The bounding box already includes the thickness of the edge.
+    xmin, xmax, ymin, ymax = obj.bounds()
+    return xmax - xmin, ymax - ymin
+
+
+@dimensions.register(_os.Rectangle)
+def _rectangle_dimensions(obj):
+    return obj.width, obj.height
+
+
+@dimensions.register(_os.Triangle)
+def _triangle_dimensions(obj):
+    width = max(obj.x1, obj.x2, obj.x3) - min(obj.x1, obj.x2, obj.x3)
+    height = max(obj.y1, obj.y2, obj.y3) - min(obj.y1, obj.y2, obj.y3)
+    return width, height
+
+
+@dimensions.register(Line)
+def _line_dimensions(obj):
+    width = max(obj.x1, obj.x2) - min(obj.x1, obj.x2)
+    height = max(obj.y1, obj.y2) - min(obj.y1, obj.y2)
+    if width == 0:
+        width = obj.thickness * 2
+    if height == 0:
+        height = obj.thickness * 2
+    return width, height
+
+
+@dimensions.register(Curve)
+def _curve_dimensions(obj):
+    xmin, xmax, ymin, ymax = obj.bounds()
+    return xmax - xmin, ymax - ymin
+
+
+@dimensions.register(_os.Collectable)
+def _collectable_dimensions(obj):
+    return 50, 50
+
+
+@dimensions.register(Portal)
+def _portal_dimensions(obj):
+    return 40.5, 40.5
+
+
+@dimensions.register(_os.Player)
+def _player_dimensions(obj):
+    width = height = obj.size * 64 + 1
+    return width, height
+
+
+@_singledispatch
 def centroid(obj: Object):
     """Return the (x, y) coordinate of an Object's centroid (geometric center)."""
+    raise TypeError(f"Object {type(obj)} does not have a centroid.")
 
-    if (isinstance(obj, _os.Circle)
-            or isinstance(obj, _os.Player)
-            or isinstance(obj, _os.Collectable)
-            or isinstance(obj, Dummy)):
-        cx = obj.x
-        cy = obj.y
 
-    elif isinstance(obj, _os.Rectangle):
-        cx = obj.x + obj.width / 2
-        cy = obj.y + obj.height / 2
+@centroid.register(_os.Circle)
+@centroid.register(_os.Player)
+@centroid.register(_os.Collectable)
+@centroid.register(Dummy)
+def _position_centroid(obj):
+    return obj.x, obj.y
 
-    elif isinstance(obj, _os.Triangle):
-        cx = (obj.x1 + obj.x2 + obj.x3) / 3
-        cy = (obj.y1 + obj.y2 + obj.y3) / 3
 
-    elif isinstance(obj, Line):
-        cx = (obj.x1 + obj.x2) / 2
-        cy = (obj.y1 + obj.y2) / 2
+@centroid.register(_os.Rectangle)
+def _rectangle_centroid(obj):
+    return obj.x + obj.width / 2, obj.y + obj.height / 2
 
-    elif isinstance(obj, Arc):
-        xmin, xmax, ymin, ymax = _get_arc_bbox(obj)
-        cx = (xmin + xmax) / 2
-        cy = (ymin + ymax) / 2
 
-    elif isinstance(obj, Curve):
-        xmin, xmax, ymin, ymax = _get_curve_bbox(obj)
-        cx = (xmin + xmax) / 2
-        cy = (ymin + ymax) / 2
+@centroid.register(_os.Triangle)
+def _triangle_centroid(obj):
+    return (obj.x1 + obj.x2 + obj.x3) / 3, (obj.y1 + obj.y2 + obj.y3) / 3
 
-    elif isinstance(obj, Portal):
-        cx = obj.portal_x
-        cy = obj.portal_y
 
-    else:
-        raise TypeError(f"Object {type(obj)} does not have a centroid.")
+@centroid.register(Line)
+def _line_centroid(obj):
+    return (obj.x1 + obj.x2) / 2, (obj.y1 + obj.y2) / 2
+
+
+@centroid.register(Arc)
+def _arc_centroid(obj):
+    xmin, xmax, ymin, ymax = obj.bounds()
+    return (xmin + xmax) / 2, (ymin + ymax) / 2
+
+
+@centroid.register(Curve)
+def _curve_centroid(obj):
+    xmin, xmax, ymin, ymax = obj.bounds()
+    return (xmin + xmax) / 2, (ymin + ymax) / 2
+
 
-    return cx, cy
+@centroid.register(Portal)
+def _portal_centroid(obj):
+    return obj.portal_x, obj.portal_y
 
 
 def push_to_android(file_path, destination='/sdcard'):
@@ -478,9 +837,8 @@ def push_to_android(file_path, destination='/sdcard'):
 def combine(level_1: 'Level', level_2: 'Level') -> 'Level':
     """
     Combines the contents of two levels, keeping the header of the first level and ensuring no duplicates.
+    Same as merge(level_1, level_2): Objects are copied, every Object of level_1 is kept, and Objects of level_2
+    identical to one in level_1 are skipped.
     """
-    new_level = copy(level_1)
-    for obj in level_2.get_objs():
-        if obj not in new_level.get_objs():
-            new_level.add(obj)
-    return new_level
+    from .level_diff import merge
+    return merge(level_1, level_2)
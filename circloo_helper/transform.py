@@ -0,0 +1,303 @@
+import math
+from copy import copy as _copy
+
+import numpy as np
+
+from .level import Level
+from .object import CustomObject, Object, _gc_paused, _remap_references
+from .object_columns import ObjectColumns
+from .tools import pivot, scale, translate, _POINTS, _kind_of, _leaves, _tool_kind, _transform_many
+
+__all__ = ["Transform", "TransformedObject"]
+
+# Attributes read by each kind of Object when a Transform is applied; see tools._transform_many().
+_READS = {
+    'player':   ('x', 'y', 'size'),
+    'circle':   ('x', 'y', 'radius'),
+    'rect':     ('x', 'y', 'width', 'height', 'rotation', 'coords_by_center'),
+    'line':     ('x1', 'y1', 'x2', 'y2', 'thickness'),
+    'arc':      ('center_x', 'center_y', 'ctr_x', 'ctr_y', 'start_angle', 'end_angle', 'radius', 'thickness'),
+    'curve':    ('start_x', 'start_y', 'ctr1_x', 'ctr1_y', 'ctr2_x', 'ctr2_y', 'end_x', 'end_y', 'thickness'),
+}
+
+# Relative distance to a whole number under which a transformed value is taken to be that number, e.g. a width of
+#   19.999999999999996 after rotating and scaling. It is a few units of float64 rounding, far below any level precision.
+_SNAP_TOLERANCE = 1e-12
+
+
+def _kind(cls: type) -> str | None:
+    """:return: the kind of cls when a Transform is applied, or None if it is only copied."""
+    if any(callable(_tool_kind(tool, cls)) for tool in (translate, pivot, scale)):
+        # A handler of its own does not say how the class is affected by other transforms, e.g. shears.
+        raise TypeError(f"Cannot transform a {cls.__name__}, which has its own handler in translate(), pivot() or "
+                        f"scale(); register it with tools.register_shape() instead.")
+    return _kind_of(cls)
+
+
+def _snap(column: np.ndarray) -> np.ndarray:
+    """:return: column with values within rounding error of a whole number replaced by that number."""
+    whole = np.rint(column)
+    return np.where(np.abs(column - whole) <= _SNAP_TOLERANCE * np.maximum(np.abs(whole), 1), whole, column)
+
+
+def _affine_columns(kind: str, cols: dict, transform: 'Transform'):
+    """Transform.apply() on columns of attributes, with rounding errors snapped away; see tools._transform_many()."""
+    new = _affine_values(kind, cols, transform)
+    return {name: _snap(np.asarray(column, dtype=float)) for name, column in new.items()}
+
+
+def _affine_values(kind: str, cols: dict, transform: 'Transform'):
+    new = {}
+    if kind == 'rect':
+        by_center = cols['coords_by_center'].astype(bool)
+        half_w = cols['width'] / 2
+        half_h = cols['height'] / 2
+        new_x, new_y = transform.point(np.where(by_center, cols['x'], cols['x'] + half_w),
+                                       np.where(by_center, cols['y'], cols['y'] + half_h))
+        if transform.is_similarity:
+            width = cols['width'] * transform.size
+            height = cols['height'] * transform.size
+            rotation = transform._angle(cols['rotation'])
+        else:
+            # The sides are mapped as vectors; a sheared Rectangle keeps the lengths and direction of its mapped sides.
+            radians = np.radians(cols['rotation'])
+            cos, sin = np.cos(radians), np.sin(radians)
+            a, b, c, d = transform._a, transform._b, transform._c, transform._d
+            width = cols['width'] * np.hypot(a * cos + b * sin, c * cos + d * sin)
+            height = cols['height'] * np.hypot(-a * sin + b * cos, -c * sin + d * cos)
+            rotation = np.degrees(np.arctan2(c * cos + d * sin, a * cos + b * sin))
+        new['x'] = np.where(by_center, new_x, new_x - width / 2)
+        new['y'] = np.where(by_center, new_y, new_y - height / 2)
+        new['width'] = width
+        new['height'] = height
+        new['rotation'] = rotation
+        return new
+
+    if kind == 'arc':
+        new['center_x'], new['center_y'] = transform.point(cols['center_x'], cols['center_y'])
+        # A control point of -1, -1 marks an arc given by its center, so it is kept.
+        is_center_arc = (cols['ctr_x'] == -1) & (cols['ctr_y'] == -1)
+        ctr_x, ctr_y = transform.point(cols['ctr_x'], cols['ctr_y'])
+        new['ctr_x'] = np.where(is_center_arc, -1, ctr_x)
+        new['ctr_y'] = np.where(is_center_arc, -1, ctr_y)
+        if transform.det < 0:
+            # A reflection reverses the direction of the arc, so its ends are swapped.
+            new['start_angle'] = transform._angle(cols['end_angle'])
+            new['end_angle'] = transform._angle(cols['start_angle'])
+        else:
+            new['start_angle'] = transform._angle(cols['start_angle'])
+            new['end_angle'] = transform._angle(cols['end_angle'])
+        new['radius'] = cols['radius'] * transform.size
+        new['thickness'] = cols['thickness'] * transform.size
+        return new
+
+    for x, y in _POINTS[kind]:
+        new[x], new[y] = transform.point(cols[x], cols[y])
+    if kind == 'player':
+        new['size'] = cols['size'] * transform.size
+    elif kind == 'circle':
+        new['radius'] = cols['radius'] * transform.size
+    elif kind in ('line', 'curve'):
+        new['thickness'] = cols['thickness'] * transform.size
+    return new
+
+
+class Transform:
+    def __init__(self, matrix=None):
+        """
+        Affine transform of level coordinates, as a 3x3 matrix.
+        Transforms are composed by multiplying their matrices, so any chain of rotations, scalings, reflections and
+        translations is applied to each Object at once, creating a single copy of it.
+        E.g. Transform.rotation(30).scale(2).translate(100, 0) rotates by 30 degrees, then scales by 2 from the middle
+        of the level, then moves 100 units to the right; t2 @ t1 (or t1.then(t2)) applies t1, then t2.
+        Sizes (radii, thicknesses, ...) are scaled by the square root of the area scale, since circles stay circles;
+        Rectangles keep the mapped lengths and direction of their sides if the transform is not a similarity.
+        :param matrix:  3x3 matrix (nested lists or NumPy array) whose last row is 0, 0, 1; default is the identity
+        """
+        self.matrix = np.identity(3) if matrix is None else np.array(matrix, dtype=float).reshape(3, 3)
+        if not np.array_equal(self.matrix[2], (0, 0, 1)):
+            raise ValueError("The last row of an affine transform matrix must be 0, 0, 1.")
+
+        (self._a, self._b, self._e), (self._c, self._d, self._f) = self.matrix[:2].tolist()
+        self.det = self._a * self._d - self._b * self._c
+        if self.det == 0:
+            raise ValueError("Cannot transform by a matrix that collapses the level into a line or point.")
+        self.size = math.sqrt(abs(self.det))
+        # Angle by which directions turn (with reflections, directions are reflected first, then turned).
+        self.phi = math.degrees(math.atan2(self._c, self._a))
+        sign = 1 if self.det > 0 else -1
+        self.is_similarity = math.isclose(self._a, sign * self._d, abs_tol=1e-12) \
+            and math.isclose(self._b, -sign * self._c, abs_tol=1e-12)
+
+    def __repr__(self):
+        return f"Transform({self.matrix[:2].tolist()})"
+
+    def __eq__(self, other):
+        return isinstance(other, Transform) and np.array_equal(self.matrix, other.matrix)
+
+    def __hash__(self):
+        return hash(self.matrix.tobytes())
+
+    def _exactly(self, size: float, phi: float | None = None) -> 'Transform':
+        """
+        Replace size (and phi, for similarities) derived from the matrix, which carry the rounding errors of cos and
+            sin, with the exact values of the rotations and scalings that self was composed of.
+        :return: self
+        """
+        self.size = size
+        if phi is not None and self.is_similarity:
+            self.phi = phi
+        return self
+
+    def __matmul__(self, other: 'Transform') -> 'Transform':
+        """:return: the Transform that applies other, then self."""
+        if not isinstance(other, Transform):
+            return NotImplemented
+        phi = None
+        if self.is_similarity and other.is_similarity:
+            # Turning by other.phi, then by self.phi; a reflection reverses the direction of the first turn.
+            phi = self.phi + other.phi if self.det > 0 else self.phi - other.phi
+        return Transform(self.matrix @ other.matrix)._exactly(self.size * other.size, phi)
+
+    def then(self, other: 'Transform') -> 'Transform':
+        """:return: the Transform that applies self, then other."""
+        return other @ self
+
+    def inverse(self) -> 'Transform':
+        """:return: the Transform that undoes self."""
+        matrix = np.linalg.inv(self.matrix)
+        matrix[2] = (0, 0, 1)
+        return Transform(matrix)._exactly(1 / self.size, -self.phi if self.det > 0 else self.phi)
+
+    @classmethod
+    def translation(cls, by_x=0, by_y=0) -> 'Transform':
+        """
+        Same as tools.translate(), except that the control points of 3-point Arcs are moved as well.
+        :param by_x:    Number of units to be translated along the x-axis
+        :param by_y:    Number of units to be translated along the y-axis
+        """
+        return cls([[1, 0, by_x], [0, 1, by_y], [0, 0, 1]])
+
+    @classmethod
+    def rotation(cls, theta, pivot_x=1500, pivot_y=1500, in_degrees=True) -> 'Transform':
+        """
+        Same as tools.pivot(), except that Arcs given by their center keep their control point at -1, -1.
+        :param theta:       Angle by which to rotate; increase to rotate clockwise
+        :param pivot_x:     X coordinate of pivot point.
+        :param pivot_y:     Y coordinate of pivot point.
+        :param in_degrees:  If True, assumes given angle theta is in degrees (instead of radians); default is True.
+        """
+        # The angle as given, which pivot() adds to Rectangle rotations and Arc angles.
+        degrees = theta if in_degrees else math.degrees(theta)
+        if in_degrees:
+            theta = math.radians(theta)
+        cos, sin = math.cos(theta), math.sin(theta)
+        return cls([[cos, -sin, pivot_x - pivot_x * cos + pivot_y * sin],
+                    [sin, cos, pivot_y - pivot_x * sin - pivot_y * cos],
+                    [0, 0, 1]])._exactly(1, degrees)
+
+    @classmethod
+    def scaling(cls, by_x, by_y=None, origin_x=1500, origin_y=1500) -> 'Transform':
+        """
+        Scale the level from an origin. Unlike tools.scale(), Objects are not scaled from their own centroids,
+        so they move apart or together as well. A negative factor reflects across the axis through the origin.
+        :param by_x:        Factor along the x-axis
+        :param by_y:        Factor along the y-axis. If None, by_x is used for both axes.
+        :param origin_x:    X coordinate of the point that stays in place
+        :param origin_y:    Y coordinate of the point that stays in place
+        """
+        if by_y is None:
+            by_y = by_x
+        transform = cls([[by_x, 0, origin_x - origin_x * by_x], [0, by_y, origin_y - origin_y * by_y], [0, 0, 1]])
+        return transform._exactly(abs(by_x)) if abs(by_x) == abs(by_y) else transform
+
+    def translate(self, by_x=0, by_y=0) -> 'Transform':
+        """:return: self followed by Transform.translation(by_x, by_y)."""
+        return Transform.translation(by_x, by_y) @ self
+
+    def rotate(self, theta, pivot_x=1500, pivot_y=1500, in_degrees=True) -> 'Transform':
+        """:return: self followed by Transform.rotation(theta, pivot_x, pivot_y, in_degrees)."""
+        return Transform.rotation(theta, pivot_x, pivot_y, in_degrees) @ self
+
+    def scale(self, by_x, by_y=None, origin_x=1500, origin_y=1500) -> 'Transform':
+        """:return: self followed by Transform.scaling(by_x, by_y, origin_x, origin_y)."""
+        return Transform.scaling(by_x, by_y, origin_x, origin_y) @ self
+
+    def point(self, x, y):
+        """:return: the transformed x, y; either may be a NumPy array of coordinates."""
+        return self._a * x + self._b * y + self._e, self._c * x + self._d * y + self._f
+
+    def _angle(self, angle):
+        """:return: the transformed direction of angle (in degrees), keeping its winding; exact for similarities."""
+        return self.phi + angle if self.det > 0 else self.phi - angle
+
+    def apply(self, target):
+        """
+        Apply the Transform to an Object, a list of Objects, a CustomObject or a Level.
+        :param target:  An Object: a transformed copy of it is returned.
+                        A list of Objects: a list of transformed copies is returned, as with tools.pivot_many().
+                            References between them (e.g. the Objects of Connections) point to the copies.
+                            CustomObjects in the list (other than ObjectColumns) are expanded into their Objects.
+                        A Level: a copy of the Level with every Object transformed is returned. Its CustomObjects are
+                            expanded into their Objects; the rows of ObjectColumns stay in ObjectColumns.
+                        A CustomObject: a TransformedObject that builds transformed copies of target's Objects.
+        """
+        if isinstance(target, Level):
+            new_lvl = _copy(target)
+            new_lvl._objs = []
+            new_lvl._size = 0
+            new_lvl._index = None
+            for obj in self._apply_many(list(target._iter_leaves())):
+                new_lvl.add(obj)
+            return new_lvl
+        if isinstance(target, list):
+            return self._apply_many(target)
+        if isinstance(target, ObjectColumns):
+            return self._apply_many([target])[0]
+        if isinstance(target, TransformedObject):
+            return TransformedObject(target.source, self @ target.transform)
+        if isinstance(target, CustomObject):
+            return TransformedObject(target, self)
+        if isinstance(target, Object):
+            return self._apply_many([target])[0]
+        raise TypeError(f"Cannot transform a {type(target).__name__}.")
+
+    __call__ = apply
+
+    def _apply_many(self, objs: list) -> list:
+        objs = list(_leaves(objs))
+        new_objs = _transform_many(objs, _kind, _affine_columns, _READS, self)
+        with _gc_paused():
+            _remap_references(new_objs, {id(obj): new_obj for obj, new_obj in zip(objs, new_objs)})
+        return new_objs
+
+
+class TransformedObject(CustomObject):
+    def __init__(self, source: Object | CustomObject, transform: Transform):
+        """
+        Copy of a CustomObject (or Object) with a Transform applied, usually created with transform.apply(source).
+        It is rebuilt whenever the source is rebuilt; call invalidate() after changing an Object of the source.
+        :param source:      Object or CustomObject to be transformed
+        :param transform:   Transform to apply
+        """
+        super().__init__()
+        self.source = source
+        self.transform = transform
+        # Cache of the source when this was built; the source creates a new cache list whenever it is rebuilt.
+        self._source_cache = None
+
+    def build_objs(self):
+        super().build_objs()
+        if isinstance(self.source, CustomObject):
+            self._source_cache = self.source._get_objs()
+            objs = list(self.source._iter_leaves())
+        else:
+            objs = [self.source]
+        self._obj_cache.extend(self.transform._apply_many(objs))
+        return self._obj_cache
+
+    def _get_objs(self):
+        if isinstance(self.source, CustomObject) and self.source._get_objs() is not self._source_cache:
+            # The source was rebuilt since this was built.
+            self._is_built = False
+        return super()._get_objs()
@@ -22,7 +22,8 @@ class CHVideo(CustomObject):
                  threshold: int | float = .5,
                  channel_weights: tuple[int | float, int | float, int | float] = (1, 1, 1),
                  ditherer: Callable[[np.array], np.array] = lambda x: ordered_dither(x, LINE_DITHER_8X8),
-                 show_img: bool = True):
+                 show_img: bool = True,
+                 workers: int | None = None):
         """
         Converts a video into circloO objects via dithering & grayscale conversion.
         :param filepath:            Path to input image
@@ -33,6 +34,8 @@ class CHVideo(CustomObject):
         :param channel_weights:     Weights for RGB channels; default is (1, 1, 1)
         :param ditherer:            Dithering function (found in `dithering` module); default is ordered with a line pattern
         :param show_img:            If True, displays the video as it processes; default is True
+        :param workers:             If greater than 1, frames are decomposed into Generators in this many parallel
+                                        threads (see Pixels); default is None
         """
         super().__init__()
         self._filepath = filepath
@@ -47,6 +50,7 @@ class CHVideo(CustomObject):
         self._show_img = show_img
 
         self._ditherer = ditherer
+        self._workers = workers
 
         self._is_already_built = False
 
@@ -62,7 +66,7 @@ class CHVideo(CustomObject):
         obj = copy(self._obj)
         obj.disappear_after = frame_duration
         obj.init_delay = frame_duration
-        self._obj_cache.extend(Pixels(processed_frames, obj).build_objs())
+        self._obj_cache.extend(Pixels(processed_frames, obj, workers=self._workers).build_objs())
 
         self._is_already_built = True
         return self._obj_cache
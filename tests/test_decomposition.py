@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from circloo_helper.decomposition import DECOMPOSERS, greedy_rectangles, maximal_rectangles, tiled
+
+
+def _arrays():
+    """Random noise of several densities, and solid shapes with holes."""
+    rng = np.random.default_rng(0)
+    arrays = [rng.random((60, 80)) < density for density in (0.2, 0.5, 0.8, 0.95)]
+    yy, xx = np.mgrid[:60, :80]
+    arrays.append((yy - 30) ** 2 + (xx - 40) ** 2 < 25 ** 2)
+    ring = ((yy - 30) ** 2 + (xx - 40) ** 2 < 28 ** 2) & ((yy - 30) ** 2 + (xx - 40) ** 2 > 10 ** 2)
+    arrays.append(ring)
+    return arrays
+
+
+def _coverage(rects: np.ndarray, shape: tuple) -> np.ndarray:
+    """:return: how many rectangles cover each cell."""
+    counts = np.zeros(shape, dtype=np.int64)
+    for x, y, width, height in rects.tolist():
+        counts[y:y + height, x:x + width] += 1
+    return counts
+
+
+@pytest.mark.parametrize('name', DECOMPOSERS)
+@pytest.mark.parametrize('number', range(len(_arrays())))
+def test_rectangles_cover_filled_cells_once(name, number):
+    arr = _arrays()[number]
+    rects = DECOMPOSERS[name](arr)
+    assert (_coverage(rects, arr.shape) == arr).all()
+
+
+@pytest.mark.parametrize('number', range(len(_arrays())))
+def test_maximal_never_more_than_greedy(number):
+    arr = _arrays()[number]
+    assert len(maximal_rectangles(arr)) <= len(greedy_rectangles(arr))
+
+
+
+@pytest.mark.parametrize('name', DECOMPOSERS)
+@pytest.mark.parametrize('number', range(len(_arrays())))
+@pytest.mark.parametrize('rows', [7, 25])
+def test_tiled_adds_at_most_one_rectangle_per_crossed_seam(name, number, rows):
+    arr = _arrays()[number]
+    whole = DECOMPOSERS[name](arr)
+    rects = tiled(name, arr, rows=rows)
+    assert (_coverage(rects, arr.shape) == arr).all()
+
+    # N: how many times the rectangles of the decomposition without tiles cross a seam between bands.
+    seams = np.arange(rows, arr.shape[0], rows)
+    crossings = int(((whole[:, 1, None] < seams) & (whole[:, 1, None] + whole[:, 3, None] > seams)).sum())
+    assert len(rects) <= len(whole) + crossings
+    if name == 'runs':
+        assert (rects == whole).all()
+
+
+def test_tiled_small_arrays_are_not_split():
+    arr = _arrays()[4]
+    assert (tiled('greedy', arr, workers=4) == greedy_rectangles(arr)).all()
@@ -0,0 +1,35 @@
+import tracemalloc
+from copy import copy
+
+from circloo_helper.circloo_objects import SolidRectangle
+
+# Bytes allocated per SolidRectangle, including its list entry; ~128 with __slots__, ~270 with an instance dict.
+MAX_BYTES_PER_RECTANGLE = 160
+
+
+def _bytes_per_object(create, count: int = 10_000) -> float:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objs = [create() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(objs) == count
+    return (after - before) / count
+
+
+def test_solid_rectangle_memory():
+    assert _bytes_per_object(lambda: SolidRectangle(1, 2, 3, 4)) <= MAX_BYTES_PER_RECTANGLE
+
+
+def test_copy_memory_and_attributes():
+    original = SolidRectangle(1, 2, 3, 4, 30)
+    assert _bytes_per_object(lambda: copy(original)) <= MAX_BYTES_PER_RECTANGLE
+
+    duplicate = copy(original)
+    assert duplicate is not original
+    assert duplicate._to_str() == original._to_str()
+    duplicate.x = 10
+    assert duplicate._to_str() != original._to_str()
+    assert original.x == 1
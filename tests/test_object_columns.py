@@ -0,0 +1,53 @@
+import random
+from copy import copy
+
+import pytest
+
+from circloo_helper.object_columns import COLUMN_TYPES, ObjectColumns, _attribute_names, _prototype
+
+
+def _mixed_columns(obj_type: type, count: int, seed: int) -> dict:
+    """Columns of random numbers for every non-bool attribute, mixing ints and floats in each column."""
+    rng = random.Random(seed)
+    prototype = _prototype(obj_type)
+    columns = {}
+    for name in _attribute_names(prototype):
+        if isinstance(getattr(prototype, name), bool):
+            columns[name] = [rng.random() < 0.5 for _ in range(count)]
+        else:
+            columns[name] = [rng.randint(-50, 50) if rng.random() < 0.5 else round(rng.uniform(-50, 50), 1)
+                             for _ in range(count)]
+    return columns
+
+
+def _objects(obj_type: type, columns: dict) -> list:
+    """The same rows as columns, as separate Objects."""
+    prototype = _prototype(obj_type)
+    objs = []
+    for values in zip(*columns.values()):
+        obj = copy(prototype)
+        for name, value in zip(columns, values):
+            setattr(obj, name, value)
+        objs.append(obj)
+    return objs
+
+
+@pytest.mark.parametrize('precision', [None, 2])
+@pytest.mark.parametrize('obj_type', COLUMN_TYPES, ids=lambda obj_type: obj_type.__name__)
+def test_mixed_int_float_columns_match_objects(obj_type, precision):
+    columns = _mixed_columns(obj_type, 50, seed=COLUMN_TYPES.index(obj_type))
+    block = ObjectColumns(obj_type, columns)
+    objs = _objects(obj_type, columns)
+
+    expected = [obj._to_str(precision=precision) for obj in objs]
+    assert list(block._iter_strs(precision=precision)) == ['\n'.join(expected)]
+    assert [block[index]._to_str(precision=precision) for index in range(len(objs))] == expected
+
+
+def test_row_assignment_keeps_int_text():
+    block = ObjectColumns(COLUMN_TYPES[0], x=[1.5, 2.5], y=0.5)
+    obj = block[0]
+    obj.x = 36
+    block[0] = obj
+    assert block[0].x == 36 and type(block[0].x) is int
+    assert block._to_str().split('\n')[0] == obj._to_str()
@@ -0,0 +1,53 @@
+import timeit
+
+import pytest
+
+from circloo_helper import tools
+from circloo_helper.circloo_objects import SolidRectangle
+from circloo_helper.object import Object, _slot_names
+
+# Time of each single-Object tool on a SolidRectangle, relative to copying the same slots by hand and moving it.
+#   ~2-3.5 with slotted Objects and singledispatch; ~8-10 with a __setattr__ hook on every assignment.
+MAX_TOOL_COST = 5
+
+_NAMES = _slot_names(SolidRectangle)
+
+
+class _Plain:
+    __slots__ = tuple(_NAMES)
+
+
+def _plain_translate(obj, by_x, by_y):
+    """The least a translate() could do: copy every slot, then move the copy."""
+    new = _Plain.__new__(_Plain)
+    for name in _NAMES:
+        setattr(new, name, getattr(obj, name))
+    new.x = obj.x + by_x
+    new.y = obj.y + by_y
+    return new
+
+
+def _best_time(transform, objs) -> float:
+    return min(timeit.repeat(lambda: [transform(obj) for obj in objs], number=1, repeat=15))
+
+
+def _subclasses(cls: type):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def test_no_per_assignment_hook():
+    # Exports detect changed attributes lazily; a __setattr__ override would slow down every tool and copy.
+    assert [cls for cls in (Object, *_subclasses(Object)) if '__setattr__' in vars(cls)] == []
+
+
+@pytest.mark.parametrize('tool', [lambda obj: tools.translate(obj, 3, 4), lambda obj: tools.pivot(obj, 30),
+                                  lambda obj: tools.scale(obj, 2)], ids=['translate', 'pivot', 'scale'])
+def test_single_object_tools_cost(tool):
+    objs = [SolidRectangle(i, 2, 3, 4, 10) for i in range(2000)]
+    plain = _Plain.__new__(_Plain)
+    for name in _NAMES:
+        setattr(plain, name, getattr(objs[0], name))
+    reference = _best_time(lambda obj: _plain_translate(plain, 3, 4), objs)
+    assert _best_time(tool, objs) <= MAX_TOOL_COST * reference